@@ -0,0 +1,63 @@
+"""
+Typed access to environment variables for settings.py.
+
+Values come from the process environment, with a ``.env`` file next to
+manage.py loaded first (python-dotenv). Variables already set in the
+environment win over the file.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off", ""}
+
+
+def load_env_file(path):
+    try:
+        from dotenv import load_dotenv
+    except ImportError:  # python-dotenv is in requirements.txt, but a bare environment still works
+        return False
+    return load_dotenv(path, override=False)
+
+
+def env_str(name, default=None):
+    return os.environ.get(name, default)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ImproperlyConfigured(f"{name} must be a boolean (true/false), got {value!r}.")
+
+
+def env_int(name, default=None):
+    return _convert(name, int, default)
+
+
+def env_float(name, default=None):
+    return _convert(name, float, default)
+
+
+def env_list(name, default=()):
+    """Comma-separated values, blanks dropped."""
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _convert(name, kind, default):
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return kind(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} must be {kind.__name__}, got {value!r}.")
@@ -0,0 +1,145 @@
+"""
+In-process request metrics, exposed in Prometheus text format at /api/metrics/.
+
+RequestMetricsMiddleware records per-view wall time, DB query count and
+time, and serializer time into histograms held here. Numbers are per
+worker process; scrape every worker (or aggregate upstream) in production.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+_HELP = {
+    "http_request_duration_seconds": "Wall time spent in the Django view stack.",
+    "http_request_db_queries": "Database queries issued per request.",
+    "http_request_db_duration_seconds": "Time spent waiting on the database per request.",
+    "http_request_serializer_duration_seconds": "Time spent in DRF serializers per request.",
+    "http_requests_total": "Requests handled, by view, method and status.",
+    "events_upcoming_cache_total": "Lookups in the /events/upcoming/ response cache, by result.",
+    "events_categories_cache_total": "Lookups in the /categories/ list cache, by result.",
+    "outbox_messages_total": "Outbox deliveries, by topic and result (delivered, retried, failed).",
+    "registration_activity_total": "Registrations created or cancelled, as seen by the outbox worker.",
+    "db_lock_retries_total": "Writes retried after SQLite reported the database locked, by function.",
+    "throttled_requests_total": "Requests rejected by a token-bucket throttle, by scope.",
+    "registration_admission_total": "Registration admission decisions per event slot (admitted, queued, shed).",
+    "registration_admission_wait_seconds": "Time queued registrations waited for an admission slot.",
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        lines, seen = [], set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.total}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+registry = MetricsRegistry()
+
+
+# ------------------------
+# Per-request recording
+# ------------------------
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "serializer_time", "serializing", "view")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.view = None
+
+
+current_request = ContextVar("current_request_stats", default=None)
+
+
+class InstrumentedSerializerMixin:
+    """Adds the time spent rendering this serializer to the current request's stats."""
+
+    def to_representation(self, instance):
+        stats = current_request.get()
+        if stats is None or stats.serializing:
+            return super().to_representation(instance)
+
+        stats.serializing = True  # nested serializers are already inside this timer
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            stats.serializer_time += time.perf_counter() - start
+            stats.serializing = False
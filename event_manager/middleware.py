@@ -0,0 +1,102 @@
+import logging
+import time
+import traceback
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .metrics import QUERY_COUNT_BUCKETS, RequestStats, current_request, registry
+
+slow_query_logger = logging.getLogger("event_manager.slow_queries")
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request and the database work it does, labelled by the
+    resolved URL name (e.g. ``event-upcoming-events``). Works with
+    DEBUG=False because queries are counted through execute_wrapper
+    rather than connection.queries.
+
+    Async-capable so native async views aren't forced through a thread;
+    their ORM calls run on sync_to_async threads, so for them only wall
+    and serializer time are recorded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        threshold = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+        self.slow_query_threshold = threshold / 1000 if threshold is not None else None
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self._query_wrapper(stats)))
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self._record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self._record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def _record(self, request, response, stats, elapsed):
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unresolved"
+        labels = {"view": view, "method": request.method}
+        registry.increment("http_requests_total", status=response.status_code, **labels)
+        registry.observe("http_request_duration_seconds", elapsed, **labels)
+        registry.observe("http_request_db_queries", stats.queries, buckets=QUERY_COUNT_BUCKETS, **labels)
+        registry.observe("http_request_db_duration_seconds", stats.db_time, **labels)
+        registry.observe("http_request_serializer_duration_seconds", stats.serializer_time, **labels)
+
+    def _query_wrapper(self, stats):
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = time.perf_counter() - start
+                stats.queries += 1
+                stats.db_time += duration
+                if self.slow_query_threshold is not None and duration >= self.slow_query_threshold:
+                    self._log_slow_query(sql, params, duration)
+        return wrapper
+
+    def _log_slow_query(self, sql, params, duration):
+        slow_query_logger.warning(
+            "Slow query (%.1f ms) from %s: %s | params=%r",
+            duration * 1000, _query_origin(), sql, params,
+        )
+
+
+def _query_origin():
+    """The innermost stack frame that belongs to this project rather than Django or a library."""
+    root = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if frame.filename.startswith(root) and "site-packages" not in frame.filename:
+            return f"{frame.filename[len(root) + 1:]}:{frame.lineno} in {frame.name}"
+    return "unknown"
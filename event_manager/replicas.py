@@ -0,0 +1,106 @@
+"""
+Read-replica routing for safe API requests.
+
+Views that mix in ``ReplicaReadMixin`` run GET/HEAD/OPTIONS requests with a
+replica from ``settings.DATABASE_REPLICAS`` as the read alias; everything
+else, including all writes, uses ``default``. The alias lives in a context
+variable, so it never leaks into another request, thread or task.
+
+Replicas lag. After a successful write, a user is pinned to the primary for
+``REPLICA_PIN_SECONDS`` so they read their own writes (a user who just
+registered sees the registration). Pins live in the cache, so they reach
+other workers only with a shared cache backend.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import permissions
+
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+def pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Send ``user_id``'s reads to the primary until replicas have caught up with their write."""
+    cache.set(pin_key(user_id), 1, getattr(settings, "REPLICA_PIN_SECONDS", 5))
+
+
+def read_alias_for(user):
+    """The replica ``user``'s next read should use, or None for the primary."""
+    replicas = getattr(settings, "DATABASE_REPLICAS", ())
+    if not replicas:
+        return None
+    if user is not None and user.is_authenticated and cache.get(pin_key(user.id)):
+        return None
+    return random.choice(replicas)
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside this block, e.g. to fill a cache that outlives replica lag."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Reads go to the current request's replica (if any), writes and migrations to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        # Outside a replica-routed request, ignore the instance's own alias
+        # too, so objects loaded from a replica are re-read on the primary.
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # A replica holds the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, *getattr(settings, "DATABASE_REPLICAS", ())}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in getattr(settings, "DATABASE_REPLICAS", ()):
+            return False  # replicas get their schema from the primary
+        return None
+
+
+class ReplicaReadMixin:
+    """Route this view's safe requests to a replica and pin users to the primary after they write."""
+
+    _replica_token = None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Also reached when an unhandled exception skips finalize_response;
+            # WSGI threads are reused, so the alias must not outlive the request.
+            if self._replica_token is not None:
+                _read_alias.reset(self._replica_token)
+                self._replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)  # authenticates, so request.user is known
+        if request.method in permissions.SAFE_METHODS:
+            self._replica_token = _read_alias.set(read_alias_for(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            request.method not in permissions.SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
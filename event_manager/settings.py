@@ -8,24 +8,40 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
+
+Deployment-specific values come from environment variables (or a `.env`
+file next to manage.py); see event_manager.env and the README.
 """
 
 from pathlib import Path
 
+from event_manager.env import env_bool, env_float, env_list, env_str, load_env_file
+from event_manager.sqlite import apply_sqlite_profile
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+load_env_file(BASE_DIR / '.env')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-lqa5(5q_g69rcox*gi$1!g9px3-u$gqnp9qb4b7hthvjg!9wq@'
+SECRET_KEY = env_str(
+    'DJANGO_SECRET_KEY', 'django-insecure-lqa5(5q_g69rcox*gi$1!g9px3-u$gqnp9qb4b7hthvjg!9wq@'
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = False
+DEBUG = env_bool('DJANGO_DEBUG', False)
 
-ALLOWED_HOSTS = ['*']
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['*'])
+
+# 'full' serves the admin and the browsable API. 'api' is for JSON-only
+# workers: no admin, sessions, messages, static files, CSRF or browsable API,
+# so fewer apps to import at boot and fewer middleware per request. Auth is
+# JWT either way.
+DJANGO_PROFILE = env_str('DJANGO_PROFILE', 'full')
 
 
 # Application definition
@@ -45,6 +61,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'event_manager.middleware.RequestMetricsMiddleware',  # first, so it times everything below
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,20 +73,64 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
 
+    # orjson-backed JSON when installed, DRF's stdlib encoder otherwise (see event_manager.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'event_manager.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'event_manager.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
 
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Page numbers by default; views with `keyset_ordering` also accept ?cursor=
+    'DEFAULT_PAGINATION_CLASS': 'events.pagination.KeysetPagination',
     'PAGE_SIZE': 10,  # ✅ 10 events per page
+
+    # Token buckets for login and registration (see event_manager.throttling);
+    # "n/period" allows bursts of n and refills n tokens per period.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_user': '5/min',
+        'registration_user': '10/min',
+        'registration_ip': '60/min',
+        'registration_event': '600/min',
+    },
+}
+
+# Admission control for registrations on one event: at most this many run at
+# once; extra attempts wait up to REGISTRATION_QUEUE_TIMEOUT seconds for a slot
+# ("queue") or are turned away with 503 at once ("shed"). 0 disables it.
+REGISTRATION_MAX_CONCURRENT = 8
+REGISTRATION_ADMISSION_MODE = 'queue'
+REGISTRATION_QUEUE_TIMEOUT = 2.0
+
+# Access tokens carry the claims permission checks need (see users.authentication),
+# so authenticated requests don't load the user from the database.
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.ClaimsTokenRefreshSerializer',
+    'TOKEN_USER_CLASS': 'users.authentication.ClaimsUser',
 }
 
+# Log queries slower than this (ms) with their SQL and calling code to the
+# "event_manager.slow_queries" logger. None disables the slow-query log.
+SLOW_QUERY_THRESHOLD_MS = env_float('SLOW_QUERY_THRESHOLD_MS')
+
+# Seconds a fully loaded user stays in the per-process cache.
+USER_CACHE_TIMEOUT = 30
+
 ROOT_URLCONF = 'event_manager.urls'
 
 TEMPLATES = [
@@ -89,17 +150,113 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'event_manager.wsgi.application'
 
+if DJANGO_PROFILE == 'api':
+    _BROWSER_APPS = {
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    }
+    _BROWSER_MIDDLEWARE = {
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',  # JWT requests carry no cookies to forge
+        'django.contrib.auth.middleware.AuthenticationMiddleware',  # DRF authenticates in the view
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',  # JSON isn't framed
+    }
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in _BROWSER_APPS]
+    MIDDLEWARE = [name for name in MIDDLEWARE if name not in _BROWSER_MIDDLEWARE]
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ('event_manager.renderers.FastJSONRenderer',)
+    TEMPLATES[0]['OPTIONS']['context_processors'] = ['django.template.context_processors.request']
+elif DJANGO_PROFILE != 'full':
+    raise ValueError(f"DJANGO_PROFILE must be 'full' or 'api', not {DJANGO_PROFILE!r}.")
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 DATABASES = {
     'default': {
+        'ENGINE': env_str('DATABASE_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': env_str('DATABASE_NAME', str(BASE_DIR / 'db.sqlite3')),
+        'USER': env_str('DATABASE_USER', ''),
+        'PASSWORD': env_str('DATABASE_PASSWORD', ''),
+        'HOST': env_str('DATABASE_HOST', ''),
+        'PORT': env_str('DATABASE_PORT', ''),
+    },
+    # Local stand-in for a read replica: `manage.py sync_sqlite_replica` copies
+    # the primary into this file. Tests reuse the default test database.
+    'replica': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': env_str('DATABASE_REPLICA_NAME', str(BASE_DIR / 'db-replica.sqlite3')),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+# SQLite connection profile (see event_manager.sqlite): 'tuned' runs WAL,
+# synchronous=NORMAL, mmap/cache pragmas and BEGIN IMMEDIATE transactions on
+# persistent, health-checked connections; 'plain' keeps Django's defaults.
+SQLITE_PROFILE = env_str('SQLITE_PROFILE', 'tuned')
+apply_sqlite_profile(DATABASES, SQLITE_PROFILE)
+
+# Writes that still hit "database is locked" are retried this many times,
+# backing off DB_LOCK_RETRY_BACKOFF * 2**n seconds (capped, with jitter).
+DB_LOCK_RETRIES = 5
+DB_LOCK_RETRY_BACKOFF = 0.02
+DB_LOCK_RETRY_BACKOFF_MAX = 0.5
+
+# Safe (GET/HEAD) requests to the events and users API read from one of these
+# aliases, picked at random; writes always go to 'default'. Empty: no replicas.
+# See event_manager.replicas.
+DATABASE_REPLICAS = env_list('DATABASE_REPLICAS')
+DATABASE_ROUTERS = ['event_manager.replicas.ReplicaRouter']
+# After a write, the user reads from the primary for this long (read-your-writes).
+# Keep it above the worst replication lag.
+REPLICA_PIN_SECONDS = 5
+
+
+# Cache
+# Local memory is per-process; point this at a shared backend (Redis/Memcached)
+# when running several workers so listing invalidation reaches all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': env_str('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env_str('DJANGO_CACHE_LOCATION', ''),
     }
 }
 
+# Upper bound on /api/events/upcoming/ cache entries; writes invalidate them sooner.
+EVENTS_UPCOMING_CACHE_TIMEOUT = 60
+# Upper bound for the cached /api/categories/ list; category and event writes
+# invalidate it, and it never outlives the next event's start (upcoming_count).
+EVENTS_CATEGORY_CACHE_TIMEOUT = 300
+
+# Longest ?start=..?end= window GET /api/events/calendar/ expands, in days.
+CALENDAR_MAX_WINDOW_DAYS = 366
+# Most repeating events one calendar page expands; the earliest-starting ones
+# win when more match the window and filters.
+CALENDAR_MAX_SERIES = 500
+
+# How long POST /api/events/{id}/hold/ keeps a seat aside for checkout.
+# `manage.py sweep_seat_holds` gives expired holds back to the event.
+SEAT_HOLD_SECONDS = 600
+
+# Registration side effects go through the outbox (events.outbox) and are
+# delivered by `manage.py run_outbox_worker`. A failed message is retried
+# after OUTBOX_RETRY_BACKOFF * 2**(attempt-1) seconds (capped, with jitter)
+# and marked failed after OUTBOX_MAX_ATTEMPTS tries.
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_WORKERS = 4
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_RETRY_BACKOFF = 2
+OUTBOX_RETRY_BACKOFF_MAX = 600
+# A claimed message becomes due again if its worker hasn't finished by then.
+OUTBOX_LEASE_SECONDS = 300
+
+# Confirmation emails print to the console until a real backend is configured.
+EMAIL_BACKEND = env_str('DJANGO_EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,392 @@
+import json
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.cache import cache
+from django.db import OperationalError, connections, router
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from events.management.commands.sync_sqlite_replica import Command as SyncReplicaCommand
+from events.models import Event, EventCategory, Registration
+from . import renderers
+from .env import env_bool, env_float, env_int, env_list, load_env_file
+from .metrics import registry
+from .renderers import FastJSONParser, FastJSONRenderer
+from .replicas import pin_key, pin_to_primary
+from .sqlite import apply_sqlite_profile, retry_on_lock
+from .throttling import LoginUsernameThrottle, TokenBucketThrottle, _acquire, _release, admission_slot
+
+User = get_user_model()
+
+
+class RequestMetricsTests(APITestCase):
+
+    def setUp(self):
+        registry.reset()
+        self.admin = User.objects.create_superuser(username="admin", password="AdminPass123")
+        category = EventCategory.objects.create(name="Conference")
+        Event.objects.create(
+            title="Measured",
+            date=timezone.now() + timedelta(days=1),
+            location="Lagos",
+            category=category,
+            created_by=self.admin
+        )
+
+    def test_metrics_labelled_by_view_name(self):
+        self.client.get(reverse("events:event-list"))
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",status="200",view="event-list"} 1', body)
+        self.assertIn('http_request_db_queries_bucket{method="GET",view="event-list",le="2"} 1', body)
+        self.assertIn('http_request_serializer_duration_seconds_count{method="GET",view="event-list"} 1', body)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        user = User.objects.create_user(username="user", password="UserPass123")
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_query_log_names_the_calling_code(self):
+        with self.assertLogs("event_manager.slow_queries", level="WARNING") as logs:
+            self.client.get(reverse("events:event-list"))
+        self.assertTrue(any("events/" in line and "SELECT" in line for line in logs.output))
+
+
+class FastJSONTests(SimpleTestCase):
+    payload = {
+        "id": 1,
+        "title": "Caf\u00e9\u2028night",
+        "price": Decimal("12.50"),
+        "date": datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        "tags": ("a", "b"),
+        7: None,
+    }
+
+    def test_renderer_output_matches_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    @skipUnless(renderers.orjson, "orjson not installed")
+    def test_renderer_numbers(self):
+        numbers = {"ratio": 0.1, "big": 1e16, "tiny": 1e-7, "price": Decimal("1E+2"), "zero": -0.0}
+        fast = FastJSONRenderer().render(numbers)
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(numbers)))
+        self.assertIn(b'"big":1e16', fast)  # DRF writes 1e+16
+        # DRF's strict renderer raises on these; orjson writes null.
+        nan = {"float": float("nan"), "inf": float("inf"), "decimal": Decimal("NaN")}
+        self.assertEqual(FastJSONRenderer().render(nan), b'{"float":null,"inf":null,"decimal":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(nan)
+
+    @skipUnless(renderers.orjson, "orjson not installed")
+    def test_renderer_uses_orjson(self):
+        with mock.patch.object(renderers.orjson, "dumps", wraps=renderers.orjson.dumps) as dumps:
+            FastJSONRenderer().render({"id": 1})
+        dumps.assert_called_once()
+
+    def test_renderer_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_indented_output_uses_drf(self):
+        media_type = "application/json; indent=2"
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, media_type), JSONRenderer().render(self.payload, media_type)
+        )
+
+    def test_parser_round_trip(self):
+        body = JSONRenderer().render({"items": [{"ticket": 1, "quantity": 2}], "note": "é"})
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)), {"items": [{"ticket": 1, "quantity": 2}], "note": "é"}
+        )
+
+    def test_parser_rejects_bad_json(self):
+        for body in (b"{", b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(APITransactionTestCase):
+    # The test "replica" mirrors the default test database, so both aliases see
+    # the same rows; the tests check which connection each query went through.
+    # Rows are committed (no TestCase transaction) so the replica connection can read them.
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="attendee", password="AttendeePass123")
+        owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.event = Event.objects.create(
+            title="Replicated",
+            date=timezone.now() + timedelta(days=1),
+            location="Lagos",
+            category=EventCategory.objects.create(name="Conference"),
+            created_by=owner
+        )
+        self.registrations_url = reverse("events:event-registrations-list", args=[self.event.id])
+
+    def assertRoutedTo(self, alias, method, url, data=None):
+        other = "default" if alias == "replica" else "replica"
+        with CaptureQueriesContext(connections[alias]) as used, \
+                CaptureQueriesContext(connections[other]) as unused:
+            response = getattr(self.client, method)(url, data)
+        self.assertLess(response.status_code, 400, response.data)
+        self.assertGreater(len(used), 0)
+        self.assertEqual(len(unused), 0, [q["sql"] for q in unused])
+        return response
+
+    def test_safe_requests_read_from_replica(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertRoutedTo("replica", "get", reverse("events:event-list"))
+        self.assertRoutedTo("replica", "get", reverse("events:event-detail", args=[self.event.id]))
+
+        self.client.force_authenticate(user=User.objects.create_superuser(username="admin", password="AdminPass123"))
+        self.assertRoutedTo("replica", "get", reverse("user-list"))
+
+    def test_writes_go_to_primary_and_pin_the_writer(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertRoutedTo("default", "post", self.registrations_url)
+
+        # Read-your-writes: the new registration is read back from the primary...
+        response = self.assertRoutedTo("default", "get", self.registrations_url)
+        self.assertEqual(response.data["count"], 1)
+
+        # ...while other users keep reading from the replica.
+        self.client.force_authenticate(user=self.event.created_by)
+        self.assertRoutedTo("replica", "get", self.registrations_url)
+
+    def test_pin_expires(self):
+        self.client.force_authenticate(user=self.user)
+        pin_to_primary(self.user.id)
+        self.assertRoutedTo("default", "get", self.registrations_url)
+        cache.delete(pin_key(self.user.id))
+        self.assertRoutedTo("replica", "get", self.registrations_url)
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Event), "default")
+        self.assertEqual(router.db_for_write(Event, instance=Event.objects.using("replica").first()), "default")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        self.assertRoutedTo("default", "get", reverse("events:event-list"))
+
+
+class SQLiteReplicaSyncTests(SimpleTestCase):
+
+    def test_copies_primary_file_into_replica(self):
+        with tempfile.TemporaryDirectory() as directory:
+            primary, replica = Path(directory, "primary.sqlite3"), Path(directory, "replica.sqlite3")
+            with closing(sqlite3.connect(primary)) as conn:
+                conn.execute("CREATE TABLE seats (n INTEGER)")
+                conn.execute("INSERT INTO seats VALUES (42)")
+                conn.commit()
+
+            SyncReplicaCommand()._copy(primary, replica)
+
+            with closing(sqlite3.connect(replica)) as conn:
+                self.assertEqual(conn.execute("SELECT n FROM seats").fetchall(), [(42,)])
+
+
+class ThrottlingTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.user = User.objects.create_user(username="attendee", password="AttendeePass123")
+        self.event = Event.objects.create(
+            title="On sale",
+            date=timezone.now() + timedelta(days=1),
+            location="Lagos",
+            category=EventCategory.objects.create(name="Concert"),
+            created_by=User.objects.create_user(username="owner", password="OwnerPass123")
+        )
+
+    def login(self, username, password="wrong"):
+        return self.client.post(reverse("user-login"), {"username": username, "password": password}, format="json")
+
+    def test_login_bucket_per_username(self):
+        for _ in range(5):
+            self.assertEqual(self.login("attendee").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.login("Attendee", "AttendeePass123")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        # Another account from the same address still gets through.
+        self.assertEqual(self.login("owner", "OwnerPass123").status_code, status.HTTP_200_OK)
+        self.assertIn('throttled_requests_total{scope="login_user"} 1', registry.render())
+
+    def test_login_with_non_object_body_is_a_bad_request(self):
+        response = self.client.post(reverse("user-login"), [1, 2], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bucket_refills_continuously(self):
+        clock = [1000.0]
+        with mock.patch.object(LoginUsernameThrottle, "timer", lambda self: clock[0]):
+            for _ in range(5):
+                self.login("attendee")
+            self.assertEqual(self.login("attendee").status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            clock[0] += 12  # 5/min: one token every 12 seconds, no waiting for a window to reset
+            self.assertEqual(self.login("attendee").status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(self.login("attendee").status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_event_bucket_is_shared_by_all_registrants(self):
+        rates = {**TokenBucketThrottle.THROTTLE_RATES, "registration_event": "2/min"}
+        url = reverse("events:event-registrations-list", args=[self.event.id])
+        codes = []
+        with mock.patch.object(TokenBucketThrottle, "THROTTLE_RATES", rates):
+            for i in range(3):
+                self.client.force_authenticate(user=User.objects.create_user(username=f"fan{i}"))
+                codes.append(self.client.post(url).status_code)
+        self.assertEqual(codes, [201, 201, 429])
+
+
+@override_settings(REGISTRATION_MAX_CONCURRENT=1)
+class AdmissionControlTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.user = User.objects.create_user(username="attendee", password="AttendeePass123")
+        self.event = Event.objects.create(
+            title="Hot",
+            date=timezone.now() + timedelta(days=1),
+            location="Lagos",
+            category=EventCategory.objects.create(name="Concert"),
+            created_by=User.objects.create_user(username="owner", password="OwnerPass123")
+        )
+        self.url = reverse("events:event-registrations-list", args=[self.event.id])
+        self.client.force_authenticate(user=self.user)
+
+    @override_settings(REGISTRATION_ADMISSION_MODE="shed")
+    def test_sheds_when_event_is_at_its_limit(self):
+        with admission_slot(f"event:{self.event.id}"):
+            response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Retry-After", response)
+        self.assertFalse(Registration.objects.exists())
+        self.assertIn('registration_admission_total{result="shed"} 1', registry.render())
+
+        # The slot is free again once the holder is done.
+        self.assertEqual(self.client.post(self.url).status_code, status.HTTP_201_CREATED)
+
+    def test_queued_request_runs_when_a_slot_frees(self):
+        release = threading.Timer(0.05, lambda: _release(f"admission:event:{self.event.id}"))
+        self.assertTrue(_acquire(f"admission:event:{self.event.id}", 1, 30))
+        release.start()
+        response = self.client.post(self.url)
+        release.join()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        metrics = registry.render()
+        self.assertIn('registration_admission_total{result="queued"} 1', metrics)
+        self.assertIn('registration_admission_total{result="admitted"} 1', metrics)
+        self.assertIn("registration_admission_wait_seconds_count 1", metrics)
+
+    @override_settings(REGISTRATION_QUEUE_TIMEOUT=0.05)
+    def test_queue_gives_up_after_timeout(self):
+        with admission_slot(f"event:{self.event.id}"):
+            response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        metrics = registry.render()
+        self.assertIn('registration_admission_total{result="queued"} 1', metrics)
+        self.assertIn('registration_admission_total{result="shed"} 1', metrics)
+
+    def test_other_events_are_not_held_up(self):
+        with admission_slot("event:some-other-event"):
+            self.assertEqual(self.client.post(self.url).status_code, status.HTTP_201_CREATED)
+
+
+@override_settings(DB_LOCK_RETRY_BACKOFF=0, DB_LOCK_RETRIES=3)
+class SQLiteProfileTests(SimpleTestCase):
+
+    def test_tuned_profile_merges_into_sqlite_aliases(self):
+        databases = apply_sqlite_profile({
+            "default": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {"timeout": 20}},
+            "other": {"ENGINE": "django.db.backends.postgresql"},
+        }, "tuned")
+        default = databases["default"]
+        self.assertIn("PRAGMA journal_mode=WAL", default["OPTIONS"]["init_command"])
+        self.assertEqual(default["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+        self.assertEqual(default["OPTIONS"]["timeout"], 20)  # explicit settings win
+        self.assertTrue(default["CONN_HEALTH_CHECKS"])
+        self.assertEqual(databases["other"], {"ENGINE": "django.db.backends.postgresql"})
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            apply_sqlite_profile({}, "turbo")
+
+    def test_retries_lock_errors(self):
+        calls = mock.Mock(side_effect=[OperationalError("database is locked"), "saved"])
+        self.assertEqual(retry_on_lock(calls)(), "saved")
+        self.assertEqual(calls.call_count, 2)
+
+    def test_gives_up_after_attempts(self):
+        calls = mock.Mock(side_effect=OperationalError("database table is locked"))
+        with self.assertRaises(OperationalError):
+            retry_on_lock(calls)()
+        self.assertEqual(calls.call_count, 3)
+
+    def test_other_errors_and_open_transactions_are_not_retried(self):
+        calls = mock.Mock(side_effect=OperationalError("no such table: events_event"))
+        with self.assertRaises(OperationalError):
+            retry_on_lock(calls)()
+        self.assertEqual(calls.call_count, 1)
+
+        calls = mock.Mock(side_effect=OperationalError("database is locked"))
+        with mock.patch.object(connections["default"], "in_atomic_block", True):
+            with self.assertRaises(OperationalError):
+                retry_on_lock(calls)()
+        self.assertEqual(calls.call_count, 1)
+
+
+class EnvSettingsTests(SimpleTestCase):
+
+    def test_typed_values(self):
+        with mock.patch.dict("os.environ", {"A_BOOL": "Yes", "AN_INT": "8", "A_FLOAT": "0.5", "A_LIST": "a, b,,c"}):
+            self.assertIs(env_bool("A_BOOL"), True)
+            self.assertEqual(env_int("AN_INT"), 8)
+            self.assertEqual(env_float("A_FLOAT"), 0.5)
+            self.assertEqual(env_list("A_LIST"), ["a", "b", "c"])
+
+    def test_defaults_when_unset(self):
+        with mock.patch.dict("os.environ", {}, clear=True):
+            self.assertIs(env_bool("A_BOOL", True), True)
+            self.assertEqual(env_int("AN_INT", 3), 3)
+            self.assertEqual(env_list("A_LIST", ["*"]), ["*"])
+
+    def test_invalid_values_are_rejected(self):
+        with mock.patch.dict("os.environ", {"A_BOOL": "maybe", "AN_INT": "eight"}):
+            with self.assertRaises(ImproperlyConfigured):
+                env_bool("A_BOOL")
+            with self.assertRaises(ImproperlyConfigured):
+                env_int("AN_INT")
+
+    def test_env_file_does_not_override_the_environment(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, ".env")
+            path.write_text("FROM_FILE=file\nALREADY_SET=file\n")
+            with mock.patch.dict("os.environ", {"ALREADY_SET": "process"}):
+                load_env_file(path)
+                self.assertEqual(env_list("FROM_FILE"), ["file"])
+                self.assertEqual(env_list("ALREADY_SET"), ["process"])
@@ -0,0 +1,176 @@
+"""
+Request shaping for write hot spots: login and event registration.
+
+Throttles are token buckets kept in the cache backend. A bucket holds up to
+``n`` tokens for a rate of ``"n/period"`` (from REST_FRAMEWORK's
+``DEFAULT_THROTTLE_RATES``) and refills continuously, so the limit applies
+over a sliding window instead of resetting at fixed boundaries, and a short
+burst up to ``n`` is allowed.
+
+``admission_slot()`` caps how many registration writes run at once for one
+event. Once the cap is reached, extra attempts either wait in a queue for a
+free slot (``REGISTRATION_ADMISSION_MODE = "queue"``, for up to
+``REGISTRATION_QUEUE_TIMEOUT`` seconds) or are shed at once with a 503.
+A retry storm on a hot event then costs a cache round trip instead of a
+turn on the database writer.
+
+Bucket updates and slot counters go through the cache without locks. With a
+shared cache (Redis/Memcached) they hold across workers, and racing
+requests may occasionally get one token too many.
+"""
+import random
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import SimpleRateThrottle
+
+from .metrics import registry
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """A token bucket per cache key; subclasses set ``scope`` and ``get_ident_for()``."""
+
+    def get_ident_for(self, request, view):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_for(request, view)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        tokens, stamp = self.cache.get(self.key, (self.num_requests, now))
+        self.tokens = min(self.num_requests, tokens + (now - stamp) * self.num_requests / self.duration)
+        if self.tokens < 1:
+            registry.increment("throttled_requests_total", scope=self.scope)
+            return False
+        self.cache.set(self.key, (self.tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        # Seconds until the bucket has refilled one whole token.
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = "login_ip"
+
+    def get_ident_for(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """Per account, so one username can't be guessed at from many addresses."""
+    scope = "login_user"
+
+    def get_ident_for(self, request, view):
+        # The serializer rejects non-object bodies with a 400; don't fail before it can.
+        username = request.data.get("username") if isinstance(request.data, Mapping) else None
+        return str(username).lower() if username else None
+
+
+class RegistrationUserThrottle(TokenBucketThrottle):
+    scope = "registration_user"
+
+    def get_ident_for(self, request, view):
+        return request.user.id if request.user.is_authenticated else None
+
+
+class RegistrationIPThrottle(TokenBucketThrottle):
+    scope = "registration_ip"
+
+    def get_ident_for(self, request, view):
+        return self.get_ident(request)
+
+
+class EventRegistrationThrottle(TokenBucketThrottle):
+    """Shared by everyone registering for one event: smooths an on-sale rush to a rate the writer can take."""
+    scope = "registration_event"
+
+    def get_ident_for(self, request, view):
+        return view.kwargs.get("event_pk")
+
+
+# ------------------------
+# Admission control
+# ------------------------
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many registrations for this event right now; try again shortly."
+    default_code = "overloaded"
+
+    def __init__(self, detail=None, code=None, wait=None):
+        super().__init__(detail, code)
+        self.wait = wait  # sent as Retry-After by DRF's exception handler
+
+
+def _acquire(key, limit, ttl):
+    cache.add(key, 0, ttl)
+    try:
+        in_flight = cache.incr(key)
+    except ValueError:  # expired between add() and incr()
+        cache.add(key, 1, ttl)
+        in_flight = 1
+    if in_flight > limit:
+        _release(key)
+        return False
+    return True
+
+
+def _release(key):
+    try:
+        cache.decr(key)
+    except ValueError:  # the counter expired while we held the slot
+        pass
+
+
+@contextmanager
+def admission_slot(name, limit=None, mode=None, timeout=None):
+    """
+    Hold one of ``limit`` concurrent slots for ``name`` (e.g. ``"event:42"``)
+    while the block runs; queue or shed (raise ``Overloaded``) when none is free.
+    """
+    limit = getattr(settings, "REGISTRATION_MAX_CONCURRENT", 8) if limit is None else limit
+    mode = getattr(settings, "REGISTRATION_ADMISSION_MODE", "queue") if mode is None else mode
+    timeout = getattr(settings, "REGISTRATION_QUEUE_TIMEOUT", 2.0) if timeout is None else timeout
+    if not limit:
+        yield
+        return
+
+    key = f"admission:{name}"
+    # A worker killed while holding a slot must not keep it forever.
+    ttl = max(int(timeout) * 2, 30)
+    if not _acquire(key, limit, ttl):
+        if mode != "queue":
+            registry.increment("registration_admission_total", result="shed")
+            raise Overloaded(wait=1)
+
+        registry.increment("registration_admission_total", result="queued")
+        start = time.monotonic()
+        deadline = start + timeout
+        while not _acquire(key, limit, ttl):
+            if time.monotonic() >= deadline:
+                registry.increment("registration_admission_total", result="shed")
+                raise Overloaded(wait=max(1, round(timeout)))
+            time.sleep(random.uniform(0.005, 0.02))
+        registry.observe("registration_admission_wait_seconds", time.monotonic() - start)
+
+    registry.increment("registration_admission_total", result="admitted")
+    try:
+        yield
+    finally:
+        _release(key)
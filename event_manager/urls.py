@@ -1,8 +1,15 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 
+from .views import MetricsView
+
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/auth/", include("users.urls")),   # user auth endpoints
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),  # Prometheus scrape (admin only)
     path("api/", include("events.urls")),       # event system endpoints
 ]
+
+if apps.is_installed("django.contrib.admin"):  # not in the api-only profile
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
@@ -0,0 +1,26 @@
+from rest_framework import permissions
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import registry
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data.encode(self.charset) if isinstance(data, str) else str(data).encode(self.charset)
+
+
+class MetricsView(APIView):
+    """Request metrics for this worker process in Prometheus text format (admin only)."""
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        response = Response(registry.render())
+        response["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        return response
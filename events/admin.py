@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import EventCategory, Event, TicketPricing
+from .models import EventCategory, Event, OutboxMessage, TicketPricing
 
 @admin.register(EventCategory)
 class EventCategoryAdmin(admin.ModelAdmin):
@@ -12,3 +12,8 @@ class EventAdmin(admin.ModelAdmin):
 @admin.register(TicketPricing)
 class TicketPricingAdmin(admin.ModelAdmin):
     list_display = ('id', 'event', 'ticket_type', 'price', 'currency')
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'topic', 'status', 'attempts', 'available_at', 'last_error')
+    list_filter = ('status', 'topic')
@@ -0,0 +1,127 @@
+"""
+Native async read endpoints for the hottest event listings.
+
+DRF views are sync, so under ASGI each request pays a thread hop. These
+plain Django async views fetch with the async ORM and reuse the DRF
+serializers (pure CPU once relations are select_related), returning the
+same JSON shape as their sync counterparts under /api/async/.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import categories_cache_key, get_cached_categories, set_cached_categories
+from .filters import filter_date_range, filter_nearby, filter_upcoming
+from .models import Event, EventCategory
+from .search import search_events
+from .serializers import EventCategorySerializer, EventSerializer
+
+
+def _event_queryset():
+    meta = EventSerializer.Meta
+    return Event.objects.select_related(*meta.select_related).only(*meta.only).order_by("date", "id")
+
+
+def _not_found(detail):
+    return JsonResponse({"detail": detail}, status=404)
+
+
+async def _paginated_response(request, queryset, serializer_class):
+    """Page-number pagination matching DRF's PageNumberPagination output."""
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        return _not_found("Invalid page.")
+
+    count = await queryset.acount()
+    offset = (page - 1) * page_size
+    if page < 1 or (page > 1 and offset >= count):
+        return _not_found("Invalid page.")
+
+    rows = [obj async for obj in queryset[offset:offset + page_size]]
+    # One many=True serializer: building fields per row costs more than the query.
+    results = serializer_class(rows, many=True).data
+
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, "page", page + 1) if offset + page_size < count else None
+    if page <= 1:
+        previous_url = None
+    elif page == 2:
+        previous_url = remove_query_param(url, "page")
+    else:
+        previous_url = replace_query_param(url, "page", page - 1)
+
+    return JsonResponse({
+        "count": count,
+        "next": next_url,
+        "previous": previous_url,
+        "results": results,
+    })
+
+
+@require_GET
+async def event_list(request):
+    """Async GET /api/events/ supporting ?category=, ?location=, ?q=, ?start_date=, ?end_date= and ?near=."""
+    queryset = _event_queryset()
+    if category := request.GET.get("category"):
+        try:
+            queryset = queryset.filter(category_id=int(category))
+        except ValueError:
+            # Same answer as the filterset on the sync endpoint.
+            return JsonResponse(
+                {"category": ["Select a valid choice. That choice is not one of the available choices."]}, status=400
+            )
+    if location := request.GET.get("location"):
+        queryset = queryset.filter(location=location)
+    if query := request.GET.get("q", "").strip():
+        queryset = search_events(queryset, query)
+    try:
+        queryset = filter_nearby(filter_date_range(queryset, request.GET), request.GET)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    return await _paginated_response(request, queryset, EventSerializer)
+
+
+@require_GET
+async def event_detail(request, pk):
+    try:
+        event = await _event_queryset().aget(pk=pk)
+    except Event.DoesNotExist:
+        return _not_found("No Event matches the given query.")
+    return JsonResponse(EventSerializer(event).data)
+
+
+@require_GET
+async def upcoming_events(request):
+    try:
+        queryset = filter_upcoming(_event_queryset().filter(date__gte=timezone.now()), request.GET)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    return await _paginated_response(request, queryset, EventSerializer)
+
+
+@require_GET
+async def category_list(request):
+    """Async GET /api/categories/, sharing its cache entry and ETag."""
+    # The cache helpers are sync; with a network backend (Redis) they must not block the loop.
+    cache_key = await sync_to_async(categories_cache_key)()
+    entry = await sync_to_async(get_cached_categories)(cache_key)
+    if entry is None:
+        categories = [c async for c in EventCategory.objects.with_event_counts().order_by("id")]
+        next_start = min((c.next_start for c in categories if c.next_start), default=None)
+        data = EventCategorySerializer(categories, many=True).data
+        entry = await sync_to_async(set_cached_categories)(cache_key, data, next_start)
+
+    not_modified = get_conditional_response(request, etag=entry["etag"])
+    if not_modified is not None:
+        not_modified["ETag"] = entry["etag"]
+        return not_modified
+    response = JsonResponse(entry["data"], safe=False)
+    response["ETag"] = entry["etag"]
+    return response
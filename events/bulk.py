@@ -0,0 +1,205 @@
+"""
+Streaming bulk registration import and export for a single event.
+
+Imports read the request body line by line (CSV with a ``username`` or
+``user_id`` column, or NDJSON objects with the same keys) and insert in
+chunks: one user lookup, one duplicate check, one capacity claim, one
+bulk_create and one outbox insert per chunk. Exports stream straight from an ``iterator()``
+queryset so memory stays flat regardless of attendee count.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .cache import bump_events_generation
+from .models import Event, Registration
+from .outbox import enqueue_many
+
+User = get_user_model()
+
+CHUNK_SIZE = 500
+EXPORT_FIELDS = ("id", "user_id", "user__username", "status", "registration_date")
+EXPORT_HEADER = ("id", "user_id", "username", "status", "registration_date")
+
+
+INVALID = object()
+
+
+def iter_lines(stream):
+    for raw in iter(stream.readline, b""):
+        yield raw.decode("utf-8-sig", errors="replace")
+
+
+def _load_json(line):
+    if not line.strip():
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return INVALID
+
+
+def parse_rows(stream, content_type):
+    """Yield ``(row_number, identifier)`` pairs; identifier is ``("user_id"|"username", value)``."""
+    lines = iter_lines(stream)
+    if content_type.startswith(("application/x-ndjson", "application/jsonl")):
+        records = (_load_json(line) for line in lines)
+    else:
+        records = csv.DictReader(lines)
+
+    for number, record in enumerate(records, start=1):
+        if record is None:
+            continue
+        if not isinstance(record, dict):
+            yield number, None  # unparseable line or non-object JSON
+        elif record.get("user_id") not in (None, ""):
+            yield number, ("user_id", str(record["user_id"]).strip())
+        elif record.get("username") not in (None, ""):
+            yield number, ("username", str(record["username"]).strip())
+        else:
+            yield number, None
+
+
+def import_registrations(event, rows, chunk_size=CHUNK_SIZE):
+    """Register the users in ``rows`` for ``event``; returns one result dict per row."""
+    results = []
+    seen = set()
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        results.extend(_import_chunk(event, chunk, seen))
+    return results
+
+
+def _import_chunk(event, chunk, seen):
+    usernames = {ident[1] for _, ident in chunk if ident and ident[0] == "username"}
+    # isascii(): str.isdigit() also accepts digits like "²" that int() rejects.
+    user_ids = {
+        int(ident[1]) for _, ident in chunk
+        if ident and ident[0] == "user_id" and ident[1].isascii() and ident[1].isdigit()
+    }
+    by_username = dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+    known_ids = {str(pk) for pk in User.objects.filter(pk__in=user_ids).values_list("id", flat=True)}
+
+    results, candidates = {}, []
+    for number, ident in chunk:
+        if ident is None:
+            results[number] = _error(number, None, "Row needs a username or user_id.")
+            continue
+        kind, value = ident
+        user_id = by_username.get(value) if kind == "username" else (int(value) if value in known_ids else None)
+        if user_id is None:
+            results[number] = _error(number, value, "Unknown user.")
+        elif user_id in seen:
+            results[number] = _error(number, value, "Duplicate row for this user.")
+        else:
+            seen.add(user_id)
+            candidates.append((number, value, user_id))
+
+    already = set(
+        Registration.objects.filter(event=event, user_id__in=[c[2] for c in candidates])
+        .values_list("user_id", flat=True)
+    )
+    fresh = []
+    for number, value, user_id in candidates:
+        if user_id in already:
+            results[number] = _error(number, value, "Already registered for this event.")
+        else:
+            fresh.append((number, value, user_id))
+
+    try:
+        with transaction.atomic():
+            granted = _claim_seats(event, len(fresh))
+            created = Registration.objects.bulk_create(
+                Registration(user_id=user_id, event=event) for _, _, user_id in fresh[:granted]
+            )
+            # Whoever didn't get a seat joins the waitlist in upload order.
+            position = Registration.objects.next_waitlist_position(event.pk)
+            waitlisted = Registration.objects.bulk_create(
+                Registration(
+                    user_id=user_id, event=event, status=Registration.Status.WAITLISTED,
+                    waitlist_position=position + offset,
+                )
+                for offset, (_, _, user_id) in enumerate(fresh[granted:])
+            )
+            enqueue_many("registration.created", (registration.outbox_payload() for registration in created))
+            enqueue_many("registration.waitlisted", (registration.outbox_payload() for registration in waitlisted))
+            transaction.on_commit(bump_events_generation)
+    except IntegrityError:
+        # Someone registered concurrently; settle this chunk one row at a time.
+        granted = 0
+        for number, value, user_id in fresh:
+            results[number] = _insert_one(event, number, value, user_id)
+
+    for number, value, _ in fresh[:granted]:
+        results[number] = {"row": number, "user": value, "status": "created"}
+    for number, value, _ in fresh[granted:]:
+        results.setdefault(number, {"row": number, "user": value, "status": "waitlisted"})
+
+    return [results[number] for number, _ in chunk]
+
+
+def _claim_seats(event, wanted):
+    """Claim up to ``wanted`` seats with one conditional UPDATE; returns how many were granted."""
+    while wanted:
+        # Held seats count against capacity, exactly as in EventQuerySet.has_room().
+        capacity, booked, held = (
+            Event.objects.select_for_update().filter(pk=event.pk)
+            .values_list("capacity", "seats_booked", "seats_held").get()
+        )
+        if capacity:
+            wanted = min(wanted, max(capacity - booked - held, 0))
+        # Only fails if the counters moved since the read (no row locks on SQLite): re-read.
+        if not wanted or Event.objects.reserve_seats(event.pk, wanted):
+            break
+    return wanted
+
+
+def _insert_one(event, number, value, user_id):
+    registration = Registration(user_id=user_id, event=event)
+    try:
+        registration.save()
+    except IntegrityError:
+        return _error(number, value, "Already registered for this event.")
+    except ValidationError as exc:
+        return _error(number, value, " ".join(exc.messages))
+    status = "waitlisted" if registration.status == Registration.Status.WAITLISTED else "created"
+    return {"row": number, "user": value, "status": status}
+
+
+def _error(number, value, detail):
+    return {"row": number, "user": value, "status": "error", "detail": detail}
+
+
+def export_rows(event, output="csv"):
+    """Yield the event's registrations as CSV or NDJSON text chunks."""
+    queryset = (
+        Registration.objects.filter(event=event).order_by("id")
+        .values_list(*EXPORT_FIELDS).iterator(chunk_size=2000)
+    )
+    if output == "ndjson":
+        for row in queryset:
+            record = dict(zip(EXPORT_HEADER, row))
+            record["registration_date"] = record["registration_date"].isoformat()
+            yield json.dumps(record) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+    for row in queryset:
+        writer.writerow(row[:-1] + (row[-1].isoformat(),))
+        if buffer.tell() > 64 * 1024:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def _drain(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
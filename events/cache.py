@@ -0,0 +1,112 @@
+import hashlib
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from event_manager.metrics import registry
+
+GENERATION_KEY = "events:generation"
+UPCOMING_KEY_PREFIX = "events:upcoming"
+UPCOMING_STATS_KEYS = {"hits": "events:upcoming:hits", "misses": "events:upcoming:misses"}
+CATEGORIES_GENERATION_KEY = "events:categories:generation"
+CATEGORIES_KEY_PREFIX = "events:categories"
+
+
+def events_generation():
+    """Current version of event data; cached listings are keyed on it."""
+    return _generation(GENERATION_KEY)
+
+
+def bump_events_generation():
+    """Invalidate every cached listing built from the previous generation."""
+    _bump(GENERATION_KEY)
+
+
+def bump_categories_generation():
+    """Invalidate the cached category list (categories or their events changed)."""
+    _bump(CATEGORIES_GENERATION_KEY)
+
+
+def _generation(key):
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses an old version.
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def upcoming_cache_key(request):
+    # Normalize so ?page=1&title=x and ?title=x&page= share an entry.
+    params = {
+        key: value.strip()
+        for key, value in request.query_params.items()
+        if value.strip()
+    }
+    if params.get("page") == "1":
+        del params["page"]
+    raw = request.get_host() + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"{UPCOMING_KEY_PREFIX}:{events_generation()}:{digest}"
+
+
+def get_cached_upcoming(key):
+    data = cache.get(key)
+    _count("hits" if data is not None else "misses")
+    return data
+
+
+def set_cached_upcoming(key, data):
+    cache.set(key, data, timeout=getattr(settings, "EVENTS_UPCOMING_CACHE_TIMEOUT", 60))
+
+
+def upcoming_cache_stats():
+    stats = cache.get_many(UPCOMING_STATS_KEYS.values())
+    return {name: stats.get(key, 0) for name, key in UPCOMING_STATS_KEYS.items()}
+
+
+def categories_cache_key():
+    return f"{CATEGORIES_KEY_PREFIX}:{_generation(CATEGORIES_GENERATION_KEY)}"
+
+
+def get_cached_categories(key):
+    """The cached ``{"etag", "data"}`` entry for the category list, or None."""
+    entry = cache.get(key)
+    registry.increment("events_categories_cache_total", result="hit" if entry is not None else "miss")
+    return entry
+
+
+def set_cached_categories(key, data, next_start=None):
+    """
+    Cache the category list with a strong ETag over its content. ``next_start``
+    is the soonest upcoming event: once it starts every ``upcoming_count`` is
+    stale, so the entry never outlives it.
+    """
+    timeout = getattr(settings, "EVENTS_CATEGORY_CACHE_TIMEOUT", 300)
+    if next_start is not None:
+        timeout = max(1, min(timeout, math.ceil((next_start - timezone.now()).total_seconds())))
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    entry = {"etag": f'"{hashlib.md5(body.encode()).hexdigest()}"', "data": data}
+    cache.set(key, entry, timeout=timeout)
+    return entry
+
+
+def _count(name):
+    registry.increment("events_upcoming_cache_total", result=name)
+    key = UPCOMING_STATS_KEYS[name]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
@@ -0,0 +1,97 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .geo import filter_near
+from .search import search_events
+
+DEFAULT_NEAR_RADIUS_KM = 10
+MAX_NEAR_RADIUS_KM = 20_000  # half the Earth's circumference
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Ranked full-text search over title, description and location via ``?q=``."""
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search_events(queryset, query)
+
+
+def filter_upcoming(queryset, params):
+    """Apply the /events/upcoming/ query params (q, title, location, start_date, end_date, near, radius)."""
+    query = params.get("q", "").strip()
+    title = params.get("title")
+    location = params.get("location")
+
+    if query:
+        queryset = search_events(queryset, query)
+    if title:
+        queryset = queryset.filter(title__icontains=title)
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    return filter_nearby(filter_date_range(queryset, params), params)
+
+
+class DateRangeFilter(BaseFilterBackend):
+    """Events starting between ``?start_date=`` and ``?end_date=`` (either bound optional)."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_date_range(queryset, request.query_params)
+
+
+def filter_date_range(queryset, params):
+    # Parsed here so a malformed date is a 400, not a ValidationError from the ORM.
+    start_date = params.get("start_date") and parse_moment("start_date", params["start_date"])
+    end_date = params.get("end_date") and parse_moment("end_date", params["end_date"])
+    if start_date and end_date:
+        queryset = queryset.filter(date__range=[start_date, end_date])
+    elif start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    elif end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    return queryset
+
+
+def parse_moment(name, value):
+    """A query param holding an ISO date (midnight, local time) or datetime, made aware."""
+    try:
+        moment = parse_datetime(value)
+        if moment is None and parse_date(value) is not None:
+            moment = datetime.combine(parse_date(value), time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValidationError({name: "Expected an ISO 8601 date or datetime."})
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+class NearFilter(BaseFilterBackend):
+    """Events within ``?radius=`` km (default 10) of ``?near=lat,lng``, nearest first."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_nearby(queryset, request.query_params)
+
+
+def filter_nearby(queryset, params):
+    near = params.get("near")
+    if not near:
+        return queryset
+    if "cursor" in params:
+        raise ValidationError({"near": "Results sorted by distance are paged with ?page=, not ?cursor=."})
+    try:
+        latitude, longitude = (float(part) for part in near.split(","))
+        radius = float(params.get("radius") or DEFAULT_NEAR_RADIUS_KM)
+    except ValueError:
+        raise ValidationError({"near": "Expected ?near=<latitude>,<longitude> and ?radius=<km>."})
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValidationError({"near": "Latitude must be within +-90 and longitude within +-180."})
+    if not 0 < radius <= MAX_NEAR_RADIUS_KM:
+        raise ValidationError({"radius": f"Must be more than 0 and at most {MAX_NEAR_RADIUS_KM} km."})
+    return filter_near(queryset, latitude, longitude, radius)
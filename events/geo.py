@@ -0,0 +1,125 @@
+"""
+"Events near a point" without PostGIS.
+
+Events with coordinates carry their geohash: a base-32 string whose every
+extra character splits the cell above it into 32, so points in the same
+cell share a prefix and sort next to each other. A search circle is first
+covered by a handful of cells at the finest precision that keeps the
+cover under ``MAX_CELLS`` cells. Each cell is one range seek on the
+``geohash`` index (``prefix <= geohash < prefix + "~"``). A latitude band
+and the exact haversine distance, computed in SQL, then drop the corners
+and give the sort key.
+"""
+import math
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+PRECISION = 9  # stored geohash length, cells of about 5 m x 5 m
+MAX_CELLS = 32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    """The geohash of a point, ``precision`` characters long."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate longitude, latitude, starting with longitude.
+        bounds, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """(height, width) of a cell in degrees of latitude and longitude."""
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** (5 * precision - lat_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) around the circle; longitudes may run past +-180."""
+    dlat = radius_km / _KM_PER_DEGREE
+    min_lat, max_lat = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 90.0 or radius_km >= EARTH_RADIUS_KM * math.pi / 2:
+        return min_lat, max_lat, -180.0, 180.0  # the circle reaches a pole
+    # At the latitude farthest from the equator a degree of longitude is shortest.
+    dlng = min(radius_km / (_KM_PER_DEGREE * math.cos(math.radians(widest))), 180.0)
+    return min_lat, max_lat, longitude - dlng, longitude + dlng
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """Geohash prefixes whose cells together cover the circle."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        columns = math.floor(max_lng / width) - math.floor(min_lng / width) + 1
+        if rows * min(columns, 2 ** (5 * precision - 5 * precision // 2)) <= MAX_CELLS or precision == 1:
+            break
+
+    cells = set()
+    # Sample one point per cell row and column; a sample every cell-size apart hits every cell.
+    lat = min_lat
+    while True:
+        lng = min_lng
+        while True:
+            wrapped = (lng + 180.0) % 360.0 - 180.0
+            cells.add(encode(min(lat, 90.0 - height / 2), wrapped, precision))
+            if lng >= max_lng:
+                break
+            lng = min(lng + width, max_lng)
+        if lat >= max_lat:
+            break
+        lat = min(lat + height, max_lat)
+    return sorted(cells)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distance_expression(latitude, longitude):
+    """Haversine distance in km from the point to each row's coordinates, as an ORM expression."""
+    lat0 = math.radians(latitude)
+    dlat = Radians(F("latitude")) - Value(lat0)
+    dlng = Radians(F("longitude")) - Value(math.radians(longitude))
+    a = Power(Sin(dlat / 2), 2) + Value(math.cos(lat0)) * Cos(Radians(F("latitude"))) * Power(Sin(dlng / 2), 2)
+    # Least() keeps rounding from pushing ASin's argument past 1.
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Value(1.0), Sqrt(a)), output_field=FloatField())
+
+
+def near_candidates(queryset, latitude, longitude, radius_km):
+    """Events in the cells covering the circle and its latitude band: a superset of the matches."""
+    cells = Q()
+    for prefix in covering_cells(latitude, longitude, radius_km):
+        cells |= Q(geohash__gte=prefix, geohash__lt=prefix + "~")
+    min_lat, max_lat, _, _ = bounding_box(latitude, longitude, radius_km)
+    return queryset.filter(cells, latitude__range=(min_lat, max_lat))
+
+
+def filter_near(queryset, latitude, longitude, radius_km):
+    """Events within ``radius_km`` of the point, annotated with ``distance_km`` and nearest first."""
+    return (
+        near_candidates(queryset, latitude, longitude, radius_km)
+        .annotate(distance_km=distance_expression(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+        .order_by("distance_km", "id")
+    )
@@ -0,0 +1,96 @@
+"""
+Outbox handlers for registration side effects; see events.outbox.
+
+Handlers may run more than once for the same message, and possibly after
+the registration changed again, so they re-read current state and skip
+anything that no longer applies.
+"""
+from django.core.mail import send_mail
+
+from event_manager.metrics import registry
+
+from .models import Registration
+from .outbox import register_handler
+
+
+def _load(payload):
+    return (
+        Registration.objects.select_related("user", "event")
+        .filter(pk=payload["registration_id"]).first()
+    )
+
+
+@register_handler("registration.created")
+def send_registration_confirmation(payload):
+    registration = _load(payload)
+    if registration is None or registration.status != Registration.Status.REGISTERED:
+        return
+    if not registration.user.email:
+        return
+    event = registration.event
+    send_mail(
+        f"You're registered for {event.title}",
+        f"See you at {event.location} on {event.date:%Y-%m-%d %H:%M}.",
+        None,
+        [registration.user.email],
+    )
+
+
+@register_handler("registration.cancelled")
+def send_cancellation_notice(payload):
+    registration = _load(payload)
+    if registration is None or registration.status != Registration.Status.CANCELLED:
+        return
+    if not registration.user.email:
+        return
+    send_mail(
+        f"Registration cancelled: {registration.event.title}",
+        "Your registration has been cancelled and your seat released.",
+        None,
+        [registration.user.email],
+    )
+
+
+@register_handler("registration.waitlisted")
+def send_waitlist_notice(payload):
+    registration = _load(payload)
+    if registration is None or registration.status != Registration.Status.WAITLISTED:
+        return
+    if not registration.user.email:
+        return
+    send_mail(
+        f"You're on the waitlist for {registration.event.title}",
+        f"The event is full; you are number {registration.waitlist_position} in line "
+        "and will be registered automatically if a seat frees up.",
+        None,
+        [registration.user.email],
+    )
+
+
+@register_handler("registration.promoted")
+def send_promotion_notice(payload):
+    registration = _load(payload)
+    if registration is None or registration.status != Registration.Status.REGISTERED:
+        return
+    if not registration.user.email:
+        return
+    event = registration.event
+    send_mail(
+        f"A seat opened up: you're registered for {event.title}",
+        f"See you at {event.location} on {event.date:%Y-%m-%d %H:%M}.",
+        None,
+        [registration.user.email],
+    )
+
+
+def _activity_counter(action):
+    def count_registration_activity(payload):
+        # Per-process like every other metric; a retried message may count twice.
+        registry.increment("registration_activity_total", action=action)
+    return count_registration_activity
+
+
+register_handler("registration.created")(_activity_counter("created"))
+register_handler("registration.cancelled")(_activity_counter("cancelled"))
+register_handler("registration.waitlisted")(_activity_counter("waitlisted"))
+register_handler("registration.promoted")(_activity_counter("promoted"))
@@ -0,0 +1,207 @@
+import json
+import platform
+import random
+import time
+from datetime import timedelta
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events.benchmarks import bulk_insert, summarize, throwaway_database
+from events.models import Event, EventCategory, Registration, TicketPricing
+from events.search import get_search_backend
+
+User = get_user_model()
+
+PASSWORD = "BenchPass123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and measure throughput, latency percentiles and DB "
+        "queries per request for the main API endpoints. Optionally save the results "
+        "as a JSON baseline or compare against one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--events", type=int, default=5_000)
+        parser.add_argument("--users", type=int, default=2_000)
+        parser.add_argument("--registrations", type=int, default=20_000)
+        parser.add_argument("--requests", type=int, default=200, help="Requests timed per endpoint.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--save", metavar="PATH", help="Write results as a JSON baseline.")
+        parser.add_argument("--compare", metavar="PATH", help="Fail if results regress against this baseline.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.25,
+            help="Allowed p50 slowdown versus the baseline, as a fraction (default 0.25).",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        with throwaway_database():
+            self._seed(options)
+            results = self._run(options["requests"])
+
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "seeded": {key: options[key] for key in ("categories", "events", "users", "registrations")},
+                "requests": options["requests"],
+            },
+            "endpoints": results,
+        }
+        self._print(results)
+
+        if options["save"]:
+            with open(options["save"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Baseline written to {options['save']}")
+        if options["compare"]:
+            self._compare(results, options["compare"], options["threshold"])
+
+    # ------------------------
+    # Data
+    # ------------------------
+
+    def _seed(self, options):
+        self.stdout.write(
+            "Seeding {categories} categories, {events} events, {users} users, "
+            "{registrations} registrations...".format(**options)
+        )
+        password = make_password(PASSWORD)
+        bulk_insert(User, (User(username=f"bench{i}", password=password) for i in range(options["users"])))
+        self.user_ids = list(User.objects.values_list("id", flat=True))
+        # Fresh accounts for the registration benchmark, so no POST hits a duplicate.
+        bulk_insert(User, (User(username=f"bench-new{i}") for i in range(options["requests"])))
+        self.new_user_ids = list(User.objects.filter(username__startswith="bench-new").values_list("id", flat=True))
+
+        bulk_insert(EventCategory, (EventCategory(name=f"Category {i}") for i in range(options["categories"])))
+        category_ids = list(EventCategory.objects.values_list("id", flat=True))
+
+        now = timezone.now()
+        bulk_insert(Event, (
+            Event(
+                title=f"Event {i}",
+                description="Benchmark event",
+                date=now + timedelta(hours=self.random.randint(-24 * 30, 24 * 180)),
+                location=self.random.choice(["Lagos", "Abuja", "Accra", "Nairobi"]),
+                category_id=self.random.choice(category_ids),
+                created_by_id=self.random.choice(self.user_ids),
+            )
+            for i in range(options["events"])
+        ))
+        get_search_backend().rebuild()  # bulk_create skips the indexing signals
+        self.events = list(Event.objects.filter(date__gte=now).values_list("id", "created_by_id"))
+        bulk_insert(TicketPricing, (
+            TicketPricing(event_id=event_id, ticket_type=tier, price=price, available_quantity=100)
+            for event_id, _ in self.events
+            for tier, price in (("Regular", 10), ("VIP", 50))
+        ))
+
+        # Registrations concentrate on a hot event, like a real on-sale.
+        self.hot_event, self.hot_owner = self.events[0]
+        pairs = {(self.random.choice(self.user_ids), self.hot_event) for _ in range(options["registrations"] // 2)}
+        while len(pairs) < options["registrations"]:
+            pairs.add((self.random.choice(self.user_ids), self.random.choice(self.events)[0]))
+        bulk_insert(Registration, (Registration(user_id=u, event_id=e) for u, e in pairs))
+
+    # ------------------------
+    # Measurement
+    # ------------------------
+
+    def _run(self, requests):
+        owner_client = self._client(self.hot_owner)
+        anon = APIClient()
+        hot = self.hot_event
+
+        def event_id():
+            return self.random.choice(self.events)[0]
+
+        def uncached_upcoming():
+            cache.clear()
+            return anon.get("/api/events/upcoming/", {"page": self.random.randint(1, 5)})
+
+        unregistered = iter(self.new_user_ids)
+
+        def register():
+            client = self._client(next(unregistered))
+            return client.post(f"/api/events/{event_id()}/registrations/")
+
+        endpoints = {
+            "events.list": lambda: anon.get("/api/events/", {"page": self.random.randint(1, 50)}),
+            "events.detail": lambda: anon.get(f"/api/events/{event_id()}/"),
+            "events.search": lambda: anon.get("/api/events/", {"q": "bench"}),
+            "events.upcoming.cold": uncached_upcoming,
+            "events.upcoming.warm": lambda: anon.get("/api/events/upcoming/"),
+            "tickets.list": lambda: owner_client.get(f"/api/events/{event_id()}/tickets/"),
+            "registrations.list": lambda: owner_client.get(
+                f"/api/events/{hot}/registrations/", {"page": self.random.randint(1, 50)}
+            ),
+            "registrations.create": register,
+            "auth.login": lambda: anon.post(
+                "/api/auth/login/", {"username": "bench1", "password": PASSWORD}
+            ),
+        }
+        return {name: self._measure(name, call, requests) for name, call in endpoints.items()}
+
+    def _client(self, user_id):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(pk=user_id))
+        return client
+
+    def _measure(self, name, call, requests):
+        samples, queries = [], 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = call()
+                samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 500:
+                raise CommandError(f"{name} failed with {response.status_code}")
+            queries += len(captured)
+        elapsed = time.perf_counter() - started
+
+        result = summarize(samples)
+        result["rps"] = requests / elapsed if elapsed else 0.0
+        result["queries"] = queries / requests
+        return result
+
+    # ------------------------
+    # Reporting
+    # ------------------------
+
+    def _print(self, results):
+        self.stdout.write(f"\n{'endpoint':<24}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}")
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<24}{r['rps']:>9.1f}{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}{r['queries']:>9.1f}"
+            )
+
+    def _compare(self, results, path, threshold):
+        with open(path) as fh:
+            baseline = json.load(fh)["endpoints"]
+
+        regressions = []
+        for name, current in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            if current["p50"] > before["p50"] * (1 + threshold):
+                regressions.append(f"{name}: p50 {before['p50']:.2f} -> {current['p50']:.2f} ms")
+            if current["queries"] > before["queries"] + 0.5:
+                regressions.append(f"{name}: queries {before['queries']:.1f} -> {current['queries']:.1f}")
+
+        if regressions:
+            raise CommandError("Regressions against baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}."))
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.utils import timezone
+
+from events.benchmarks import bulk_insert, throwaway_database
+from events.models import Event, EventCategory
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent-request throughput of the sync DRF event views under WSGI "
+        "(thread pool) and ASGI with the native async views under ASGI, in process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=2_000)
+        parser.add_argument("--requests", type=int, default=500, help="Requests per scenario and concurrency level.")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self._seed(options["events"])
+            wsgi_app, asgi_app = get_wsgi_application(), get_asgi_application()
+
+            scenarios = [
+                ("WSGI  sync  /api/events/", lambda c, n: self._run_wsgi(wsgi_app, "/api/events/", c, n)),
+                ("ASGI  sync  /api/events/", lambda c, n: self._run_asgi(asgi_app, "/api/events/", c, n)),
+                ("ASGI  async /api/async/events/", lambda c, n: self._run_asgi(asgi_app, "/api/async/events/", c, n)),
+                ("WSGI  sync  /api/events/upcoming/", lambda c, n: self._run_wsgi(wsgi_app, "/api/events/upcoming/", c, n)),
+                ("ASGI  async /api/async/events/upcoming/",
+                 lambda c, n: self._run_asgi(asgi_app, "/api/async/events/upcoming/", c, n)),
+            ]
+
+            header = "".join(f"{f'c={c}':>12}" for c in options["concurrency"])
+            self.stdout.write(f"\nreq/s{'':<36}{header}")
+            for label, run in scenarios:
+                cells = "".join(f"{run(c, options['requests']):>12.1f}" for c in options["concurrency"])
+                self.stdout.write(f"{label:<41}{cells}")
+
+    def _seed(self, count):
+        owner = User.objects.create_user(username="bench-owner")
+        category = EventCategory.objects.create(name="Bench")
+        start = timezone.now() + timedelta(days=1)
+        bulk_insert(Event, (
+            Event(title=f"Event {i}", date=start + timedelta(hours=i), location="Lagos",
+                  category=category, created_by=owner)
+            for i in range(count)
+        ))
+
+    # ------------------------
+    # WSGI: a thread per connection, like gunicorn --threads
+    # ------------------------
+
+    def _run_wsgi(self, app, path, concurrency, requests):
+        def call(i):
+            cache.clear()  # measure the view, not the upcoming response cache
+            environ = {"PATH_INFO": path, "QUERY_STRING": f"page={i % 5 + 1}", "wsgi.input": BytesIO()}
+            setup_testing_defaults(environ)
+            statuses = []
+            body = app(environ, lambda status, headers, exc_info=None: statuses.append(status))
+            b"".join(body)
+            if not statuses[0].startswith("200"):
+                raise CommandError(f"{path} returned {statuses[0]}")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(call, range(requests)))
+        return requests / (time.perf_counter() - start)
+
+    # ------------------------
+    # ASGI: concurrent tasks on one event loop, like uvicorn
+    # ------------------------
+
+    def _run_asgi(self, app, path, concurrency, requests):
+        async def call(i):
+            cache.clear()
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+                "query_string": f"page={i % 5 + 1}".encode(), "root_path": "",
+                "headers": [(b"host", b"testserver")],
+                "server": ("testserver", 80), "client": ("127.0.0.1", 50000),
+            }
+            request_sent = False
+            status = []
+
+            async def receive():
+                nonlocal request_sent
+                if not request_sent:
+                    request_sent = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.Event().wait()  # client never disconnects
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            await app(scope, receive, send)
+            if status[0] != 200:
+                raise CommandError(f"{path} returned {status[0]}")
+
+        async def main():
+            queue = iter(range(requests))
+
+            async def worker():
+                for i in queue:
+                    await call(i)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return requests / (time.perf_counter() - start)
+
+        return asyncio.run(main())
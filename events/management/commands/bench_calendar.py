@@ -0,0 +1,72 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events.benchmarks import bulk_insert, summarize, throwaway_database, time_call
+from events.models import Event, EventCategory
+from events.occurrences import events_between
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a one-week calendar window as the event table grows: candidate lookup through the "
+        "interval index vs a plain date-overlap filter, and the full /api/events/calendar/ request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+        parser.add_argument("--years", type=int, default=5, help="Events are spread over this many years.")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"median ms per one-week window, events spread over {options['years']} years")
+        self.stdout.write(f"{'events':>8} {'candidates':>11} {'overlap scan':>13} {'interval index':>15} {'endpoint':>9}")
+        with throwaway_database():
+            owner = User.objects.create_user(username="bench-owner")
+            category = EventCategory.objects.create(name="Bench")
+            client = APIClient()
+            seeded, rng = 0, random.Random(0)
+            origin = timezone.now().replace(microsecond=0)
+            span = timedelta(days=365 * options["years"])
+            for size in sorted(options["sizes"]):
+                bulk_insert(Event, (
+                    self._event(rng, origin, span, category, owner, i) for i in range(seeded, size)
+                ))
+                seeded = size
+                self._bench(client, origin + span / 2, options["repeat"], size)
+
+    def _event(self, rng, origin, span, category, owner, i):
+        date = origin + timedelta(seconds=rng.randrange(int(span.total_seconds())))
+        event = Event(
+            title=f"Event {i}", date=date, ends_at=date + timedelta(hours=rng.randint(1, 4)),
+            location="Lagos", category=category, created_by=owner,
+        )
+        if i % 100 == 0:  # one series in a hundred, ending within a few months
+            event.recurrence = "weekly"
+            event.recurrence_until = date + timedelta(weeks=rng.randint(2, 26))
+        event.index_span()  # bulk_create skips save()
+        return event
+
+    def _bench(self, client, start, repeat, size):
+        end = start + timedelta(weeks=1)
+        # What a calendar without the index has to do: every event starting before the window end.
+        scan = Event.objects.filter(
+            Q(series_end__isnull=True) | Q(series_end__gt=start), date__lt=end
+        ).values_list("id", flat=True)
+        indexed = events_between(Event.objects.all(), start, end).values_list("id", flat=True)
+        url = f"/api/events/calendar/?start={start.date()}&end={end.date()}"
+
+        scan_ms = summarize(time_call(lambda: list(scan.all()), repeat))
+        indexed_ms = summarize(time_call(lambda: list(indexed.all()), repeat))
+        endpoint_ms = summarize(time_call(lambda: client.get(url), repeat))
+        self.stdout.write(
+            f"{size:>8} {len(indexed):>11} {scan_ms['p50']:>13.2f} {indexed_ms['p50']:>15.2f}"
+            f" {endpoint_ms['p50']:>9.2f}"
+        )
@@ -0,0 +1,86 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events import geo
+from events.benchmarks import bulk_insert, summarize, throwaway_database, time_call
+from events.models import Event, EventCategory
+
+User = get_user_model()
+
+# Events cluster around cities, over a thin worldwide background.
+CITIES = [
+    (6.5244, 3.3792), (9.0765, 7.3986), (-1.2921, 36.8219), (30.0444, 31.2357), (51.5072, -0.1276),
+    (40.7128, -74.0060), (-23.5505, -46.6333), (35.6762, 139.6503), (19.0760, 72.8777), (-33.8688, 151.2093),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ?near= searches through the geohash index against a haversine full scan "
+        "over every event with coordinates, on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Events to seed.")
+        parser.add_argument("--radii", type=float, nargs="+", default=[1, 10, 50])
+        parser.add_argument("--repeat", type=int, default=3, help="Searches timed per radius.")
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self._seed(options["rows"])
+            rng = random.Random(1)
+            self.stdout.write(f"\nmedian ms per search around a random city ({options['rows']} events)")
+            self.stdout.write(f"{'radius km':>9} {'matches':>8} {'scanned':>8} {'full scan':>10} {'geohash':>9}")
+            for radius in options["radii"]:
+                self._bench(rng, radius, options["repeat"])
+
+    def _seed(self, rows):
+        self.stdout.write(f"Seeding {rows} events...")
+        owner = User.objects.create_user(username="bench-owner")
+        category = EventCategory.objects.create(name="Bench")
+        date = timezone.now() + timedelta(days=1)
+        rng = random.Random(0)
+
+        def events():
+            for i in range(rows):
+                if i % 10 == 0:
+                    latitude, longitude = rng.uniform(-60, 70), rng.uniform(-180, 180)
+                else:
+                    city_lat, city_lng = rng.choice(CITIES)
+                    latitude, longitude = rng.gauss(city_lat, 0.3), rng.gauss(city_lng, 0.3)
+                event = Event(
+                    title=f"Event {i}", date=date, location="Somewhere", category=category, created_by=owner,
+                    latitude=latitude, longitude=longitude,
+                )
+                event.index_span()  # bulk_create skips save()
+                event.index_location()
+                yield event
+
+        bulk_insert(Event, events())
+
+    def _bench(self, rng, radius, repeat):
+        full, indexed, matches, scanned = [], [], 0, 0
+        for _ in range(repeat):
+            latitude, longitude = rng.choice(CITIES)
+            nearby = geo.filter_near(Event.objects.all(), latitude, longitude, radius).values_list("id", flat=True)
+            everything = (
+                Event.objects.filter(latitude__isnull=False)
+                .annotate(distance_km=geo.distance_expression(latitude, longitude))
+                .filter(distance_km__lte=radius).order_by("distance_km", "id").values_list("id", flat=True)
+            )
+            full += time_call(lambda: list(everything.all()), 1)
+            indexed += time_call(lambda: list(nearby.all()), 1)
+            found = list(nearby.all())
+            if found != list(everything.all()):
+                self.stderr.write(f"Mismatch at {latitude},{longitude} r={radius}")
+            matches += len(found)
+            # Rows the haversine step had to look at: the covering cells within the latitude band.
+            scanned += geo.near_candidates(Event.objects.all(), latitude, longitude, radius).count()
+        self.stdout.write(
+            f"{radius:>9g} {matches // repeat:>8} {scanned // repeat:>8}"
+            f" {summarize(full)['p50']:>10.1f} {summarize(indexed)['p50']:>9.1f}"
+        )
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events.benchmarks import bulk_insert, summarize, throwaway_database, time_call
+from events.models import Event, EventCategory, Registration
+from events.pagination import encode_cursor
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare page-number and keyset (?cursor=) pagination latency from the first "
+        "to the deepest page of the event and registration lists, on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="Events and registrations to seed.")
+        parser.add_argument("--repeat", type=int, default=5, help="Requests timed per page.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        with throwaway_database():
+            event, owner = self._seed(rows)
+            client = APIClient()
+            client.force_authenticate(user=owner)
+
+            targets = [
+                ("events", "/api/events/", Event.objects.order_by("date", "id"), ("date", "id")),
+                (
+                    "registrations",
+                    f"/api/events/{event.id}/registrations/",
+                    Registration.objects.filter(event=event).order_by("registration_date", "id"),
+                    ("registration_date", "id"),
+                ),
+            ]
+            for label, url, queryset, ordering in targets:
+                self._bench(client, label, url, queryset, ordering, rows, repeat)
+
+    def _seed(self, rows):
+        self.stdout.write(f"Seeding {rows} events and {rows} registrations...")
+        owner = User.objects.create_user(username="bench-owner")
+        category = EventCategory.objects.create(name="Bench")
+        start = timezone.now() + timedelta(days=1)
+        bulk_insert(Event, (
+            Event(title=f"Event {i}", date=start + timedelta(minutes=i), location="Lagos",
+                  category=category, created_by=owner)
+            for i in range(rows)
+        ))
+        event = Event.objects.order_by("id").first()
+
+        bulk_insert(User, (User(username=f"bench-user-{i}") for i in range(rows)))
+        user_ids = User.objects.exclude(pk=owner.pk).values_list("id", flat=True).iterator()
+        bulk_insert(Registration, (Registration(user_id=uid, event=event) for uid in user_ids))
+        return event, owner
+
+    def _bench(self, client, label, url, queryset, ordering, rows, repeat):
+        page_size = 10
+        pages = [p for p in (1, 10, 100, 1_000, 10_000) if (p - 1) * page_size < rows]
+
+        self.stdout.write(f"\n{label}: median ms per request (p99)")
+        self.stdout.write(f"{'page':>8} {'page-number':>16} {'keyset':>16}")
+        for page in pages:
+            offset = self._time(client, f"{url}?page={page}", repeat)
+
+            # The cursor for page N is the key of the last row on page N - 1.
+            cursor = ""
+            if page > 1:
+                boundary = queryset.values_list(*ordering)[(page - 1) * page_size - 1]
+                cursor = encode_cursor(boundary)
+            keyset = self._time(client, f"{url}?cursor={cursor}", repeat)
+
+            self.stdout.write(
+                f"{page:>8} {offset['p50']:>8.2f} ({offset['p99']:>5.2f})"
+                f" {keyset['p50']:>8.2f} ({keyset['p99']:>5.2f})"
+            )
+
+    def _time(self, client, path, repeat):
+        def request():
+            response = client.get(path)
+            assert response.status_code == 200, response.content
+        return summarize(time_call(request, repeat))
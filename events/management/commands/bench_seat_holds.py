@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.utils import timezone
+
+from events.benchmarks import bulk_insert, summarize, throwaway_database
+from events.models import Event, EventCategory, SeatHold
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Place a burst of seat holds, expire them and time the sweeper, "
+        "on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--holds", type=int, default=10_000, help="Holds placed in the burst.")
+        parser.add_argument("--events", type=int, default=20, help="Events the holds are spread over.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Holds released per sweep.")
+
+    def handle(self, *args, **options):
+        holds, events, batch_size = options["holds"], options["events"], options["batch_size"]
+        with throwaway_database():
+            owner = User.objects.create_user(username="bench-owner")
+            category = EventCategory.objects.create(name="Bench")
+            bulk_insert(Event, (
+                Event(title=f"Sale {i}", date=timezone.now() + timedelta(days=1), location="Lagos",
+                      category=category, created_by=owner, capacity=holds)
+                for i in range(events)
+            ))
+            event_ids = list(Event.objects.values_list("id", flat=True))
+            bulk_insert(User, (User(username=f"bench-user-{i}") for i in range(holds)))
+            user_ids = list(User.objects.exclude(pk=owner.pk).values_list("id", flat=True))
+
+            samples = []
+            start = time.perf_counter()
+            for n, user_id in enumerate(user_ids):
+                began = time.perf_counter()
+                SeatHold.objects.place(event_ids[n % events], user_id)
+                samples.append((time.perf_counter() - began) * 1000)
+            elapsed = time.perf_counter() - start
+            stats = summarize(samples)
+            self.stdout.write(
+                f"place: {holds} holds in {elapsed:.2f}s ({holds / elapsed * 60:,.0f}/min)  "
+                f"p50 {stats['p50']:.2f}ms  p99 {stats['p99']:.2f}ms"
+            )
+
+            SeatHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+            sweeps = []
+            while True:
+                began = time.perf_counter()
+                released = SeatHold.objects.sweep(batch_size=batch_size)
+                if not released:
+                    break
+                sweeps.append((released, (time.perf_counter() - began) * 1000))
+            total_ms = sum(ms for _, ms in sweeps)
+            self.stdout.write(
+                f"sweep: {sum(n for n, _ in sweeps)} holds in {len(sweeps)} sweep(s), "
+                f"{total_ms:.1f}ms total, {max((ms for _, ms in sweeps), default=0):.1f}ms worst"
+            )
+
+            leftover = Event.objects.aggregate(held=Sum("seats_held"))["held"]
+            self.stdout.write(f"seats_held after sweep: {leftover}")
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from event_manager import renderers
+from event_manager.renderers import FastJSONRenderer
+from events.benchmarks import bulk_insert, summarize, throwaway_database, time_call
+from events.models import Event, EventCategory, Registration
+from events.serializers import EventSerializer, RegistrationSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time list serialization and JSON rendering per 1000 rows: ModelSerializer + DRF's "
+        "JSONRenderer vs the lean values_list() path + FastJSONRenderer, on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Events and registrations to seed.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per step.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        with throwaway_database():
+            event = self._seed(rows)
+            self.stdout.write(f"JSON backend: {'orjson' if renderers.orjson else 'stdlib json (orjson not installed)'}")
+            self.stdout.write(f"median ms per 1000 rows over {repeat} runs (serializer and lean include the query)\n")
+            self.stdout.write(
+                f"{'list':<14} {'serializer':>10} {'lean':>8} {'render':>8} {'fast':>8} {'before':>8} {'after':>8}"
+            )
+            targets = [
+                ("events", EventSerializer, Event.objects.order_by("date", "id")),
+                ("registrations", RegistrationSerializer,
+                 Registration.objects.filter(event=event).order_by("registration_date", "id")),
+            ]
+            for label, serializer_class, queryset in targets:
+                self._bench(label, serializer_class, queryset, rows, repeat)
+
+    def _seed(self, rows):
+        owner = User.objects.create_user(username="bench-owner")
+        category = EventCategory.objects.create(name="Bench")
+        start = timezone.now() + timedelta(days=1)
+        bulk_insert(Event, (
+            Event(title=f"Event {i}", description="A fairly ordinary event description " * 3,
+                  date=start + timedelta(minutes=i), location="Lagos", category=category,
+                  created_by=owner, capacity=500, seats_booked=i % 500)
+            for i in range(rows)
+        ))
+        event = Event.objects.order_by("id").first()
+        bulk_insert(User, (User(username=f"bench-user-{i}") for i in range(rows)))
+        user_ids = User.objects.exclude(pk=owner.pk).values_list("id", flat=True).iterator()
+        bulk_insert(Registration, (Registration(user_id=uid, event=event) for uid in user_ids))
+        return event
+
+    def _bench(self, label, serializer_class, queryset, rows, repeat):
+        meta = serializer_class.Meta
+        full_queryset = queryset.select_related(*meta.select_related).only(*meta.only)
+        serializer = serializer_class()
+
+        def serialize():
+            return serializer_class(list(full_queryset), many=True).data
+
+        def lean():
+            return serializer.lean_data(list(serializer.lean_rows(queryset)))
+
+        data = serialize()
+        assert lean() == data, "lean rows differ from the serializer's output"
+        renderer, fast = JSONRenderer(), FastJSONRenderer()
+
+        per_1000 = 1000 / max(rows, 1)
+        timings = [
+            summarize(time_call(func, repeat))["p50"] * per_1000
+            for func in (serialize, lean, lambda: renderer.render(data), lambda: fast.render(data))
+        ]
+        before, after = timings[0] + timings[2], timings[1] + timings[3]
+        self.stdout.write(
+            f"{label:<14} {timings[0]:>10.2f} {timings[1]:>8.2f} {timings[2]:>8.2f} {timings[3]:>8.2f}"
+            f" {before:>8.2f} {after:>8.2f}  ({before / after:.1f}x)"
+        )
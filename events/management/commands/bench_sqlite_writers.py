@@ -0,0 +1,138 @@
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, close_old_connections, connection, connections
+from django.utils import timezone
+
+from event_manager.sqlite import PROFILES, apply_sqlite_profile, is_lock_error, retry_on_lock
+from events.benchmarks import bulk_insert, summarize
+from events.models import Event, EventCategory, Registration
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent registration writers against a fresh SQLite file with each "
+        "connection profile (plain Django defaults vs tuned) and report throughput and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads.")
+        parser.add_argument("--writes", type=int, default=200, help="Registrations per writer.")
+        parser.add_argument("--readers", type=int, default=2, help="Threads listing registrations meanwhile.")
+        parser.add_argument(
+            "--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES),
+            help="Profiles to compare (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['writers']} writers x {options['writes']} registrations, {options['readers']} readers\n"
+        )
+        self.stdout.write(f"{'profile':<8} {'writes/s':>9} {'ok':>6} {'locked':>7} {'p50 ms':>8} {'p99 ms':>8}")
+        for profile in options["profiles"]:
+            with sqlite_file_database(profile):
+                event, user_ids = self._seed(options["writers"] * options["writes"])
+                result = self._run(profile, event, user_ids, options)
+            self.stdout.write(
+                f"{profile:<8} {result['rate']:>9.0f} {result['ok']:>6} {result['locked']:>7}"
+                f" {result['p50']:>8.2f} {result['p99']:>8.2f}"
+            )
+
+    def _seed(self, count):
+        owner = User.objects.create_user(username="bench-owner")
+        event = Event.objects.create(
+            title="On sale", date=timezone.now() + timedelta(days=1), location="Lagos",
+            category=EventCategory.objects.create(name="Bench"), created_by=owner, capacity=0,
+        )
+        bulk_insert(User, (User(username=f"bench-user-{i}") for i in range(count)))
+        return event, list(User.objects.exclude(pk=owner.pk).values_list("id", flat=True))
+
+    def _run(self, profile, event, user_ids, options):
+        writers, writes = options["writers"], options["writes"]
+        # The tuned profile retries lock errors; the plain one shows what callers see without it.
+        register = Registration.objects.create
+        if profile != "plain":
+            register = retry_on_lock(register)
+
+        samples, counts, lock = [], {"ok": 0, "locked": 0}, threading.Lock()
+        done = threading.Event()
+
+        def write(chunk):
+            try:
+                for user_id in chunk:
+                    began = time.perf_counter()
+                    try:
+                        register(user_id=user_id, event=event)
+                        outcome = "ok"
+                    except OperationalError as exc:
+                        if not is_lock_error(exc):
+                            raise
+                        outcome = "locked"
+                    close_old_connections()  # a request boundary: reconnects unless CONN_MAX_AGE keeps it
+                    with lock:
+                        counts[outcome] += 1
+                        samples.append((time.perf_counter() - began) * 1000)
+            finally:
+                connection.close()
+
+        def read():
+            try:
+                while not done.is_set():
+                    try:
+                        list(Registration.objects.filter(event=event).order_by("-id")[:20])
+                        close_old_connections()
+                    except OperationalError as exc:
+                        if not is_lock_error(exc):
+                            raise
+            finally:
+                connection.close()
+
+        readers = [threading.Thread(target=read) for _ in range(options["readers"])]
+        threads = [
+            threading.Thread(target=write, args=(user_ids[n * writes:(n + 1) * writes],))
+            for n in range(writers)
+        ]
+        for thread in readers:
+            thread.start()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        return {**counts, **summarize(samples), "rate": counts["ok"] / elapsed}
+
+
+@contextmanager
+def sqlite_file_database(profile):
+    """Point the default alias at a migrated SQLite file configured with ``profile``, then restore it."""
+    settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+    saved = {key: settings_dict.get(key) for key in ("NAME", "OPTIONS", "CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+    connection.close()
+    with tempfile.TemporaryDirectory() as directory:
+        for key in saved:
+            settings_dict.pop(key, None)
+        settings_dict["NAME"] = str(Path(directory, "bench.sqlite3"))
+        apply_sqlite_profile({DEFAULT_DB_ALIAS: settings_dict}, profile)
+        settings_dict.setdefault("OPTIONS", {})
+        settings_dict.setdefault("CONN_MAX_AGE", 0)
+        settings_dict.setdefault("CONN_HEALTH_CHECKS", False)
+        try:
+            call_command("migrate", verbosity=0, interactive=False)
+            yield
+        finally:
+            connection.close()
+            settings_dict.update(saved)
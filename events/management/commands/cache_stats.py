@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from events.cache import events_generation, upcoming_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Show hit/miss counters for the cached /api/events/upcoming/ listing "
+        "(needs a shared cache backend to see the web workers' numbers)."
+    )
+
+    def handle(self, *args, **options):
+        stats = upcoming_cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / lookups if lookups else 0
+        self.stdout.write(f"generation: {events_generation()}")
+        self.stdout.write(f"hits: {stats['hits']}  misses: {stats['misses']}  hit ratio: {ratio:.1%}")
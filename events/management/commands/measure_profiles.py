@@ -0,0 +1,97 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter per sample, so imports and app loading are cold.
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import django
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+boot = time.perf_counter() - start
+
+from django.conf import settings
+sample = {"boot": boot, "apps": len(settings.INSTALLED_APPS), "middleware_count": len(settings.MIDDLEWARE),
+          "modules": len(sys.modules)}
+requests = int(sys.argv[1])
+if not requests:
+    print(json.dumps(sample))
+    sys.exit()
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory, override_settings
+
+request = RequestFactory().get("/__measure_profiles__/", HTTP_ACCEPT="application/json")
+
+def per_request(handler):
+    handler.get_response(request)  # warm the URL resolver
+    began = time.perf_counter()
+    for _ in range(requests):
+        handler.get_response(request)
+    return (time.perf_counter() - began) / requests
+
+with_middleware = per_request(WSGIHandler())
+with override_settings(MIDDLEWARE=[]):
+    bare = per_request(WSGIHandler())
+print(json.dumps({**sample, "request": with_middleware, "middleware": with_middleware - bare}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare deployment profiles (DJANGO_PROFILE=full vs api): cold-start time of a fresh "
+        "worker process and the per-request cost of the middleware stack."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", default=["full", "api"])
+        parser.add_argument("--runs", type=int, default=5, help="Fresh processes started per profile.")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests timed per process.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"cold start: median of {options['runs']} fresh processes; "
+            f"per request: {options['requests']} requests for an unrouted URL\n"
+        )
+        self.stdout.write(
+            f"{'profile':<8} {'apps':>5} {'mw':>4} {'modules':>8} {'process ms':>11} {'boot ms':>8}"
+            f" {'request us':>11} {'middleware us':>14}"
+        )
+        for profile in options["profiles"]:
+            # Cold starts exit right after booting; one more process times the request loop.
+            cold = [self._sample(profile, 0) for _ in range(options["runs"])]
+            warm = self._sample(profile, options["requests"])
+
+            def median(key):
+                return statistics.median(sample[key] for sample in cold)
+
+            self.stdout.write(
+                f"{profile:<8} {warm['apps']:>5} {warm['middleware_count']:>4} {median('modules'):>8.0f}"
+                f" {median('process') * 1000:>11.1f} {median('boot') * 1000:>8.1f}"
+                f" {warm['request'] * 1e6:>11.1f} {warm['middleware'] * 1e6:>14.1f}"
+            )
+
+    def _sample(self, profile, requests):
+        env = {
+            **os.environ,
+            "DJANGO_PROFILE": profile,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "event_manager.settings"),
+        }
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD, str(requests)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        process = time.perf_counter() - start
+        if result.returncode != 0:
+            raise CommandError(f"{profile} profile failed to start:\n{result.stderr}")
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        sample["process"] = process  # interpreter start-up, boot and exit
+        return sample
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from events.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Re-index every event in the full-text search backend (e.g. after bulk loads that skip signals)."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"{type(backend).__name__}: indexed {indexed} event(s)."
+        ))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
+
+from events.models import Event, Registration, SeatHold
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Event.seats_booked and Event.seats_held for events whose counters "
+        "drifted from their registrations and seat holds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report drifted events without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Event.objects
+            .annotate(
+                actual=self._count(Registration.objects.filter(status__in=Registration.SEATED)),
+                actual_held=self._count(SeatHold.objects.all()),
+            )
+            .exclude(seats_booked=F("actual"), seats_held=F("actual_held"))
+            .values_list("id", "seats_booked", "actual", "seats_held", "actual_held")
+        )
+
+        # Recount inside the UPDATE itself so registrations landing mid-run aren't lost.
+        recount = self._count(Registration.objects.filter(status__in=Registration.SEATED))
+        recount_held = self._count(SeatHold.objects.all())
+
+        fixed = 0
+        for event_id, stored, actual, stored_held, actual_held in drifted.iterator():
+            self.stdout.write(
+                f"Event {event_id}: counter={stored} actual={actual} held={stored_held} actual_held={actual_held}"
+            )
+            if not options["dry_run"]:
+                Event.objects.filter(pk=event_id).update(
+                    seats_booked=recount, seats_held=recount_held, updated_at=Now()
+                )
+            fixed += 1
+
+        verb = "Found" if options["dry_run"] else "Reconciled"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {fixed} drifted event(s)."))
+
+    @staticmethod
+    def _count(queryset):
+        """Per-event row count of ``queryset`` as a correlated subquery (0 when none)."""
+        return Coalesce(Subquery(
+            queryset.filter(event_id=OuterRef("pk"))
+            .values("event_id").annotate(total=Count("id")).values("total")
+        ), 0)
@@ -0,0 +1,60 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from events.outbox import drain, drain_all, purge_delivered
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox messages (registration emails, analytics) in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Drain everything that is due, then exit.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE,
+            help="Messages claimed per batch (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=settings.OUTBOX_WORKERS,
+            help="Threads delivering a batch in parallel (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=1.0,
+            help="Seconds to sleep when nothing is due (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--keep-days", type=int, default=7,
+            help="Delete delivered messages older than this many days (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size, workers = options["batch_size"], options["workers"]
+        purge_delivered(timezone.now() - timedelta(days=options["keep_days"]))
+
+        if options["once"]:
+            self._report(drain_all(batch_size, workers))
+            return
+
+        self.stdout.write(f"Outbox worker started (batch={batch_size}, workers={workers}).")
+        try:
+            while True:
+                close_old_connections()
+                outcome = drain(batch_size, workers)
+                if any(outcome.values()):
+                    self._report(outcome)
+                else:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Outbox worker stopped.")
+
+    def _report(self, outcome):
+        self.stdout.write(
+            f"delivered: {outcome['delivered']}  retried: {outcome['retried']}  failed: {outcome['failed']}"
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from events.models import SeatHold
+
+
+class Command(BaseCommand):
+    help = "Release expired seat holds back to their events, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Holds released per sweep (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=None,
+            help="Keep running, sweeping every this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if options["interval"] is None:
+            self.stdout.write(f"Released {self._sweep_all(options['batch_size'])} expired hold(s).")
+            return
+
+        try:
+            while True:
+                close_old_connections()
+                released = self._sweep_all(options["batch_size"])
+                if released:
+                    self.stdout.write(f"Released {released} expired hold(s).")
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+    def _sweep_all(self, batch_size):
+        total = 0
+        while released := SeatHold.objects.sweep(batch_size=batch_size):
+            total += released
+        return total
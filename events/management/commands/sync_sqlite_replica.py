@@ -0,0 +1,50 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary database into a replica file (e.g. DATABASES['replica']), "
+        "to try read-replica routing locally. With --interval it keeps copying, which "
+        "behaves like replication with up to that much lag."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="replica", help="Replica alias to overwrite (default: %(default)s).")
+        parser.add_argument(
+            "--interval", type=float, default=None,
+            help="Copy again every this many seconds until interrupted.",
+        )
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        if alias == DEFAULT_DB_ALIAS or alias not in settings.DATABASES:
+            raise CommandError(f"{alias!r} is not a replica alias in DATABASES.")
+        for name in (DEFAULT_DB_ALIAS, alias):
+            if connections[name].vendor != "sqlite":
+                raise CommandError(f"{name!r} is not a SQLite database; use your database's own replication.")
+
+        source = settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"]
+        target = settings.DATABASES[alias]["NAME"]
+        try:
+            while True:
+                self._copy(source, target)
+                self.stdout.write(f"Copied {source} -> {target}")
+                if options["interval"] is None:
+                    return
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Replica sync stopped.")
+
+    def _copy(self, source, target):
+        # The online backup API takes a consistent snapshot while the primary keeps serving writes.
+        primary, replica = sqlite3.connect(source), sqlite3.connect(target)
+        try:
+            primary.backup(replica)
+        finally:
+            primary.close()
+            replica.close()
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_seats_booked(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    events = Event.objects.annotate(
+        booked=Count("registrations", filter=Q(registrations__status="registered"))
+    )
+    for event in events.iterator():
+        Event.objects.filter(pk=event.pk).update(seats_booked=event.booked)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_ticketpricing_available_quantity_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_booked',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_seats_booked, migrations.RunPython.noop),
+    ]
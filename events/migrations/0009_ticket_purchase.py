@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 02:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_registration_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketPurchase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('currency', models.CharField(max_length=10)),
+                ('status', models.CharField(choices=[('purchased', 'Purchased'), ('cancelled', 'Cancelled')], default='purchased', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchases', to='events.registration')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.RESTRICT, related_name='purchases', to='events.ticketpricing')),
+            ],
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:20
+
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_spans(apps, schema_editor):
+    # Every existing event is a one-off point in time, so it sits in the
+    # level-0 (one day) bin holding its date; see events.occurrences.span_key.
+    Event = apps.get_model("events", "Event")
+    for event in Event.objects.only("id", "date").iterator():
+        span_bin = math.floor(event.date.timestamp()) // 86400
+        Event.objects.filter(pk=event.pk).update(series_end=event.date, span_level=0, span_bin=span_bin)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_event_updated_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'Does not repeat'), ('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], default='', max_length=8),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_exceptions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_interval',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series_end',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='span_bin',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='span_level',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['span_level', 'span_bin'], name='event_span_bin_idx'),
+        ),
+        migrations.RunPython(backfill_spans, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_event_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='registration',
+            name='registration_active_idx',
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(condition=models.Q(('status__in', ['registered', 'attended'])), fields=['event'], name='registration_active_idx'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+import hashlib
+from functools import partial
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import permissions
+from rest_framework.response import Response
+
+
+class SerializerQuerySetMixin:
+    """
+    Shape querysets from the serializer's Meta so list/detail reads don't
+    fan out into one query per row.
+
+    Serializers declare ``select_related`` for the relations their fields
+    traverse and ``only`` for the columns they read. ``only`` is applied to
+    safe requests alone so writes never save a partially loaded instance.
+    """
+
+    def optimize_queryset(self, queryset):
+        meta = getattr(self.get_serializer_class(), "Meta", None)
+        select_related = getattr(meta, "select_related", None)
+        only = getattr(meta, "only", None)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if only and self.request.method in permissions.SAFE_METHODS:
+            queryset = queryset.only(*only)
+        return queryset
+
+    def filter_queryset(self, queryset):
+        return self.optimize_queryset(super().filter_queryset(queryset))
+
+
+class LeanListMixin:
+    """
+    Build ``list`` responses with the serializer's lean path (see
+    ``LeanListSerializerMixin``): rows come from ``values_list()`` and are
+    paginated as tuples, so no model instances are created for a page.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.lean_list_response(self.filter_queryset(self.get_queryset()))
+
+    def lean_list_response(self, queryset):
+        serializer = self.get_serializer()
+        rows = serializer.lean_rows(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.lean_data(page))
+        return Response(serializer.lean_data(rows))
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for ``list`` and ``retrieve`` so polling
+    clients get a 304 without the view serializing anything.
+
+    Validators come from one aggregate over the rows the response would show:
+    ``MAX(updated_at)`` catches edits and inserts, ``COUNT`` and ``SUM(id)``
+    catch rows leaving (or sliding into) a keyset page window.
+    ETags are weak (the JSON also embeds related rows like the creator's
+    username) and folded with the full path so every page and filter gets its
+    own. Lists send no Last-Modified: a delete doesn't move MAX(updated_at).
+    """
+
+    def get_validators(self, queryset):
+        """Return ``(etag, last_modified)`` for the rows in ``queryset``."""
+        sliced = queryset.query.is_sliced
+        if not sliced:
+            queryset = queryset.order_by()
+        stats = queryset.aggregate(last_modified=Max("updated_at"), count=Count("pk"), ids=Sum("pk"))
+        if not sliced:
+            self.validated_count = stats["count"]  # saves the paginator its own COUNT(*)
+        last_modified = stats["last_modified"]
+        stamp = last_modified.isoformat() if last_modified else "-"
+        raw = f"{self.request.get_full_path()}|{stamp}|{stats['count']}|{stats['ids']}"
+        return f'W/"{hashlib.md5(raw.encode()).hexdigest()}"', last_modified
+
+    def conditional_response(self, handler, etag, last_modified=None):
+        """Answer 304 if the client's copy matches, else run ``handler``; both get the validators."""
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler()
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if hasattr(self.paginator, "validator_queryset"):
+            queryset = self.paginator.validator_queryset(queryset, request, self)
+        etag, _ = self.get_validators(queryset)
+        return self.conditional_response(partial(super().list, request, *args, **kwargs), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(**{self.lookup_field: kwargs[lookup]})
+        etag, last_modified = self.get_validators(queryset)
+        handler = partial(super().retrieve, request, *args, **kwargs)
+        if last_modified is None:
+            return handler()  # no such row (or not visible to this user): let it 404
+        return self.conditional_response(handler, etag, last_modified)
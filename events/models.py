@@ -1,32 +1,169 @@
 # events/models.py
+from collections import Counter
+from datetime import timedelta
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Max, Min, Q, Value, When
+from django.db.models.functions import Greatest, Now
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils import timezone
 
+from . import geo
+from .cache import bump_events_generation
+from .occurrences import DAILY, MONTHLY, WEEKLY, series_end, span_key
+from .search import FTS_TABLE
+
 User = settings.AUTH_USER_MODEL
 
 
+class EventCategoryQuerySet(models.QuerySet):
+    def with_event_counts(self, now=None):
+        """
+        Annotate ``event_count``, ``upcoming_count`` and ``next_start`` (the
+        soonest upcoming event) with a single GROUP BY over the events join.
+        """
+        upcoming = Q(events__date__gte=now or timezone.now())
+        return self.annotate(
+            event_count=Count("events"),
+            upcoming_count=Count("events", filter=upcoming),
+            next_start=Min("events__date", filter=upcoming),
+        )
+
+
 class EventCategory(models.Model):
     name = models.CharField(max_length=120, unique=True)
     description = models.TextField(blank=True)
 
+    objects = EventCategoryQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
 
+class EventQuerySet(models.QuerySet):
+    def reserve_seats(self, event_id, seats=1):
+        """
+        Claim seats with a single conditional UPDATE so concurrent
+        registrants can never push the counter past capacity.
+        Returns False when the event has no room left.
+        """
+        return bool(
+            self.filter(pk=event_id).has_room(seats)
+            .update(seats_booked=F("seats_booked") + seats, updated_at=Now())
+        )
+
+    def release_seats(self, event_id, seats=1):
+        """Give seats back, never letting the counter drop below zero."""
+        return bool(
+            self.filter(pk=event_id, seats_booked__gte=seats)
+            .update(seats_booked=F("seats_booked") - seats, updated_at=Now())
+        )
+
+    def has_room(self, seats=1):
+        # Held seats count against capacity just like booked ones.
+        return self.filter(Q(capacity=0) | Q(capacity__gte=F("seats_booked") + F("seats_held") + seats))
+
+    def hold_seats(self, event_id, seats=1):
+        """Set seats aside for a SeatHold; same capacity guard as reserve_seats()."""
+        return bool(
+            self.filter(pk=event_id).has_room(seats)
+            .update(seats_held=F("seats_held") + seats, updated_at=Now())
+        )
+
+    def release_held_seats(self, event_id, seats=1):
+        return bool(
+            self.filter(pk=event_id, seats_held__gte=seats)
+            .update(seats_held=F("seats_held") - seats, updated_at=Now())
+        )
+
+    def book_held_seats(self, event_id, seats=1):
+        """Turn held seats into booked ones; capacity was already checked when holding."""
+        return bool(
+            self.filter(pk=event_id, seats_held__gte=seats)
+            .update(
+                seats_held=F("seats_held") - seats, seats_booked=F("seats_booked") + seats, updated_at=Now()
+            )
+        )
+
+
 class Event(models.Model):
+    RECURRENCE_CHOICES = [("", "Does not repeat"), (DAILY, "Daily"), (WEEKLY, "Weekly"), (MONTHLY, "Monthly")]
+    # Derived by save() from the schedule (events.occurrences) and coordinates (events.geo).
+    DERIVED_FIELDS = ("series_end", "span_level", "span_bin", "geohash")
+    # Only ever written by the conditional F() UPDATEs on EventQuerySet.
+    COUNTER_FIELDS = ("seats_booked", "seats_held")
+
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     date = models.DateTimeField()
+    ends_at = models.DateTimeField(null=True, blank=True)  # None = a point in time
+    # Repeats every `recurrence_interval` days/weeks/months until `recurrence_until`
+    # (forever when None), skipping the local dates (YYYY-MM-DD) in `recurrence_exceptions`.
+    recurrence = models.CharField(max_length=8, choices=RECURRENCE_CHOICES, blank=True, default="")
+    recurrence_interval = models.PositiveSmallIntegerField(default=1)
+    recurrence_until = models.DateTimeField(null=True, blank=True)
+    recurrence_exceptions = models.JSONField(default=list, blank=True)
+    series_end = models.DateTimeField(null=True, editable=False)  # None = repeats forever
+    span_level = models.PositiveSmallIntegerField(default=0, editable=False)
+    span_bin = models.BigIntegerField(default=0, editable=False)
     location = models.CharField(max_length=255)
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    geohash = models.CharField(max_length=geo.PRECISION, blank=True, default="", editable=False)  # "" = no coordinates
     category = models.ForeignKey(EventCategory, on_delete=models.PROTECT, related_name="events")
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="created_events")
     capacity = models.PositiveIntegerField(default=0)  # 0 = unlimited
+    seats_booked = models.PositiveIntegerField(default=0, editable=False)
+    seats_held = models.PositiveIntegerField(default=0, editable=False)  # unexpired SeatHolds
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also bumped by the counter UPDATEs above, which bypass auto_now.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         ordering = ["date"]
+        indexes = [
+            # list/upcoming ordering and the date__gte filter
+            models.Index(fields=["date", "id"], name="event_date_id_idx"),
+            # ?category= filtered lists in date order
+            models.Index(fields=["category", "date", "id"], name="event_category_date_idx"),
+            # lets the unfiltered list's ETag aggregate (MAX(updated_at), COUNT) read the index alone
+            models.Index(fields=["updated_at"], name="event_updated_at_idx"),
+            # interval index for calendar windows (events.occurrences.overlapping_bins)
+            models.Index(fields=["span_level", "span_bin"], name="event_span_bin_idx"),
+            # ?near= searches (events.geo.filter_near)
+            models.Index(fields=["geohash"], name="event_geohash_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.index_span()
+        self.index_location()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding:
+            # Writing back the counters loaded with this instance would undo any
+            # registration, hold or cancellation committed since.
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *self.DERIVED_FIELDS}
+        super().save(*args, **kwargs)
+
+    # bulk_create skips save(): callers must run the index_* methods themselves.
+    def index_span(self):
+        """Recompute series_end and the interval-index bin."""
+        self.series_end = series_end(self.date, self.ends_at, self.recurrence, self.recurrence_until)
+        self.span_level, self.span_bin = span_key(self.date, self.series_end)
+
+    def index_location(self):
+        """Recompute the geohash from latitude/longitude."""
+        has_point = self.latitude is not None and self.longitude is not None
+        self.geohash = geo.encode(self.latitude, self.longitude) if has_point else ""
 
     def clean(self):
         # Prevent creating/updating events in the past
@@ -34,29 +171,89 @@ class Event(models.Model):
             raise ValidationError({"date": "Event date must be in the future."})
 
     def seats_taken(self):
-        return self.registrations.filter(status=Registration.Status.REGISTERED).count()
+        # Maintained by Registration.save()/delete; see reconcile_seat_counts.
+        return self.seats_booked
 
     def seats_available(self):
         if self.capacity == 0:
             return None  # unlimited
-        return max(self.capacity - self.seats_taken(), 0)
+        return max(self.capacity - self.seats_taken() - self.seats_held, 0)
 
     def is_full(self):
         """Check if event has reached maximum capacity."""
         if self.capacity == 0:
             return False  # unlimited events
-        return self.seats_taken() >= self.capacity
+        return self.seats_taken() + self.seats_held >= self.capacity
 
     def __str__(self):
         return f"{self.title} @ {self.date}"
 
 
+class FTSDocumentField(models.TextField):
+    """FTS5's hidden column named after the table: ``__match`` runs a full-text MATCH on it."""
+
+    def deconstruct(self):
+        # Migrations record a plain TextField, so they never import this module.
+        name, _, args, kwargs = super().deconstruct()
+        return name, "django.db.models.TextField", args, kwargs
+
+
+@FTSDocumentField.register_lookup
+class FTSMatch(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class EventSearchEntry(models.Model):
+    """
+    The SQLite FTS5 index (events.search.SQLiteFTS5Backend), so searches join
+    it through the ORM. Unmanaged: migration 0006 creates the virtual table
+    and signals keep it in step with Event.
+    """
+    event = models.OneToOneField(
+        Event, primary_key=True, db_column="rowid", db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name="search_entry",
+    )
+    document = FTSDocumentField(db_column=FTS_TABLE)
+    rank = models.FloatField()  # bm25, lower is better
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
+class TicketPricingQuerySet(models.QuerySet):
+    def take(self, ticket_id, quantity):
+        """
+        Take ``quantity`` tickets off the shelf with one conditional UPDATE,
+        so parallel buyers can never drive the inventory below zero.
+        Returns False when fewer than ``quantity`` are left.
+        """
+        return bool(
+            self.filter(pk=ticket_id, available_quantity__gte=quantity)
+            .update(available_quantity=F("available_quantity") - quantity, updated_at=Now())
+        )
+
+    def restock(self, ticket_id, quantity):
+        return bool(
+            self.filter(pk=ticket_id)
+            .update(available_quantity=F("available_quantity") + quantity, updated_at=Now())
+        )
+
+
 class TicketPricing(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="tickets")
     ticket_type = models.CharField(max_length=80)  # VIP, Regular, etc.
     price = models.DecimalField(max_digits=10, decimal_places=2)
     currency = models.CharField(max_length=10, default="USD")
     available_quantity = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TicketPricingQuerySet.as_manager()
 
     class Meta:
         unique_together = ("event", "ticket_type")
@@ -65,32 +262,327 @@ class TicketPricing(models.Model):
         return f"{self.ticket_type} - {self.price} {self.currency} ({self.event.title})"
 
 
+class RegistrationQuerySet(models.QuerySet):
+    def next_waitlist_position(self, event_id):
+        """One past the event's current tail, read from the waitlist index."""
+        tail = self.filter(event_id=event_id, status=Registration.Status.WAITLISTED).aggregate(
+            tail=Max("waitlist_position")
+        )["tail"]
+        return (tail or 0) + 1
+
+    def promote_waitlisted(self, event_id):
+        """
+        Move the head of the event's waitlist into a free seat; call inside the
+        transaction that freed it. Returns the promoted registration, or None
+        when nobody is waiting or the seat was taken meanwhile.
+        """
+        # skip_locked: concurrent cancellations each promote a different entry.
+        head = (
+            self.select_for_update(skip_locked=True)
+            .filter(event_id=event_id, status=Registration.Status.WAITLISTED)
+            .order_by("waitlist_position", "id").first()
+        )
+        if head is None or not Event.objects.reserve_seats(event_id):
+            return None
+        if not self.filter(pk=head.pk, status=Registration.Status.WAITLISTED).update(
+            status=Registration.Status.REGISTERED, waitlist_position=None, updated_at=Now()
+        ):
+            Event.objects.release_seats(event_id)
+            return None
+        head.status, head.waitlist_position = Registration.Status.REGISTERED, None
+        OutboxMessage.enqueue("registration.promoted", head.outbox_payload())
+        return head
+
+
 class Registration(models.Model):
     class Status(models.TextChoices):
         REGISTERED = "registered", "Registered"
+        WAITLISTED = "waitlisted", "Waitlisted"
         ATTENDED = "attended", "Attended"
         CANCELLED = "cancelled", "Cancelled"
 
+    # Statuses that occupy a seat: checked-in attendees keep theirs.
+    SEATED = (Status.REGISTERED, Status.ATTENDED)
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="registrations")
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="registrations")
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.REGISTERED)
     registration_date = models.DateTimeField(auto_now_add=True)
+    # Queue order among the event's WAITLISTED entries; ties go to the lower id.
+    waitlist_position = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = RegistrationQuerySet.as_manager()
 
     class Meta:
         unique_together = ("user", "event")  # a user can register once per event
+        indexes = [
+            # per-event registration lists in keyset order
+            models.Index(fields=["event", "registration_date", "id"], name="registration_event_date_idx"),
+            # seat recounts only ever look at seated registrations
+            models.Index(
+                fields=["event"],
+                condition=Q(status__in=["registered", "attended"]),
+                name="registration_active_idx",
+            ),
+            # waitlist head/tail lookups without scanning the event's registrations
+            models.Index(
+                fields=["event", "waitlist_position"],
+                condition=Q(status="waitlisted"),
+                name="registration_waitlist_idx",
+            ),
+        ]
 
     def clean(self):
         # Can't register to past events
         if self.event.date and self.event.date < timezone.now():
             raise ValidationError("Cannot register for an event that already happened.")
 
-        # Prevent registration when event is full
-        if self._state.adding and self.event.is_full():
-            raise ValidationError("Event is fully booked.")
-
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Capacity is checked and claimed in the same step as the write;
+            # a failed insert (e.g. duplicate) rolls the seat back with it.
+            adding = self._state.adding
+            was_counted = False
+            if not adding:
+                previous = (
+                    Registration.objects.select_for_update()
+                    .filter(pk=self.pk).values_list("status", flat=True).first()
+                )
+                was_counted = previous in self.SEATED
+            is_counted = self.status in self.SEATED
+
+            if is_counted and not was_counted:
+                # A seat the user is holding becomes theirs without a new capacity check.
+                # No holds on the event as loaded: skip the lookup (a hold placed since
+                # just lapses and is swept like any other).
+                held = (
+                    adding and self.event.seats_held
+                    and SeatHold.objects.filter(user_id=self.user_id, event_id=self.event_id).delete()[0]
+                )
+                if held and Event.objects.book_held_seats(self.event_id):
+                    self.waitlist_position = None
+                elif Event.objects.reserve_seats(self.event_id):
+                    self.waitlist_position = None
+                elif adding:
+                    # Full: queue instead of failing, so clients have no reason to retry.
+                    self.status = self.Status.WAITLISTED
+                else:
+                    raise ValidationError("Event is fully booked.")
+            elif was_counted and not is_counted:
+                Event.objects.release_seats(self.event_id)
+
+            if self.status == self.Status.WAITLISTED:
+                if self.waitlist_position is None:
+                    self.waitlist_position = Registration.objects.next_waitlist_position(self.event_id)
+            else:
+                self.waitlist_position = None
+            super().save(*args, **kwargs)
+
+            # Listings show the seat counters; waitlist-only changes leave them as they were.
+            if (self.status in self.SEATED) != was_counted:
+                transaction.on_commit(bump_events_generation)
+
+            # Follow-up work (emails, analytics) commits or rolls back with the row.
+            if adding:
+                topic = "registration.waitlisted" if self.status == self.Status.WAITLISTED else "registration.created"
+                OutboxMessage.enqueue(topic, self.outbox_payload())
+            elif was_counted and self.status == self.Status.CANCELLED:
+                OutboxMessage.enqueue("registration.cancelled", self.outbox_payload())
+                TicketPurchase.objects.filter(registration_id=self.pk).cancel()
+                # The freed seat goes to the head of the waitlist, not the next registrant.
+                Registration.objects.promote_waitlisted(self.event_id)
+
+    def outbox_payload(self):
+        return {"registration_id": self.pk, "event_id": self.event_id, "user_id": self.user_id}
 
     def __str__(self):
         return f"{self.user} -> {self.event} ({self.status})"
+
+
+class TicketPurchaseQuerySet(models.QuerySet):
+    def place_order(self, registration, items):
+        """
+        Buy every ``(ticket, quantity)`` in ``items`` for ``registration`` in one
+        transaction: either all tiers have stock and all are taken, or nothing
+        is. Raises ValidationError naming the first tier that ran out.
+        """
+        if registration.status != Registration.Status.REGISTERED:
+            raise ValidationError("Only registered attendees can buy tickets.")
+
+        wanted = {}
+        for ticket, quantity in items:
+            if ticket.event_id != registration.event_id:
+                raise ValidationError(f"Ticket {ticket.pk} is not for this event.")
+            previous = wanted.get(ticket.pk, (ticket, 0))[1]
+            wanted[ticket.pk] = (ticket, previous + quantity)
+
+        with transaction.atomic():
+            # Fixed id order so two multi-tier orders can't deadlock on each other.
+            for ticket_id in sorted(wanted):
+                ticket, quantity = wanted[ticket_id]
+                if not TicketPricing.objects.take(ticket_id, quantity):
+                    raise ValidationError(f"Not enough '{ticket.ticket_type}' tickets left.")
+            return self.bulk_create(
+                TicketPurchase(
+                    registration=registration, ticket=ticket, quantity=quantity,
+                    unit_price=ticket.price, currency=ticket.currency,
+                )
+                for ticket, quantity in wanted.values()
+            )
+
+    def cancel(self):
+        """Cancel the active purchases in this queryset and put their tickets back on sale."""
+        with transaction.atomic():
+            active = self.select_for_update().filter(status=TicketPurchase.Status.PURCHASED)
+            totals = active.values("ticket_id").annotate(total=models.Sum("quantity")).order_by("ticket_id")
+            for row in totals:
+                TicketPricing.objects.restock(row["ticket_id"], row["total"])
+            return active.update(status=TicketPurchase.Status.CANCELLED)
+
+
+class TicketPurchase(models.Model):
+    class Status(models.TextChoices):
+        PURCHASED = "purchased", "Purchased"
+        CANCELLED = "cancelled", "Cancelled"
+
+    registration = models.ForeignKey(Registration, on_delete=models.CASCADE, related_name="purchases")
+    # A sold tier can only go away together with its event.
+    ticket = models.ForeignKey(TicketPricing, on_delete=models.RESTRICT, related_name="purchases")
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)  # price at purchase time
+    currency = models.CharField(max_length=10)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PURCHASED)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TicketPurchaseQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.quantity} x {self.ticket.ticket_type} for {self.registration} ({self.status})"
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def place(self, event_id, user_id, seconds=None):
+        """
+        Hold a seat for ``user_id`` for ``seconds`` (default SEAT_HOLD_SECONDS).
+        Holding again refreshes the expiry. Raises ValidationError when the
+        event has no seat left to hold.
+        """
+        seconds = seconds or getattr(settings, "SEAT_HOLD_SECONDS", 600)
+        expires_at = timezone.now() + timedelta(seconds=seconds)
+        with transaction.atomic():
+            if self.filter(event_id=event_id, user_id=user_id).update(expires_at=expires_at):
+                return self.get(event_id=event_id, user_id=user_id)
+            if not Event.objects.hold_seats(event_id):
+                raise ValidationError("Event is fully booked.")
+            hold = self.create(event_id=event_id, user_id=user_id, expires_at=expires_at)
+            transaction.on_commit(bump_events_generation)
+            return hold
+
+    def release(self, event_id, user_id):
+        """Drop the user's hold early; returns False if there was none."""
+        with transaction.atomic():
+            if not self.filter(event_id=event_id, user_id=user_id).delete()[0]:
+                return False
+            Event.objects.release_held_seats(event_id)
+            Registration.objects.promote_waitlisted(event_id)
+            transaction.on_commit(bump_events_generation)
+            return True
+
+    def sweep(self, now=None, batch_size=5000):
+        """
+        Release up to ``batch_size`` expired holds: one indexed SELECT, one
+        DELETE and one UPDATE of the affected events' counters, however many
+        holds expire. Returns how many holds were released.
+        """
+        now = now or timezone.now()
+        with transaction.atomic():
+            # Locked so a registration converting one of these holds waits for us
+            # and then finds it gone, instead of both giving the seat back.
+            expired = list(
+                self.select_for_update(skip_locked=True).filter(expires_at__lte=now)
+                .order_by("expires_at").values_list("id", "event_id")[:batch_size]
+            )
+            if not expired:
+                return 0
+            per_event = Counter(event_id for _, event_id in expired)
+            self.filter(pk__in=[pk for pk, _ in expired]).delete()
+            # Floored at zero: a counter that drifted below its live holds must not
+            # fail the CHECK constraint and wedge every later sweep.
+            released = Case(
+                *(When(pk=event_id, then=Value(count)) for event_id, count in per_event.items()),
+                output_field=models.IntegerField(),
+            )
+            Event.objects.filter(pk__in=per_event).update(
+                seats_held=Greatest(F("seats_held") - released, Value(0)), updated_at=Now()
+            )
+            # Seats freed on a full event belong to its waitlist, not the next caller.
+            waiting = Registration.objects.filter(
+                event_id__in=per_event, status=Registration.Status.WAITLISTED
+            ).values_list("event_id", flat=True).distinct()
+            for event_id in waiting:
+                for _ in range(per_event[event_id]):
+                    if Registration.objects.promote_waitlisted(event_id) is None:
+                        break
+            transaction.on_commit(bump_events_generation)
+            return len(expired)
+
+
+class SeatHold(models.Model):
+    """A seat set aside for a user until ``expires_at``, e.g. while they check out."""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="holds")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="seat_holds")
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("event", "user")
+        indexes = [
+            # the sweeper's expired-holds scan
+            models.Index(fields=["expires_at"], name="seathold_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} holds a seat at {self.event} until {self.expires_at}"
+
+
+class OutboxMessage(models.Model):
+    """
+    A side effect recorded in the same transaction as the change that caused it.
+    ``run_outbox_worker`` delivers pending messages to the handlers in
+    ``events.outbox`` at least once, retrying failures with backoff.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DELIVERED = "delivered", "Delivered"
+        FAILED = "failed", "Failed"
+
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)  # not before; also the claim lease
+    lease_token = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # the worker's "due messages" scan
+            models.Index(
+                fields=["available_at", "id"],
+                condition=Q(status="pending"),
+                name="outbox_due_idx",
+            ),
+        ]
+
+    @classmethod
+    def enqueue(cls, topic, payload):
+        return cls.objects.create(topic=topic, payload=payload)
+
+    def __str__(self):
+        return f"{self.topic} #{self.pk} ({self.status})"
@@ -0,0 +1,162 @@
+"""
+Event occurrences within a time window, and the interval index behind them.
+
+An event runs from ``date`` to ``ends_at`` (a point in time when unset) and
+may repeat daily, weekly or monthly every ``recurrence_interval`` periods
+until ``recurrence_until`` (forever when unset), skipping the local dates
+listed in ``recurrence_exceptions``. Repeats follow the wall clock of
+``TIME_ZONE``, so a weekly 18:00 event stays at 18:00 across DST changes.
+
+Occurrences are never stored. ``occurrences()`` expands one event lazily
+from the first repeat that can reach the window, and ``iter_occurrences()``
+merges many events in start order, so a caller that stops after N
+occurrences only pays for N.
+
+Finding the events to expand uses a binned interval index. Each event's
+whole span (first start to last end) is filed under the smallest bin that
+contains it, on a ladder of levels whose bins are one day wide at level 0
+and ``BIN_FANOUT`` times wider at each level above. Open-ended series go to
+``OPEN_LEVEL``. A window can only meet spans filed under the bins it
+overlaps: one contiguous bin range per level, each an index range seek on
+``(span_level, span_bin)``. Short events live in narrow bins, so the rows
+scanned track the events near the window rather than the table size.
+"""
+import heapq
+import math
+from datetime import MAXYEAR, timedelta
+from typing import NamedTuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+BIN_BASE = 86400  # seconds in a level-0 bin
+BIN_FANOUT = 8
+BIN_LEVELS = 7  # level 6 bins are 8**6 days (~718 years) wide
+OPEN_LEVEL = BIN_LEVELS
+
+DAILY, WEEKLY, MONTHLY = "daily", "weekly", "monthly"
+
+
+class Occurrence(NamedTuple):
+    event: object
+    start: object
+    end: object
+
+
+def bin_size(level):
+    return BIN_BASE * BIN_FANOUT ** level
+
+
+def span_key(start, end):
+    """``(span_level, span_bin)`` for a span from ``start`` to ``end`` (None: open-ended)."""
+    if end is None:
+        return OPEN_LEVEL, 0
+    first, last = math.floor(start.timestamp()), math.floor(end.timestamp())
+    for level in range(BIN_LEVELS):
+        size = bin_size(level)
+        if first // size == last // size:
+            return level, first // size
+    return OPEN_LEVEL, 0
+
+
+def overlapping_bins(start, end):
+    """Q matching every event whose span is filed under a bin that overlaps ``start``..``end``."""
+    first, last = math.floor(start.timestamp()), math.floor(end.timestamp())
+    condition = Q(span_level=OPEN_LEVEL)
+    for level in range(BIN_LEVELS):
+        size = bin_size(level)
+        condition |= Q(span_level=level, span_bin__range=(first // size, last // size))
+    return condition
+
+
+def series_end(start, ends_at, recurrence, until):
+    """
+    When the last occurrence ends, or None for open-ended series. For
+    bounded series this is an upper bound (``until`` plus one duration).
+    """
+    duration = ends_at - start if ends_at else timedelta(0)
+    if not recurrence:
+        return start + duration
+    if until is None:
+        return None
+    return max(until, start) + duration
+
+
+def overlaps(start, end, window_start, window_end):
+    # Windows are half-open; a point event at window_start is inside.
+    return start < window_end and (end > window_start or start >= window_start)
+
+
+def events_between(queryset, start, end):
+    """Narrow an Event queryset to those with an occurrence that may fall in ``start``..``end``."""
+    return queryset.filter(overlapping_bins(start, end), date__lt=end).filter(
+        Q(series_end__isnull=True) | Q(series_end__gt=start) | Q(date__gte=start)
+    )
+
+
+def occurrences(event, start, end, since=None):
+    """
+    Yield ``event``'s occurrences overlapping ``start``..``end`` in order,
+    optionally only those starting at or after ``since``.
+    """
+    duration = event.ends_at - event.date if event.ends_at else timedelta(0)
+    if not event.recurrence:
+        if overlaps(event.date, event.date + duration, start, end) and (since is None or event.date >= since):
+            yield Occurrence(event, event.date, event.date + duration)
+        return
+
+    first = timezone.localtime(event.date)
+    interval = max(event.recurrence_interval, 1)
+    skip = set(event.recurrence_exceptions or ())
+    # The earliest start that can still matter; repeats before it are stepped over, not generated.
+    try:
+        earliest = max(start - duration, since) if since else start - duration
+    except OverflowError:  # before year 1: every repeat matters
+        earliest = first
+
+    if event.recurrence == MONTHLY:
+        earliest = timezone.localtime(earliest)
+        months = (earliest.year - first.year) * 12 + earliest.month - first.month
+        n = max(0, months // interval - 1)
+    else:
+        step = timedelta(days=interval * (7 if event.recurrence == WEEKLY else 1))
+        # Less one step: wall-clock repeats drift from absolute time by the DST offset.
+        n = max(0, (earliest - first) // step - 1)
+
+    while True:
+        if event.recurrence == MONTHLY:
+            months = first.month - 1 + n * interval
+            if first.year + months // 12 > MAXYEAR:
+                return
+            try:
+                occurrence_start = first.replace(year=first.year + months // 12, month=months % 12 + 1)
+            except ValueError:  # no such day in that month (e.g. the 31st)
+                occurrence_start = None
+        else:
+            try:
+                occurrence_start = first + n * step  # aware + timedelta keeps the wall clock
+            except OverflowError:  # past datetime.max
+                return
+        n += 1
+        if occurrence_start is None:
+            continue
+        if occurrence_start >= end or (event.recurrence_until and occurrence_start > event.recurrence_until):
+            return
+        if since is not None and occurrence_start < since:
+            continue
+        if occurrence_start.date().isoformat() in skip:
+            continue
+        try:
+            occurrence_end = occurrence_start + duration
+        except OverflowError:
+            return
+        if overlaps(occurrence_start, occurrence_end, start, end):
+            yield Occurrence(event, occurrence_start, occurrence_end)
+
+
+def iter_occurrences(events, start, end, since=None):
+    """Merge the occurrences of ``events`` into one lazy stream ordered by (start, event id)."""
+    return heapq.merge(
+        *(occurrences(event, start, end, since) for event in events),
+        key=lambda occurrence: (occurrence.start, occurrence.event.pk),
+    )
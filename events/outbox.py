@@ -0,0 +1,155 @@
+"""
+Database-backed outbox for work that follows a registration.
+
+Writers call ``OutboxMessage.enqueue()`` inside the transaction that made
+the change, so a message exists exactly when the change committed. The
+``run_outbox_worker`` command claims due messages in batches, runs their
+topic's handlers on a thread pool and records the outcome. Delivery is
+at-least-once: a failed or abandoned message is retried with exponential
+backoff, so handlers must be safe to run twice.
+"""
+import logging
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from event_manager.metrics import registry
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def register_handler(topic):
+    """Decorator: run ``func(payload)`` for every message published on ``topic``."""
+    def decorator(func):
+        _handlers.setdefault(topic, []).append(func)
+        return func
+    return decorator
+
+
+def enqueue_many(topic, payloads):
+    """Queue one message per payload with a single INSERT; call inside the writer's transaction."""
+    return OutboxMessage.objects.bulk_create(
+        OutboxMessage(topic=topic, payload=payload) for payload in payloads
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter so a failing handler doesn't retry in lockstep."""
+    base = getattr(settings, "OUTBOX_RETRY_BACKOFF", 2)
+    ceiling = getattr(settings, "OUTBOX_RETRY_BACKOFF_MAX", 600)
+    delay = min(base * 2 ** max(attempts - 1, 0), ceiling)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due messages to this caller. The conditional
+    UPDATE means two workers can never claim the same message; a worker that
+    dies mid-batch just lets the lease run out and the message becomes due again.
+    """
+    now = timezone.now()
+    due = list(
+        OutboxMessage.objects.filter(status=OutboxMessage.Status.PENDING, available_at__lte=now)
+        .order_by("available_at", "id").values_list("id", flat=True)[:batch_size]
+    )
+    if not due:
+        return "", []
+
+    token = uuid.uuid4().hex
+    lease = timedelta(seconds=getattr(settings, "OUTBOX_LEASE_SECONDS", 300))
+    OutboxMessage.objects.filter(
+        pk__in=due, status=OutboxMessage.Status.PENDING, available_at__lte=now
+    ).update(available_at=now + lease, lease_token=token, attempts=F("attempts") + 1)
+    return token, list(OutboxMessage.objects.filter(pk__in=due, lease_token=token).order_by("id"))
+
+
+def deliver(message):
+    """Run every handler for ``message``; returns an error string, or None on success."""
+    try:
+        handlers = _handlers.get(message.topic)
+        if not handlers:
+            return f"No handler registered for {message.topic!r}."
+        for handler in handlers:
+            handler(message.payload)
+    except Exception as exc:
+        logger.exception("Outbox message %s (%s) failed", message.pk, message.topic)
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+def _deliver_in_thread(message):
+    try:
+        return deliver(message)
+    finally:
+        close_old_connections()  # pool threads open their own connections
+
+
+def drain(batch_size=None, workers=None):
+    """Deliver one batch of due messages; returns counts by outcome."""
+    batch_size = batch_size or getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    workers = workers or getattr(settings, "OUTBOX_WORKERS", 4)
+    max_attempts = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 8)
+
+    token, messages = claim_batch(batch_size)
+    outcome = {"delivered": 0, "retried": 0, "failed": 0}
+    if not messages:
+        return outcome
+
+    if workers > 1 and len(messages) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(_deliver_in_thread, messages))
+    else:
+        errors = [deliver(message) for message in messages]
+
+    now = timezone.now()
+    delivered = [message.pk for message, error in zip(messages, errors) if error is None]
+    # Filtering on the lease token leaves alone anything another worker re-claimed.
+    OutboxMessage.objects.filter(pk__in=delivered, lease_token=token).update(
+        status=OutboxMessage.Status.DELIVERED, processed_at=now, last_error=""
+    )
+    outcome["delivered"] = len(delivered)
+
+    for message, error in zip(messages, errors):
+        if error is None:
+            registry.increment("outbox_messages_total", topic=message.topic, result="delivered")
+            continue
+        if message.attempts >= max_attempts:
+            changes = {"status": OutboxMessage.Status.FAILED, "processed_at": now}
+            result = "failed"
+        else:
+            changes = {"available_at": now + retry_delay(message.attempts)}
+            result = "retried"
+        OutboxMessage.objects.filter(pk=message.pk, lease_token=token).update(last_error=error, **changes)
+        outcome[result] += 1
+        registry.increment("outbox_messages_total", topic=message.topic, result=result)
+    return outcome
+
+
+def drain_all(batch_size=None, workers=None):
+    """Keep draining until nothing is due; returns the summed counts."""
+    totals = {"delivered": 0, "retried": 0, "failed": 0}
+    while True:
+        outcome = drain(batch_size, workers)
+        for key, value in outcome.items():
+            totals[key] += value
+        if not any(outcome.values()):
+            return totals
+
+
+def purge_delivered(older_than):
+    """Delete delivered messages processed before ``older_than``; failed ones are kept for inspection."""
+    deleted, _ = OutboxMessage.objects.filter(
+        status=OutboxMessage.Status.DELIVERED, processed_at__lt=older_than
+    ).delete()
+    return deleted
+
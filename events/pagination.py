@@ -0,0 +1,126 @@
+import base64
+import json
+from functools import partial
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise NotFound("Invalid cursor.")
+    if not isinstance(values, list):
+        raise NotFound("Invalid cursor.")
+    return values
+
+
+class KnownCountPaginator(Paginator):
+    """Django's Paginator, skipping its COUNT(*) when the caller already has the count."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page numbers by default; keyset (cursor) pages when the client sends
+    ``?cursor=`` (empty for the first page).
+
+    Keyset pages seek past the last row seen on the view's
+    ``keyset_ordering`` (e.g. ``("date", "id")``), so page 10,000 costs the
+    same as page 1 and no COUNT(*) is run. Cursor pages move forward only
+    and ignore ``?ordering=``.
+    """
+
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, "keyset_ordering", None)
+        if not ordering or self.cursor_query_param not in request.query_params:
+            self.keyset = False
+            # ConditionalGetMixin already counted these rows for its ETag.
+            self.django_paginator_class = partial(KnownCountPaginator, count=getattr(view, "validated_count", None))
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        page_size = self.get_page_size(request)
+        rows = list(self._window(queryset, request, ordering))
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def validator_queryset(self, queryset, request, view=None):
+        """
+        The rows a response for ``request`` is built from, for ConditionalGetMixin:
+        just the cursor page (plus the lookahead row) for keyset requests, so
+        deep pages stay COUNT-free; the whole list otherwise, since page-number
+        responses report its ``count``.
+        """
+        ordering = getattr(view, "keyset_ordering", None)
+        if not ordering or self.cursor_query_param not in request.query_params:
+            return queryset
+        return self._window(queryset, request, ordering)
+
+    def _window(self, queryset, request, ordering):
+        self.ordering = ordering
+        queryset = queryset.order_by(*ordering)
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            queryset = queryset.filter(self._seek(queryset.model, decode_cursor(cursor)))
+        return queryset[:self.get_page_size(request) + 1]
+
+    def _seek(self, model, values):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y), built for any key length.
+        if len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor.")
+        try:
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except ValidationError:
+            raise NotFound("Invalid cursor.")
+
+        condition = Q()
+        for position, name in enumerate(self.ordering):
+            equal_prefix = {
+                self.ordering[i]: values[i] for i in range(position)
+            }
+            condition |= Q(**equal_prefix, **{f"{name}__gt": values[position]})
+        # The redundant bound on the leading column turns the OR into an index range seek.
+        return Q(**{f"{self.ordering[0]}__gte": values[0]}) & condition
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        cursor = encode_cursor(getattr(last, name) for name in self.ordering)
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
@@ -0,0 +1,151 @@
+"""
+Full-text search over Event title, description and location.
+
+The backend is picked from ``settings.EVENTS_SEARCH_BACKEND`` (a dotted
+path) or, when unset, from the database vendor. Backends filter an Event
+queryset down to matches and annotate ``search_rank`` (lower is better).
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+FTS_TABLE = "events_event_fts"
+
+
+def postgres_document(table=""):
+    """
+    The tsvector expression PostgresSearchBackend searches on. Migration
+    0006 builds the GIN index over a copy of it; the two must match for
+    the planner to use the index.
+    """
+    prefix = f"{table}." if table else ""
+    return (
+        f"to_tsvector('english', coalesce({prefix}title, '') || ' ' || "
+        f"coalesce({prefix}description, '') || ' ' || coalesce({prefix}location, ''))"
+    )
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchBackend:
+    """Interface every search backend implements."""
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def index(self, event):
+        """Add or refresh one event in the index."""
+
+    def remove(self, event_id):
+        """Drop one event from the index."""
+
+    def rebuild(self):
+        """Re-index every event; returns the number indexed."""
+        return 0
+
+
+class LikeSearchBackend(SearchBackend):
+    """Unindexed icontains fallback for databases without full-text support."""
+
+    def search(self, queryset, query):
+        condition = Q()
+        for word in _WORD.findall(query):
+            condition &= (
+                Q(title__icontains=word)
+                | Q(description__icontains=word)
+                | Q(location__icontains=word)
+            )
+        return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """FTS5 virtual table keyed by event id and kept in sync by signals."""
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        # Join the FTS table once (events.models.EventSearchEntry) rather than
+        # ranking with a per-row subquery, so ranking costs one MATCH however
+        # many events match.
+        return queryset.filter(search_entry__document__match=match).annotate(search_rank=F("search_entry__rank"))
+
+    @staticmethod
+    def match_expression(query):
+        # Quote every word so user input can't inject FTS5 syntax; the last
+        # word is a prefix match to support search-as-you-type.
+        words = _WORD.findall(query)
+        if not words:
+            return ""
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [event.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, location) VALUES (%s, %s, %s, %s)",
+                [event.pk, event.title, event.description, event.location],
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [event_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, location) "
+                f"SELECT id, title, description, location FROM events_event"
+            )
+            return cursor.rowcount
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector search served by a GIN expression index; nothing to keep in sync."""
+
+    def search(self, queryset, query):
+        words = _WORD.findall(query)
+        if not words:
+            return queryset.none()
+        tsquery = " & ".join(f"{word}:*" for word in words)
+        table = queryset.model._meta.db_table
+        return (
+            queryset
+            .filter(id__in=RawSQL(
+                f"SELECT id FROM {table} WHERE {postgres_document()} @@ to_tsquery('english', %s)",
+                [tsquery],
+            ))
+            # ts_rank is higher-is-better; negate to keep "lower ranks first".
+            .annotate(search_rank=RawSQL(
+                f"-ts_rank({postgres_document(table)}, to_tsquery('english', %s))", [tsquery]
+            ))
+        )
+
+
+_VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTS5Backend,
+    "postgresql": PostgresSearchBackend,
+}
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "EVENTS_SEARCH_BACKEND", None)
+        backend_class = import_string(path) if path else _VENDOR_BACKENDS.get(connection.vendor, LikeSearchBackend)
+        _backend = backend_class()
+    return _backend
+
+
+def search_events(queryset, query):
+    """Filter ``queryset`` to events matching ``query``, best matches first."""
+    return get_search_backend().search(queryset, query).order_by("search_rank", "date", "id")
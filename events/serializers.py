@@ -1,50 +1,257 @@
-from rest_framework import serializers
+import time
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from event_manager.metrics import InstrumentedSerializerMixin, current_request
 from .models import EventCategory
-from .models import Event, Registration
-from .models import TicketPricing
+from .models import Event, Registration, SeatHold
+from .models import TicketPricing, TicketPurchase
+
+
+class LeanListSerializerMixin:
+    """
+    A list representation built straight from ``values_list()`` tuples.
+
+    ``lean_rows(queryset)`` selects the columns named in ``Meta.lean_values``
+    (output field -> lookup) and ``lean_data(rows)`` turns them into the same
+    dicts ``Serializer(queryset, many=True).data`` would produce, without
+    model instances or per-field attribute lookups. Fields missing from
+    ``lean_values`` are filled in by a ``lean_<field>(item)`` method from the
+    row's other values. Columns are only passed through ``to_representation``
+    when their output differs from the raw value (dates, decimals).
+    """
+
+    _lean_passthrough = (
+        serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+        serializers.ChoiceField, serializers.ReadOnlyField, PrimaryKeyRelatedField,
+    )
+
+    def lean_rows(self, queryset):
+        return queryset.values_list(*self.Meta.lean_values.values(), named=True)
+
+    def lean_data(self, rows):
+        lean_values = self.Meta.lean_values
+        fields = self.fields
+        template = dict.fromkeys(fields)
+        columns = list(lean_values)
+        converters = [
+            (name, self._lean_converter(field)) for name, field in fields.items()
+            if name in lean_values and not isinstance(field, self._lean_passthrough)
+        ]
+        computed = [
+            (name, getattr(self, f"lean_{name}")) for name in fields if name not in lean_values
+        ]
+
+        stats = current_request.get()
+        start = time.perf_counter()
+        data = []
+        for row in rows:
+            item = template.copy()
+            item.update(zip(columns, row))
+            for name, convert in converters:
+                value = item[name]
+                if value is not None:
+                    item[name] = convert(value)
+            for name, compute in computed:
+                item[name] = compute(item)
+            data.append(item)
+        if stats is not None:
+            stats.serializer_time += time.perf_counter() - start
+        return data
 
+    def _lean_converter(self, field):
+        if not isinstance(field, serializers.DateTimeField):
+            return field.to_representation
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if field_timezone is None or output_format is None or output_format.lower() != ISO_8601:
+            return field.to_representation
+
+        def to_iso(value):
+            # DateTimeField.to_representation, with the timezone looked up once per list.
+            if not timezone.is_aware(value):
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        return to_iso
+
+
+class EventCategorySerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
+    # Present when the queryset comes from EventCategory.objects.with_event_counts().
+    event_count = serializers.IntegerField(read_only=True)
+    upcoming_count = serializers.IntegerField(read_only=True)
 
-class EventCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = EventCategory
         fields = [
-            'id', 'name', 'description']
+            'id', 'name', 'description', 'event_count', 'upcoming_count']
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(LeanListSerializerMixin, InstrumentedSerializerMixin, serializers.ModelSerializer):
     created_by = serializers.ReadOnlyField(source='created_by.username')
+    seats_taken = serializers.ReadOnlyField()
+    seats_available = serializers.ReadOnlyField()
 
     class Meta:
         model = Event
         fields = [
-            'id', 'title', 'description', 'date', 'location',
-            'category', 'capacity', 'created_by', 'created_at'
+            'id', 'title', 'description', 'date', 'ends_at', 'recurrence', 'recurrence_interval',
+            'recurrence_until', 'recurrence_exceptions', 'location', 'latitude', 'longitude',
+            'category', 'capacity', 'seats_taken', 'seats_held', 'seats_available',
+            'created_by', 'created_at'
         ]
-        read_only_fields = ['id', 'created_by', 'created_at']
+        read_only_fields = ['id', 'created_by', 'seats_held', 'created_at']
+        # Consumed by SerializerQuerySetMixin; keep in step with `fields`.
+        select_related = ['created_by']
+        only = [
+            'id', 'title', 'description', 'date', 'ends_at', 'recurrence', 'recurrence_interval',
+            'recurrence_until', 'recurrence_exceptions', 'location', 'latitude', 'longitude', 'category_id',
+            'capacity', 'seats_booked', 'seats_held', 'created_by__username', 'created_at'
+        ]
+        # Columns for list responses built by lean_data(); seats_available is computed.
+        lean_values = {
+            'id': 'id', 'title': 'title', 'description': 'description', 'date': 'date',
+            'ends_at': 'ends_at', 'recurrence': 'recurrence', 'recurrence_interval': 'recurrence_interval',
+            'recurrence_until': 'recurrence_until', 'recurrence_exceptions': 'recurrence_exceptions',
+            'location': 'location', 'latitude': 'latitude', 'longitude': 'longitude',
+            'category': 'category_id', 'capacity': 'capacity', 'seats_taken': 'seats_booked',
+            'seats_held': 'seats_held', 'created_by': 'created_by__username', 'created_at': 'created_at',
+        }
 
     def validate_date(self, value):
         if value < timezone.now():
             raise serializers.ValidationError("Event date must be in the future.")
         return value
 
+    def validate_recurrence_interval(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Must be at least 1.")
+        return value
+
+    def validate_recurrence_exceptions(self, value):
+        if not isinstance(value, list) or not all(isinstance(day, str) and parse_date(day) for day in value):
+            raise serializers.ValidationError("Must be a list of dates (YYYY-MM-DD).")
+        return sorted({parse_date(day).isoformat() for day in value})
+
+    def validate(self, attrs):
+        def current(name):
+            return attrs[name] if name in attrs else getattr(self.instance, name, None)
+
+        date, ends_at, until = current('date'), current('ends_at'), current('recurrence_until')
+        if (current('latitude') is None) != (current('longitude') is None):
+            raise serializers.ValidationError("Set latitude and longitude together.")
+        if ends_at and date and ends_at < date:
+            raise serializers.ValidationError({'ends_at': "Must not be before the event date."})
+        if until and not current('recurrence'):
+            raise serializers.ValidationError({'recurrence_until': "Only applies to repeating events."})
+        if until and date and until < date:
+            raise serializers.ValidationError({'recurrence_until': "Must not be before the event date."})
+        return attrs
+
+    def lean_seats_available(self, item):
+        # Event.seats_available() over the row's values.
+        if item['capacity'] == 0:
+            return None
+        return max(item['capacity'] - item['seats_taken'] - item['seats_held'], 0)
+
     def create(self, validated_data):
-        validated_data['created_by'] = self.context['request'].user
+        validated_data['created_by_id'] = self.context['request'].user.id
         return super().create(validated_data)
 
-class TicketPricingSerializer(serializers.ModelSerializer):
+
+class OccurrenceSerializer(serializers.Serializer):
+    """One occurrence of an event (see events.occurrences.Occurrence)."""
+    event = serializers.IntegerField(source='event.id')
+    title = serializers.CharField(source='event.title')
+    location = serializers.CharField(source='event.location')
+    category = serializers.IntegerField(source='event.category_id')
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+
+class TicketPricingSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = TicketPricing
-        fields = ['id', 'event', 'ticket_type', 'price', 'currency']
+        fields = ['id', 'event', 'ticket_type', 'price', 'currency', 'available_quantity']
         read_only_fields = ['id', 'event']
 
-class RegistrationSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        """
+        Write only the submitted columns. A new ``available_quantity`` is
+        applied as an F() delta against the value loaded with the instance,
+        so tickets sold by take() since then stay sold.
+        """
+        quantity = validated_data.pop('available_quantity', None)
+        with transaction.atomic():
+            for field, value in validated_data.items():
+                setattr(instance, field, value)
+            if validated_data:
+                instance.save(update_fields=[*validated_data, 'updated_at'])
+            if quantity is not None and quantity != instance.available_quantity:
+                delta = quantity - instance.available_quantity
+                if delta > 0:
+                    TicketPricing.objects.restock(instance.pk, delta)
+                elif not TicketPricing.objects.take(instance.pk, -delta):
+                    raise serializers.ValidationError(
+                        {'available_quantity': "Fewer tickets are left than this would remove."}
+                    )
+                instance.available_quantity = (
+                    TicketPricing.objects.values_list('available_quantity', flat=True).get(pk=instance.pk)
+                )
+        return instance
+
+
+class SeatHoldSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ["id", "event", "expires_at", "created_at"]
+        read_only_fields = fields
+
+
+class TicketPurchaseSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
+    ticket_type = serializers.ReadOnlyField(source="ticket.ticket_type")
+
+    class Meta:
+        model = TicketPurchase
+        fields = ["id", "ticket", "ticket_type", "quantity", "unit_price", "currency", "status", "created_at"]
+        read_only_fields = fields
+
+
+class TicketOrderItemSerializer(serializers.Serializer):
+    ticket = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class TicketOrderSerializer(serializers.Serializer):
+    """Body of a ticket purchase: ``{"items": [{"ticket": <id>, "quantity": <n>}, ...]}``."""
+    items = TicketOrderItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items):
+        event_id = self.context["event_id"]
+        ids = {item["ticket"] for item in items}
+        tickets = TicketPricing.objects.filter(event_id=event_id, pk__in=ids).in_bulk()
+        missing = sorted(ids - tickets.keys())
+        if missing:
+            raise serializers.ValidationError(f"Unknown ticket(s) for this event: {missing}.")
+        return [(tickets[item["ticket"]], item["quantity"]) for item in items]
+
+class RegistrationSerializer(LeanListSerializerMixin, InstrumentedSerializerMixin, serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source="user.username")
-    event = serializers.ReadOnlyField(source="event.id")  # <-- make it read-only
+    event = serializers.ReadOnlyField(source="event_id")  # <-- make it read-only
 
     class Meta:
         model = Registration
-        fields = ["id", "user", "event", "status", "registration_date"]
-        read_only_fields = ["id", "event", "status", "registration_date"]
+        fields = ["id", "user", "event", "status", "waitlist_position", "registration_date"]
+        read_only_fields = ["id", "event", "status", "waitlist_position", "registration_date"]
+        select_related = ["user"]
+        only = ["id", "user__username", "event_id", "status", "waitlist_position", "registration_date"]
+        lean_values = {
+            "id": "id", "user": "user__username", "event": "event_id", "status": "status",
+            "waitlist_position": "waitlist_position", "registration_date": "registration_date",
+        }
 
     def create(self, validated_data):
         """
@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_categories_generation, bump_events_generation
+from .models import Event, EventCategory, Registration, TicketPricing, TicketPurchase
+from .search import get_search_backend
+
+
+@receiver(post_delete, sender=Registration)
+def release_seat_on_delete(sender, instance, origin=None, **kwargs):
+    # Runs inside the delete's transaction, including cascades and queryset deletes.
+    if instance.status not in Registration.SEATED:
+        return
+    Event.objects.release_seats(instance.event_id)
+    # The freed seat goes to the waitlist, unless the whole event is going away.
+    if _origin_model(origin) is not Event:
+        Registration.objects.promote_waitlisted(instance.event_id)
+    transaction.on_commit(bump_events_generation)
+
+
+@receiver(post_delete, sender=TicketPurchase)
+def restock_on_delete(sender, instance, origin=None, **kwargs):
+    # Deleting a registration deletes its purchases; their tickets go back on sale.
+    if instance.status == TicketPurchase.Status.PURCHASED and _origin_model(origin) is not Event:
+        TicketPricing.objects.restock(instance.ticket_id, instance.quantity)
+
+
+def _origin_model(origin):
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_listings(sender, **kwargs):
+    # Registrations bump only when they move the seat counters (Registration.save,
+    # release_seat_on_delete), so waitlist churn during an on-sale keeps the cache.
+    # Bump after commit so no reader can cache pre-commit rows under the new version.
+    transaction.on_commit(bump_events_generation)
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_category_list(sender, **kwargs):
+    # Event writes move the per-category counts.
+    transaction.on_commit(bump_categories_generation)
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
@@ -1,17 +1,40 @@
 from django.urls import reverse
 from rest_framework.test import APITestCase
-from django.test import TestCase
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from .models import EventCategory, Event
+from django.db import connection, OperationalError
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core import mail
+from django.test import override_settings
+from io import StringIO
+from . import async_views
+from .cache import upcoming_cache_stats
+from .geo import encode as geohash_encode
+from .occurrences import OPEN_LEVEL, events_between, occurrences, span_key
+from .models import EventCategory, Event, OutboxMessage, Registration, SeatHold, TicketPricing, TicketPurchase
+from .outbox import drain, drain_all, register_handler
+from .pagination import KeysetPagination, encode_cursor
+from .search import search_events
+from .serializers import EventSerializer, RegistrationSerializer
+from .views import TicketPricingViewSet
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+import random
+import re
+import time
 
 User = get_user_model()
 
 class EventCategoryTests(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.admin = User.objects.create_superuser(
             username="admin", email="admin@example.com", password="AdminPass123"
         )
@@ -41,6 +64,66 @@ class EventCategoryTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+class CategoryListCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user", password="UserPass123")
+        self.music = EventCategory.objects.create(name="Music")
+        self.tech = EventCategory.objects.create(name="Tech")
+        now = timezone.now()
+        for days, category in ((-3, self.music), (2, self.music), (4, self.music), (1, self.tech)):
+            Event.objects.create(
+                title=f"{category.name} {days}", date=now + timedelta(days=days), location="Lagos",
+                category=category, created_by=self.user
+            )
+        self.url = reverse("events:category-list")
+
+    def test_counts_come_from_one_grouped_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        counts = {c["name"]: (c["event_count"], c["upcoming_count"]) for c in response.data}
+        self.assertEqual(counts, {"Music": (3, 2), "Tech": (1, 1)})
+        self.assertTrue(response["ETag"].startswith('"'))
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.data, response.data)
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"').status_code, status.HTTP_200_OK)
+
+    def test_writes_invalidate_the_list(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                title="Another", date=timezone.now() + timedelta(days=9), location="Lagos",
+                category=self.tech, created_by=self.user
+            )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[1]["upcoming_count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tech.name = "Technology"
+            self.tech.save()
+        self.assertEqual(self.client.get(self.url).data[1]["name"], "Technology")
+
+    def test_entry_expires_when_next_event_starts(self):
+        Event.objects.create(
+            title="Imminent", date=timezone.now() + timedelta(seconds=30), location="Lagos",
+            category=self.tech, created_by=self.user
+        )
+        with mock.patch("events.cache.cache.set") as cache_set:
+            self.client.get(self.url)
+        self.assertTrue(1 <= cache_set.call_args.kwargs["timeout"] <= 30)
+
+
 class EventTests(APITestCase):
 
     def setUp(self):
@@ -111,13 +194,15 @@ class EventTests(APITestCase):
             username="other", email="other@example.com", password="OtherPass123"
         )
         self.client.force_authenticate(user=other_user)
-        response = self.client.put(url, {"title": "Hacked Event"})
+        response = self.client.patch(url, {"title": "Hacked Event"})
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
-        # Try with admin
+        # Try with admin (PATCH: a PUT must send every required field)
         self.client.force_authenticate(user=self.admin)
-        response = self.client.put(url, {"title": "Admin Updated Event"})
+        response = self.client.patch(url, {"title": "Admin Updated Event"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        event.refresh_from_db()
+        self.assertEqual(event.title, "Admin Updated Event")
 
     def test_filter_events_by_category(self):
         # Create two events in different categories
@@ -178,6 +263,12 @@ class EventTests(APITestCase):
         self.assertIn("Soon Event", titles)
         self.assertNotIn("Later Event", titles)
 
+    def test_malformed_date_filter_is_rejected(self):
+        for url in (reverse("events:event-list"), reverse("events:event-upcoming-events")):
+            response = self.client.get(url, {"start_date": "next week"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("start_date", response.data)
+
     def test_pagination_on_events_list(self):
         # Create 12 events (page size = 10, so should be 2 pages)
         for i in range(12):
@@ -203,5 +294,1328 @@ class EventTests(APITestCase):
         self.assertEqual(len(response2.data["results"]), 2)
 
 
+class RegistrationTests(APITestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="OwnerPass123"
+        )
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="UserPass123"
+        )
+        self.category = EventCategory.objects.create(name="Conference", description="Tech events")
+        self.event = Event.objects.create(
+            title="Small Event",
+            date=timezone.now() + timedelta(days=5),
+            location="Lagos",
+            category=self.category,
+            created_by=self.owner,
+            capacity=1
+        )
+        self.url = reverse("events:event-registrations-list", args=[self.event.id])
+
+    def test_editing_event_keeps_concurrent_seat_counts(self):
+        stale = Event.objects.get(pk=self.event.pk)  # loaded before the registration commits
+        Registration.objects.create(user=self.user, event=self.event)
+        stale.title = "Renamed"
+        stale.save()
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.title, self.event.seats_booked), ("Renamed", 1))
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.patch(
+            reverse("events:event-detail", args=[self.event.id]), {"description": "Bring a laptop"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+
+        # The seat is still taken, so the next registrant is waitlisted.
+        late = User.objects.create_user(username="late", password="LatePass123")
+        self.assertEqual(
+            Registration.objects.create(user=late, event=self.event).status, Registration.Status.WAITLISTED
+        )
+
+    def test_register_skips_hold_lookup_without_holds(self):
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertFalse([statement for statement in sql if "events_seathold" in statement])
+        self.assertNotIn('"events_event"."title"', sql[0])
+
+    def test_register_claims_seat(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+
+    def test_duplicate_registration_rejected_without_leaking_seat(self):
+        self.event.capacity = 5
+        self.event.save()
+        self.client.force_authenticate(user=self.user)
+        self.client.post(self.url)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+
+    def test_full_event_waitlists(self):
+        Registration.objects.create(user=self.owner, event=self.event)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], Registration.Status.WAITLISTED)
+        self.assertEqual(response.data["waitlist_position"], 1)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+
+    def test_cancellation_promotes_head_of_waitlist(self):
+        seated = Registration.objects.create(user=self.owner, event=self.event)
+        queued = [
+            Registration.objects.create(user=User.objects.create_user(username=f"queued{i}"), event=self.event)
+            for i in range(3)
+        ]
+        self.assertEqual([r.waitlist_position for r in queued], [1, 2, 3])
+
+        seated.status = Registration.Status.CANCELLED
+        seated.save()
+        for registration in queued:
+            registration.refresh_from_db()
+        self.assertEqual(queued[0].status, Registration.Status.REGISTERED)
+        self.assertIsNone(queued[0].waitlist_position)
+        self.assertEqual([r.status for r in queued[1:]], [Registration.Status.WAITLISTED] * 2)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+        self.assertTrue(OutboxMessage.objects.filter(
+            topic="registration.promoted", payload__registration_id=queued[0].pk
+        ).exists())
+
+        # Leaving the waitlist frees no seat; deleting a seated registration does.
+        queued[1].status = Registration.Status.CANCELLED
+        queued[1].save()
+        queued[0].delete()
+        queued[2].refresh_from_db()
+        self.assertEqual(queued[2].status, Registration.Status.REGISTERED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+
+    def test_check_in_keeps_the_seat(self):
+        seated = Registration.objects.create(user=self.owner, event=self.event)
+        queued = Registration.objects.create(user=self.user, event=self.event)
+
+        seated.status = Registration.Status.ATTENDED
+        seated.save()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Registration.Status.WAITLISTED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 1)
+        late = Registration.objects.create(user=User.objects.create_user(username="late"), event=self.event)
+        self.assertEqual(late.status, Registration.Status.WAITLISTED)
+
+        # Cancelling (or deleting) an attended registration does free the seat, for the queue.
+        seated.status = Registration.Status.CANCELLED
+        seated.save()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Registration.Status.REGISTERED)
+
+    def test_promotion_uses_waitlist_index(self):
+        Registration.objects.create(user=self.owner, event=self.event)
+        with CaptureQueriesContext(connection) as ctx:
+            Registration.objects.promote_waitlisted(self.event.id)
+        plan = connection.cursor().execute("EXPLAIN QUERY PLAN " + ctx.captured_queries[0]["sql"]).fetchall()
+        self.assertIn("registration_waitlist_idx", " ".join(str(row) for row in plan))
+
+    def test_deleting_event_does_not_shuffle_waitlist(self):
+        Registration.objects.create(user=self.owner, event=self.event)
+        Registration.objects.create(user=self.user, event=self.event)
+        self.event.delete()
+        self.assertFalse(OutboxMessage.objects.filter(topic="registration.promoted").exists())
+
+    def test_status_changes_and_delete_keep_counter_in_sync(self):
+        self.event.capacity = 5
+        self.event.save()
+        registration = Registration.objects.create(user=self.user, event=self.event)
+        other = Registration.objects.create(user=self.owner, event=self.event)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken(), 2)
+
+        registration.status = Registration.Status.CANCELLED
+        registration.save()
+        other.status = Registration.Status.ATTENDED  # checked in: still in the seat
+        other.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken(), 1)
+        self.assertEqual(self.event.seats_available(), 4)
+
+        registration.status = Registration.Status.REGISTERED
+        registration.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken(), 2)
+
+        registration.delete()
+        other.delete()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken(), 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        self.event.capacity = 5
+        self.event.save()
+        Registration.objects.create(user=self.user, event=self.event)
+        Registration.objects.create(user=self.owner, event=self.event, status=Registration.Status.ATTENDED)
+        Event.objects.filter(pk=self.event.pk).update(seats_booked=4)
+
+        out = StringIO()
+        call_command("reconcile_seat_counts", stdout=out)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 2)
+        self.assertIn("Reconciled 1 drifted event(s).", out.getvalue())
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+class QueryPlanTests(APITestCase):
+    """Every query the hot endpoints run must be served by an index."""
+
+    # "SCAN subquery" walks an already LIMITed page window (the ETag aggregate).
+    full_scan = re.compile(r"\bSCAN (?!subquery\b)\w+$|TEMP B-TREE")
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.user = User.objects.create_user(username="user", password="UserPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        self.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                date=timezone.now() + timedelta(days=i + 1),
+                location="Lagos",
+                category=self.category,
+                created_by=self.owner
+            )
+            for i in range(3)
+        ]
+        self.event = self.events[0]
+        Registration.objects.create(user=self.owner, event=self.event)
+        TicketPricing.objects.create(event=self.event, ticket_type="VIP", price=10)
+
+    def assertIndexedQueries(self, method, url, data=None):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data)
+        self.assertLess(response.status_code, 400, response.content)
+
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query["sql"]
+                if not sql.startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                plan = [row[-1] for row in cursor.fetchall()]
+                if any("_uniq" in step for step in plan):
+                    # a unique-key lookup matches at most one row; sorting it is free
+                    plan = [step for step in plan if "TEMP B-TREE" not in step]
+                offending = [step for step in plan if self.full_scan.search(step)]
+                self.assertEqual(offending, [], f"{method.upper()} {url}: {sql}")
+
+    def _cursor_for(self, *values):
+        return encode_cursor(values)
+
+    def test_event_endpoints_use_indexes(self):
+        events_url = reverse("events:event-list")
+        upcoming_url = reverse("events:event-upcoming-events")
+        cursor = self._cursor_for(self.event.date, self.event.id)
+        self.client.force_authenticate(user=self.user)
+
+        self.assertIndexedQueries("get", events_url)
+        self.assertIndexedQueries("get", events_url, {"cursor": cursor})
+        self.assertIndexedQueries("get", events_url, {"category": self.category.id})
+        self.assertIndexedQueries("get", upcoming_url)
+        self.assertIndexedQueries("get", upcoming_url, {"cursor": cursor})
+        self.assertIndexedQueries("get", reverse("events:event-detail", args=[self.event.id]))
+        self.assertIndexedQueries("get", reverse("events:event-tickets-list", args=[self.event.id]))
+
+    def test_registration_endpoints_use_indexes(self):
+        url = reverse("events:event-registrations-list", args=[self.event.id])
+        registration = self.event.registrations.get()
+        cursor = self._cursor_for(registration.registration_date, registration.id)
+
+        self.client.force_authenticate(user=self.owner)
+        self.assertIndexedQueries("get", url)
+        self.assertIndexedQueries("get", url, {"cursor": cursor})
+
+        self.client.force_authenticate(user=self.user)
+        self.assertIndexedQueries("post", url)
+        self.assertIndexedQueries("get", url)
+
+
+class FullTextSearchTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user", password="UserPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+
+        def make(title, description="", location="Lagos"):
+            return Event.objects.create(
+                title=title,
+                description=description,
+                date=timezone.now() + timedelta(days=2),
+                location=location,
+                category=self.category,
+                created_by=self.user
+            )
+
+        self.jazz = make("Jazz Night", "Live jazz, more jazz and a jazz jam session")
+        self.mention = make("Open Mic", "Some jazz standards at the end")
+        self.other = make("Python Meetup", "Talks on Django", location="Abuja")
+
+    def test_ranked_search_over_title_and_description(self):
+        response = self.client.get(reverse("events:event-list"), {"q": "jazz"})
+        ids = [ev["id"] for ev in response.data["results"]]
+        self.assertEqual(ids, [self.jazz.id, self.mention.id])
+
+    def test_search_on_upcoming_matches_location_prefix(self):
+        response = self.client.get(reverse("events:event-upcoming-events"), {"q": "abu"})
+        ids = [ev["id"] for ev in response.data["results"]]
+        self.assertEqual(ids, [self.other.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.title = "Jazz for Pythonistas"
+        self.other.save()
+        self.jazz.delete()
+        response = self.client.get(reverse("events:event-list"), {"q": "jazz"})
+        ids = {ev["id"] for ev in response.data["results"]}
+        self.assertEqual(ids, {self.mention.id, self.other.id})
+
+    def test_query_syntax_is_escaped(self):
+        response = self.client.get(reverse("events:event-list"), {"q": 'jazz" OR *'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_search_composes_with_other_filters(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("events:event-list"), {"q": "jazz", "location": "Lagos", "cursor": ""})
+        self.assertEqual([ev["id"] for ev in response.data["results"]], [self.jazz.id, self.mention.id])
+        matches = search_events(Event.objects.exclude(pk=self.jazz.pk), "jazz")
+        self.assertEqual((matches.count(), list(matches.values_list("id", flat=True))), (1, [self.mention.id]))
+        self.assertTrue(matches.filter(search_rank__lt=0).exists())
+
+
+class KeysetPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="UserPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        same_time = timezone.now() + timedelta(days=2)
+        for i in range(15):
+            Event.objects.create(
+                title=f"Event {i}",
+                # ties on date must still page deterministically via id
+                date=same_time if i % 2 else same_time + timedelta(hours=i),
+                location="Lagos",
+                category=self.category,
+                created_by=self.user
+            )
+
+    def test_cursor_pages_cover_every_event_once(self):
+        url = reverse("events:event-list")
+        response = self.client.get(url, {"cursor": ""})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        ids = [ev["id"] for ev in response.data["results"]]
+        self.assertEqual(len(ids), 10)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(response.data["next"])
+        # Only the ETag aggregate counts, and only over the page window.
+        self.assertFalse(any("COUNT(" in q["sql"] and "LIMIT" not in q["sql"] for q in queries))
+        ids += [ev["id"] for ev in response.data["results"]]
+        self.assertIsNone(response.data["next"])
+
+        expected = list(Event.objects.order_by("date", "id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("events:event-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class UpcomingCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user", password="UserPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        self.event = Event.objects.create(
+            title="Cached Event",
+            date=timezone.now() + timedelta(days=2),
+            location="Lagos",
+            category=self.category,
+            created_by=self.user
+        )
+        self.url = reverse("events:event-upcoming-events")
+
+    def test_repeat_request_served_from_cache(self):
+        first = self.client.get(self.url, {"title": "cached", "page": 1})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {"title": " cached "})
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(upcoming_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_event_write_invalidates_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = "Renamed Event"
+            self.event.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["title"], "Renamed Event")
+
+    def test_registration_invalidates_cache(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Registration.objects.create(user=self.user, event=self.event)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["seats_taken"], 1)
+
+    def test_waitlist_churn_keeps_cache(self):
+        self.event.capacity = 1
+        self.event.save()
+        seated = Registration.objects.create(user=self.user, event=self.event)
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            queued = Registration.objects.create(user=User.objects.create_user(username="queued"), event=self.event)
+            queued.status = Registration.Status.CANCELLED
+            queued.save()
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            seated.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["seats_taken"], 0)
+
+
+class AsyncViewTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user", password="UserPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        for i in range(12):
+            Event.objects.create(
+                title=f"Async {i}",
+                date=timezone.now() + timedelta(days=i + 1),
+                location="Lagos" if i % 2 else "Abuja",
+                category=self.category,
+                created_by=self.user
+            )
+
+    async def test_async_list_matches_sync_list(self):
+        for page in (1, 2):
+            sync = await self.async_client.get(reverse("events:event-list"), {"page": page})
+            native = await self.async_client.get(reverse("events:async-event-list"), {"page": page})
+            self.assertEqual(native.status_code, status.HTTP_200_OK)
+            sync_body, native_body = sync.json(), native.json()
+            self.assertEqual(native_body["results"], sync_body["results"])
+            self.assertEqual(native_body["count"], sync_body["count"])
+
+    async def test_async_list_rejects_bad_category_like_sync_list(self):
+        for url in (reverse("events:event-list"), reverse("events:async-event-list")):
+            response = await self.async_client.get(url, {"category": "abc"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("category", response.json())
+        response = await self.async_client.get(reverse("events:async-event-list"), {"category": self.category.id})
+        self.assertEqual(response.json()["count"], 12)
+
+    async def test_async_upcoming_filters_and_detail(self):
+        response = await self.async_client.get(reverse("events:async-event-upcoming"), {"location": "lag"})
+        body = response.json()
+        self.assertEqual(body["count"], 6)
+        self.assertTrue(all(ev["location"] == "Lagos" for ev in body["results"]))
+
+        event_id = body["results"][0]["id"]
+        response = await self.async_client.get(reverse("events:async-event-detail", args=[event_id]))
+        self.assertEqual(response.json()["id"], event_id)
+        response = await self.async_client.get(reverse("events:async-event-detail", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_category_list_shares_cache_and_etag(self):
+        response = await self.async_client.get(reverse("events:async-category-list"))
+        self.assertEqual(response.json()[0]["name"], "Conference")
+        self.assertEqual(response.json()[0]["upcoming_count"], 12)
+        response = await self.async_client.get(
+            reverse("events:async-category-list"), headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_async_category_list_keeps_cache_calls_off_the_event_loop(self):
+        with mock.patch("events.async_views.sync_to_async", wraps=async_views.sync_to_async) as offload:
+            await self.async_client.get(reverse("events:async-category-list"))
+        offloaded = {call.args[0].__name__ for call in offload.call_args_list}
+        self.assertLessEqual({"categories_cache_key", "get_cached_categories", "set_cached_categories"}, offloaded)
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.user = User.objects.create_user(username="poller", password="PollerPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        self.event = Event.objects.create(
+            title="Polled",
+            date=timezone.now() + timedelta(days=3),
+            location="Lagos",
+            category=self.category,
+            created_by=self.owner,
+            capacity=10
+        )
+        self.ticket = TicketPricing.objects.create(event=self.event, ticket_type="VIP", price=50, available_quantity=5)
+        self.detail_url = reverse("events:event-detail", args=[self.event.id])
+
+    def assertNotModified(self, url, etag, queries=1, **params):
+        with self.assertNumQueries(queries), mock.patch.object(EventSerializer, "to_representation") as render:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        render.assert_not_called()
+
+    def test_detail_304_until_counters_move(self):
+        first = self.client.get(self.detail_url)
+        self.assertTrue(first["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", first)
+        self.assertNotModified(self.detail_url, first["ETag"])
+
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        time.sleep(0.002)
+        Registration.objects.create(user=self.user, event=self.event)  # UPDATE ... seats_booked
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["seats_taken"], 1)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_missing_detail_is_still_404(self):
+        response = self.client.get(reverse("events:event-detail", args=[999999]), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_etag_tracks_inserts_and_deletes(self):
+        url = reverse("events:event-list")
+        etag = self.client.get(url)["ETag"]
+        self.assertNotModified(url, etag)
+        self.assertNotEqual(self.client.get(url, {"page": 1, "category": self.category.id})["ETag"], etag)
+
+        other = Event.objects.create(
+            title="New", date=self.event.date, location="Abuja", category=self.category, created_by=self.owner
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        other.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_cursor_page_etag(self):
+        url = reverse("events:event-list")
+        etag = self.client.get(url, {"cursor": ""})["ETag"]
+        self.assertNotModified(url, etag, cursor="")
+
+    def test_upcoming_cache_hit_answers_304_without_queries(self):
+        url = reverse("events:event-upcoming-events")
+        etag = self.client.get(url)["ETag"]
+        self.assertNotModified(url, etag, queries=0)
+
+    def test_ticket_list_changes_when_inventory_moves(self):
+        url = reverse("events:event-tickets-list", args=[self.event.id])
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        time.sleep(0.002)
+        TicketPricing.objects.take(self.ticket.id, 2)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["available_quantity"], 3)
+
+    def test_registration_list_is_per_user(self):
+        Registration.objects.create(user=self.user, event=self.event)
+        Registration.objects.create(user=self.owner, event=self.event)
+        url = reverse("events:event-registrations-list", args=[self.event.id])
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(2):  # creator lookup + aggregate
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.force_authenticate(user=self.owner)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class BulkRegistrationTests(APITestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        self.event = Event.objects.create(
+            title="Big Event",
+            date=timezone.now() + timedelta(days=5),
+            location="Lagos",
+            category=self.category,
+            created_by=self.owner,
+            capacity=3
+        )
+        User.objects.bulk_create(User(username=f"guest{i}") for i in range(5))
+        Registration.objects.create(user=User.objects.get(username="guest0"), event=self.event)
+        self.client.force_authenticate(user=self.owner)
+        self.url = reverse("events:event-registrations-bulk-import", args=[self.event.id])
+
+    def test_csv_import_reports_each_row(self):
+        body = "username\nguest0\nguest1\nnobody\nguest1\nguest2\nguest3\n"
+        response = self.client.generic("POST", self.url, body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        details = [(row["user"], row["status"], row.get("detail")) for row in response.data["results"]]
+        self.assertEqual(details, [
+            ("guest0", "error", "Already registered for this event."),
+            ("guest1", "created", None),
+            ("nobody", "error", "Unknown user."),
+            ("guest1", "error", "Duplicate row for this user."),
+            ("guest2", "created", None),
+            ("guest3", "waitlisted", None),
+        ])
+        self.assertEqual(response.data["waitlisted"], 1)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, 3)
+        self.assertEqual(self.event.registrations.filter(status=Registration.Status.REGISTERED).count(), 3)
+        self.assertEqual(self.event.registrations.get(user__username="guest3").waitlist_position, 1)
+
+    def test_import_leaves_held_seats_alone(self):
+        SeatHold.objects.place(self.event.id, self.owner.id)  # 1 booked + 1 held of 3
+        body = "username\nguest1\nguest2\n"
+        with mock.patch.object(Event.objects, "reserve_seats", wraps=Event.objects.reserve_seats) as reserve:
+            response = self.client.generic("POST", self.url, body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["created"], response.data["waitlisted"]), (1, 1))
+        self.assertEqual(reserve.call_count, 1)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.seats_booked, self.event.seats_held), (2, 1))
+
+    def test_ndjson_import_by_user_id(self):
+        guest = User.objects.get(username="guest4")
+        body = f'{{"user_id": {guest.id}}}\nnot json\n'
+        response = self.client.generic("POST", self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertTrue(self.event.registrations.filter(user=guest).exists())
+
+    def test_non_ascii_digit_user_id_is_unknown(self):
+        body = 'user_id\n\u00b2\n\u0663\n'
+        response = self.client.generic("POST", self.url, body.encode(), content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["detail"] for row in response.data["results"]], ["Unknown user."] * 2)
+
+    def test_only_creator_or_admin_can_import(self):
+        self.client.force_authenticate(user=User.objects.get(username="guest1"))
+        response = self.client.generic("POST", self.url, "username\nguest1\n", content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_streaming_export(self):
+        url = reverse("events:event-registrations-export", args=[self.event.id])
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,user_id,username,status,registration_date")
+        self.assertIn(",guest0,registered,", lines[1])
+
+        response = self.client.get(url, {"output": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('"username": "guest0"', b"".join(response.streaming_content).decode())
+
+
+class ListQueryCountTests(APITestCase):
+    """List endpoints must cost the same number of queries for 1 row or a full page."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.category = EventCategory.objects.create(name="Conference")
+        self.event = self._make_event()
+
+    def _make_event(self):
+        creator = User.objects.create_user(username=f"creator{Event.objects.count()}")
+        return Event.objects.create(
+            title="Event",
+            date=timezone.now() + timedelta(days=3),
+            location="Lagos",
+            category=self.category,
+            created_by=creator,
+            capacity=0
+        )
+
+    def _make_registration(self):
+        attendee = User.objects.create_user(username=f"attendee{Registration.objects.count()}")
+        return Registration.objects.create(user=attendee, event=self.event)
+
+    def assertListQueriesConstant(self, url, model, make_row, expected, sizes=(1, 10)):
+        counts = []
+        for size in sizes:
+            while model.objects.count() < size:
+                make_row()
+            cache.clear()  # measure the database path, not the upcoming cache
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), size)
+            counts.append(len(queries))
+        self.assertEqual(counts, [expected] * len(sizes))
+
+    def test_event_list_query_count(self):
+        self.assertListQueriesConstant(reverse("events:event-list"), Event, self._make_event, expected=2)
+
+    def test_upcoming_query_count(self):
+        self.assertListQueriesConstant(reverse("events:event-upcoming-events"), Event, self._make_event, expected=2)
+
+    def test_registration_list_query_count(self):
+        self.client.force_authenticate(user=self.event.created_by)
+        url = reverse("events:event-registrations-list", args=[self.event.id])
+        # event ownership lookup + COUNT + page
+        self.assertListQueriesConstant(url, Registration, self._make_registration, expected=3)
+
+
+class LeanListTests(APITestCase):
+    """Lean list responses must be indistinguishable from the serializer's own output."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        category = EventCategory.objects.create(name="Conference")
+        self.event = Event.objects.create(
+            title="Small", description="Two seats", date=timezone.now() + timedelta(days=2),
+            location="Lagos", category=category, created_by=self.owner, capacity=2
+        )
+        Event.objects.create(
+            title="Open", date=timezone.now() + timedelta(days=3),
+            location="Abuja", category=category, created_by=self.owner, capacity=0
+        )
+        for i in range(3):  # the third one is waitlisted
+            Registration.objects.create(user=User.objects.create_user(username=f"guest{i}"), event=self.event)
+        SeatHold.objects.create(
+            event=Event.objects.get(title="Open"), user=self.owner,
+            expires_at=timezone.now() + timedelta(minutes=5)
+        )
+
+    def assertMatchesSerializer(self, url, serializer_class, queryset):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = serializer_class(queryset, many=True).data
+        self.assertEqual(response.data["results"], expected)
+        self.assertEqual(
+            [list(row) for row in response.data["results"]], [list(row) for row in expected]
+        )
+
+    def test_event_list_matches_serializer(self):
+        self.assertMatchesSerializer(
+            reverse("events:event-list"), EventSerializer, Event.objects.order_by("date", "id")
+        )
+
+    def test_upcoming_matches_serializer(self):
+        self.assertMatchesSerializer(
+            reverse("events:event-upcoming-events"), EventSerializer, Event.objects.order_by("date", "id")
+        )
+
+    def test_registration_list_matches_serializer(self):
+        self.client.force_authenticate(user=self.owner)
+        self.assertMatchesSerializer(
+            reverse("events:event-registrations-list", args=[self.event.id]),
+            RegistrationSerializer,
+            Registration.objects.filter(event=self.event).order_by("registration_date", "id"),
+        )
+
+    def test_keyset_pages_from_lean_rows(self):
+        with mock.patch.object(KeysetPagination, "page_size", 1):
+            first = self.client.get(reverse("events:event-list"), {"cursor": ""})
+            second = self.client.get(first.data["next"])
+        self.assertEqual(
+            [row["title"] for row in first.data["results"] + second.data["results"]], ["Small", "Open"]
+        )
+        self.assertIsNone(second.data["next"])
+
+
+class OutboxTests(APITestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="UserPass123"
+        )
+        self.event = Event.objects.create(
+            title="Launch",
+            date=timezone.now() + timedelta(days=5),
+            location="Lagos",
+            category=EventCategory.objects.create(name="Conference"),
+            created_by=self.owner,
+            capacity=1
+        )
+        self.url = reverse("events:event-registrations-list", args=[self.event.id])
+
+    def test_registration_queues_confirmation_instead_of_sending_inline(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.topic, "registration.created")
+        self.assertEqual(message.payload["registration_id"], response.data["id"])
+
+        self.assertEqual(drain(workers=1), {"delivered": 1, "retried": 0, "failed": 0})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["user@example.com"])
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.DELIVERED)
+
+    def test_rejected_registration_leaves_no_message(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.post(self.url)
+        response = self.client.post(self.url)  # duplicate, rolled back
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_cancellation_is_queued(self):
+        registration = Registration.objects.create(user=self.user, event=self.event)
+        registration.status = Registration.Status.CANCELLED
+        registration.save()
+        self.assertEqual(
+            list(OutboxMessage.objects.order_by("id").values_list("topic", flat=True)),
+            ["registration.created", "registration.cancelled"],
+        )
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        calls = []
+
+        def flaky(payload):
+            calls.append(payload)
+            raise RuntimeError("mail server down")
+
+        with mock.patch.dict("events.outbox._handlers", clear=True), self.assertLogs("events.outbox", "ERROR"):
+            register_handler("test.flaky")(flaky)
+            message = OutboxMessage.enqueue("test.flaky", {"n": 1})
+
+            self.assertEqual(drain(workers=1)["retried"], 1)
+            message.refresh_from_db()
+            self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+            self.assertGreater(message.available_at, timezone.now())
+            self.assertIn("mail server down", message.last_error)
+            self.assertEqual(drain(workers=1)["retried"], 0)  # not due yet
+
+            OutboxMessage.objects.filter(pk=message.pk).update(available_at=timezone.now())
+            self.assertEqual(drain(workers=1)["failed"], 1)
+            message.refresh_from_db()
+            self.assertEqual(message.status, OutboxMessage.Status.FAILED)
+            self.assertEqual(message.attempts, 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_claimed_messages_are_redelivered_after_lease_expires(self):
+        with mock.patch.dict("events.outbox._handlers", clear=True):
+            delivered = []
+            register_handler("test.ok")(lambda payload: delivered.append(payload["n"]))
+            for n in range(10):
+                OutboxMessage.enqueue("test.ok", {"n": n})
+            # A worker that claimed two messages and then died.
+            OutboxMessage.objects.filter(pk__in=OutboxMessage.objects.order_by("id")[:2].values("pk")).update(
+                available_at=timezone.now() + timedelta(minutes=5), lease_token="dead", attempts=1
+            )
+
+            self.assertEqual(drain_all(batch_size=3, workers=4)["delivered"], 8)
+            OutboxMessage.objects.filter(lease_token="dead").update(available_at=timezone.now())
+            self.assertEqual(drain_all(workers=4)["delivered"], 2)
+        self.assertEqual(sorted(delivered), list(range(10)))
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.Status.DELIVERED).exists())
+
+    def test_worker_command_drains_once(self):
+        Registration.objects.create(user=self.user, event=self.event)
+        out = StringIO()
+        call_command("run_outbox_worker", "--once", "--workers", "1", stdout=out)
+        self.assertIn("delivered: 1", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class TicketPurchaseTests(APITestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.user = User.objects.create_user(username="buyer", password="BuyerPass123")
+        self.event = Event.objects.create(
+            title="Gala",
+            date=timezone.now() + timedelta(days=5),
+            location="Abuja",
+            category=EventCategory.objects.create(name="Party"),
+            created_by=self.owner,
+            capacity=10
+        )
+        self.vip = TicketPricing.objects.create(event=self.event, ticket_type="VIP", price="100.00", available_quantity=2)
+        self.regular = TicketPricing.objects.create(
+            event=self.event, ticket_type="Regular", price="20.00", available_quantity=10
+        )
+        self.registration = Registration.objects.create(user=self.user, event=self.event)
+        self.url = reverse("events:event-registrations-tickets", args=[self.event.id, self.registration.id])
+        self.client.force_authenticate(user=self.user)
+
+    def _stock(self):
+        return dict(TicketPricing.objects.values_list("ticket_type", "available_quantity"))
+
+    def test_multi_tier_order_decrements_inventory(self):
+        response = self.client.post(self.url, {"items": [
+            {"ticket": self.vip.id, "quantity": 1},
+            {"ticket": self.regular.id, "quantity": 3},
+        ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(sorted(row["ticket_type"] for row in response.data), ["Regular", "VIP"])
+        self.assertEqual(self._stock(), {"VIP": 1, "Regular": 7})
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+        tickets = self.client.get(reverse("events:event-tickets-list", args=[self.event.id])).data
+        self.assertEqual({t["ticket_type"]: t["available_quantity"] for t in tickets["results"]}, {"VIP": 1, "Regular": 7})
+
+    def test_order_is_all_or_nothing(self):
+        response = self.client.post(self.url, {"items": [
+            {"ticket": self.regular.id, "quantity": 3},
+            {"ticket": self.vip.id, "quantity": 3},
+        ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._stock(), {"VIP": 2, "Regular": 10})
+        self.assertFalse(TicketPurchase.objects.exists())
+
+    def test_rejects_tickets_from_another_event(self):
+        other = Event.objects.create(
+            title="Other", date=self.event.date, location="Abuja",
+            category=self.event.category, created_by=self.owner
+        )
+        foreign = TicketPricing.objects.create(event=other, ticket_type="VIP", price="1.00", available_quantity=5)
+        response = self.client.post(self.url, {"items": [{"ticket": foreign.id, "quantity": 1}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cancelled_registration_cannot_buy(self):
+        self.registration.status = Registration.Status.CANCELLED
+        self.registration.save()
+        response = self.client.post(self.url, {"items": [{"ticket": self.vip.id, "quantity": 1}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cancellation_and_delete_restock(self):
+        TicketPurchase.objects.place_order(self.registration, [(self.vip, 2), (self.regular, 1)])
+        self.registration.status = Registration.Status.CANCELLED
+        self.registration.save()
+        self.assertEqual(self._stock(), {"VIP": 2, "Regular": 10})
+        self.assertFalse(TicketPurchase.objects.filter(status=TicketPurchase.Status.PURCHASED).exists())
+
+        other = Registration.objects.create(user=self.owner, event=self.event)
+        TicketPurchase.objects.place_order(other, [(self.regular, 4)])
+        other.delete()
+        self.assertEqual(self._stock(), {"VIP": 2, "Regular": 10})
+
+    def test_sold_tier_cannot_be_deleted(self):
+        TicketPurchase.objects.place_order(self.registration, [(self.vip, 1)])
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.delete(reverse("events:event-tickets-detail", args=[self.event.id, self.vip.id]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.event.delete()  # the event itself can still go
+        self.assertFalse(TicketPurchase.objects.exists())
+
+    def test_editing_tier_keeps_concurrent_sales(self):
+        url = reverse("events:event-tickets-detail", args=[self.event.id, self.regular.id])
+        self.client.force_authenticate(user=self.owner)
+
+        def sell(*args):  # lands after the view loaded the tier
+            TicketPricing.objects.take(self.regular.id, 3)
+
+        with mock.patch.object(TicketPricingViewSet, "check_object_permissions", side_effect=sell):
+            response = self.client.patch(url, {"price": "25.00"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.regular.refresh_from_db()
+        self.assertEqual((str(self.regular.price), self.regular.available_quantity), ("25.00", 7))
+
+        # Adding 5 on top of the 7 this client saw lands on whatever is left now.
+        with mock.patch.object(TicketPricingViewSet, "check_object_permissions", side_effect=sell):
+            response = self.client.patch(url, {"available_quantity": 12}, format="json")
+        self.assertEqual(response.data["available_quantity"], 9)
+        with mock.patch.object(TicketPricingViewSet, "check_object_permissions", side_effect=sell):
+            response = self.client.patch(url, {"available_quantity": 0}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._stock()["Regular"], 6)
+
+
+class SeatHoldTests(APITestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.user = User.objects.create_user(username="holder", password="HolderPass123")
+        self.event = Event.objects.create(
+            title="Flash Sale",
+            date=timezone.now() + timedelta(days=2),
+            location="Lagos",
+            category=EventCategory.objects.create(name="Concert"),
+            created_by=self.owner,
+            capacity=2
+        )
+        self.url = reverse("events:event-hold", args=[self.event.id])
+
+    def test_hold_counts_against_capacity_and_converts_on_registration(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("expires_at", response.data)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.seats_held, self.event.seats_available()), (1, 1))
+
+        SeatHold.objects.place(self.event.id, self.owner.id)
+        other = User.objects.create_user(username="late")
+        self.assertEqual(Registration.objects.create(user=other, event=self.event).status, Registration.Status.WAITLISTED)
+
+        # The holder gets their seat even though the event is full.
+        response = self.client.post(reverse("events:event-registrations-list", args=[self.event.id]))
+        self.assertEqual(response.data["status"], Registration.Status.REGISTERED)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.seats_booked, self.event.seats_held), (1, 1))
+        self.assertFalse(SeatHold.objects.filter(user=self.user).exists())
+
+    def test_release_frees_seat_for_waitlist(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.post(self.url)
+        seated = Registration.objects.create(user=self.owner, event=self.event)
+        queued = Registration.objects.create(user=User.objects.create_user(username="queued"), event=self.event)
+        self.assertEqual(queued.status, Registration.Status.WAITLISTED)
+
+        self.assertEqual(self.client.delete(self.url).status_code, status.HTTP_204_NO_CONTENT)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Registration.Status.REGISTERED)
+        self.assertEqual(self.client.delete(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.seats_booked, self.event.seats_held), (2, 0))
+        self.assertEqual(seated.status, Registration.Status.REGISTERED)
+
+    def test_full_event_cannot_be_held(self):
+        self.event.capacity = 1
+        self.event.save()
+        Registration.objects.create(user=self.owner, event=self.event)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.post(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sweep_releases_expired_holds_in_one_pass(self):
+        self.event.capacity = 0
+        self.event.save()
+        second = Event.objects.create(
+            title="Second", date=self.event.date, location="Lagos",
+            category=self.event.category, created_by=self.owner
+        )
+        users = User.objects.bulk_create(User(username=f"h{i}") for i in range(6))
+        for i, user in enumerate(users):
+            SeatHold.objects.place((self.event, second)[i % 2].id, user.id, seconds=1 if i < 5 else 3600)
+
+        later = timezone.now() + timedelta(seconds=5)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(SeatHold.objects.sweep(now=later), 5)
+        statements = [q["sql"].split()[0] for q in ctx.captured_queries]
+        self.assertEqual(statements.count("DELETE"), 1)
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertEqual(
+            dict(Event.objects.values_list("title", "seats_held")), {"Flash Sale": 0, "Second": 1}
+        )
+        self.assertEqual(SeatHold.objects.sweep(now=later), 0)
+
+        out = StringIO()
+        call_command("sweep_seat_holds", stdout=out)
+        self.assertIn("Released 0 expired hold(s).", out.getvalue())
+
+    def test_sweep_survives_counter_below_live_holds(self):
+        SeatHold.objects.place(self.event.id, self.user.id, seconds=1)
+        SeatHold.objects.place(self.event.id, self.owner.id, seconds=1)
+        Event.objects.filter(pk=self.event.pk).update(seats_held=1)
+
+        self.assertEqual(SeatHold.objects.sweep(now=timezone.now() + timedelta(seconds=5)), 2)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_held, 0)
+        self.assertFalse(SeatHold.objects.exists())
+
+
+class CalendarTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.category = EventCategory.objects.create(name="Meetups")
+
+    def at(self, day, hour=18, month=1):
+        return datetime(2030, month, day, hour, tzinfo=dt_timezone.utc)
+
+    def make(self, title, date, **fields):
+        fields.setdefault("location", "Lagos")
+        return Event.objects.create(title=title, date=date, category=self.category, created_by=self.owner, **fields)
+
+    def calendar(self, start, end, **params):
+        return self.client.get(reverse("events:event-calendar"), {"start": start, "end": end, **params})
+
+    def test_weekly_series_with_exceptions_and_end(self):
+        event = self.make(
+            "Standup", self.at(1), ends_at=self.at(1, hour=19), recurrence="weekly",
+            recurrence_until=self.at(29), recurrence_exceptions=["2030-01-15"],
+        )
+        starts = [o.start.day for o in occurrences(event, self.at(1, hour=0), self.at(1, hour=0, month=3))]
+        self.assertEqual(starts, [1, 8, 22, 29])
+
+    def test_monthly_series_skips_short_months(self):
+        event = self.make("Payday", self.at(31), recurrence="monthly")
+        window = occurrences(event, self.at(1, month=2), self.at(1, month=6))
+        self.assertEqual([(o.start.month, o.start.day) for o in window], [(3, 31), (5, 31)])
+
+    def test_long_event_overlapping_window_start(self):
+        self.make("Festival", self.at(1), ends_at=self.at(10))
+        self.make("Later", self.at(20))
+        response = self.calendar("2030-01-05", "2030-01-06")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["title"] for row in response.data["results"]], ["Festival"])
+
+    def test_interval_index_buckets(self):
+        self.assertEqual(span_key(self.at(3, hour=1), self.at(3, hour=23))[0], 0)
+        self.assertGreater(span_key(self.at(3), self.at(20))[0], 0)
+        self.assertEqual(span_key(self.at(3), None), (OPEN_LEVEL, 0))
+
+        near = self.make("Near", self.at(3), ends_at=self.at(3, hour=20))
+        series = self.make("Forever", self.at(1, month=1), recurrence="daily")
+        self.make("Next year", self.at(3).replace(year=2031))
+        self.make("Last year", self.at(3).replace(year=2029), ends_at=self.at(4).replace(year=2029))
+        candidates = events_between(Event.objects.all(), self.at(2), self.at(5))
+        self.assertEqual(set(candidates), {near, series})
+
+    def test_calendar_expands_and_pages_in_order(self):
+        self.make("Daily", self.at(1, hour=9), recurrence="daily", recurrence_interval=2)
+        self.make("Launch", self.at(4, hour=9))
+        self.make("Other city", self.at(4, hour=10), location="Abuja")
+
+        with mock.patch.object(KeysetPagination, "page_size", 2):
+            pages, response = [], self.calendar("2030-01-01", "2030-01-08", location="Lagos")
+            while True:
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                pages.append(response.data["results"])
+                if not response.data["next"]:
+                    break
+                response = self.client.get(response.data["next"])
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        seen = [(row["title"], row["start"][:10]) for page in pages for row in page]
+        self.assertEqual(seen, [
+            ("Daily", "2030-01-01"), ("Daily", "2030-01-03"), ("Launch", "2030-01-04"),
+            ("Daily", "2030-01-05"), ("Daily", "2030-01-07"),
+        ])
+
+    def test_calendar_window_is_validated(self):
+        self.assertEqual(self.calendar("2030-01-05", "2030-01-01").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.calendar("soon", "2030-01-01").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.calendar("2030-01-01", "2030-01-05", cursor="bogus").status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(self.calendar("2030-01-01", "2031-06-01").status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(CALENDAR_MAX_SERIES=2)
+    def test_repeating_candidates_are_capped(self):
+        for day in (3, 1, 2):
+            self.make(f"Daily {day}", self.at(day), recurrence="daily")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.calendar("2030-02-01", "2030-02-02")
+        self.assertEqual([o["title"] for o in response.data["results"]], ["Daily 1", "Daily 2"])
+        self.assertTrue(all("LIMIT" in q["sql"] for q in ctx.captured_queries if "events_event" in q["sql"]))
+
+    def test_series_stop_at_the_last_representable_date(self):
+        def at(month, day):
+            return datetime(9999, month, day, 12, tzinfo=dt_timezone.utc)
+
+        monthly = self.make("Monthly", at(6, 15), recurrence="monthly")
+        daily = self.make("Daily", at(12, 30), ends_at=at(12, 30) + timedelta(hours=2), recurrence="daily")
+        starts = [o.start.month for o in occurrences(monthly, at(1, 1), at(12, 31))]
+        self.assertEqual(starts, [6, 7, 8, 9, 10, 11, 12])
+        self.assertEqual(len(list(occurrences(daily, at(1, 1), at(12, 31)))), 1)
+
+        # Both series run into datetime.max inside this window.
+        response = self.calendar("9999-01-01T00:00:00Z", "9999-12-31T23:59:59Z")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 9)
+
+    def test_schedule_is_validated_and_indexed_on_write(self):
+        self.client.force_authenticate(user=self.owner)
+        payload = {
+            "title": "Club", "date": timezone.now() + timedelta(days=1), "location": "Lagos",
+            "category": self.category.id, "capacity": 0,
+        }
+        response = self.client.post(
+            reverse("events:event-list"), {**payload, "ends_at": timezone.now()}, format="json"
+        )
+        self.assertIn("ends_at", response.data)
+
+        response = self.client.post(reverse("events:event-list"), {
+            **payload, "recurrence": "weekly", "recurrence_exceptions": ["2031-01-02", "2031-01-02"],
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["recurrence_exceptions"], ["2031-01-02"])
+        event = Event.objects.get(pk=response.data["id"])
+        self.assertEqual((event.span_level, event.series_end), (OPEN_LEVEL, None))
+
+
+class NearbySearchTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.category = EventCategory.objects.create(name="Meetups")
+        for title, latitude, longitude in [
+            ("Ikeja", 6.6018, 3.3515), ("Victoria Island", 6.4281, 3.4219), ("Abuja", 9.0765, 7.3986),
+            ("East of the date line", 0.0, 179.99), ("West of the date line", 0.0, -179.99), ("Online", None, None),
+        ]:
+            Event.objects.create(
+                title=title, date=timezone.now() + timedelta(days=1), location=title, category=self.category,
+                created_by=self.owner, latitude=latitude, longitude=longitude,
+            )
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["title"] for row in response.json()["results"]]
+
+    def test_geohash(self):
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(Event.objects.get(title="Abuja").geohash, geohash_encode(9.0765, 7.3986))
+        self.assertEqual(Event.objects.get(title="Online").geohash, "")
+
+    def test_list_sorted_by_distance(self):
+        url = reverse("events:event-list")
+        # Lagos Island: Victoria Island is ~4 km away, Ikeja ~18 km.
+        near = {"near": "6.4550,3.3941", "ordering": "-date"}
+        self.assertEqual(self.titles(self.client.get(url, {**near, "radius": 25})), ["Victoria Island", "Ikeja"])
+        self.assertEqual(self.titles(self.client.get(url, near)), ["Victoria Island"])  # default 10 km
+        self.assertEqual(len(self.titles(self.client.get(url, {**near, "radius": 1000}))), 3)
+
+    def test_upcoming_and_async_list(self):
+        params = {"near": "6.4550,3.3941", "radius": 25}
+        self.assertEqual(
+            self.titles(self.client.get(reverse("events:event-upcoming-events"), params)), ["Victoria Island", "Ikeja"]
+        )
+        self.assertEqual(
+            self.titles(self.client.get(reverse("events:async-event-list"), params)), ["Victoria Island", "Ikeja"]
+        )
+
+    def test_search_wraps_around_the_date_line(self):
+        response = self.client.get(reverse("events:event-list"), {"near": "0,180", "radius": 5})
+        self.assertEqual(sorted(self.titles(response)), ["East of the date line", "West of the date line"])
+
+    def test_invalid_parameters(self):
+        url = reverse("events:event-list")
+        for params in [{"near": "lagos"}, {"near": "95,3"}, {"near": "6,3", "radius": "0"}, {"near": "6,3", "cursor": ""}]:
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
+        response = self.client.get(reverse("events:async-event-list"), {"near": "lagos"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.post(url, {
+            "title": "Half a point", "date": timezone.now() + timedelta(days=1), "location": "Lagos",
+            "category": self.category.id, "latitude": 6.5,
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """Hammer a small event from many threads and check nobody oversells."""
+
+    registrants = 200
+    capacity = 25
+
+    def setUp(self):
+        owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        category = EventCategory.objects.create(name="Concert")
+        self.event = Event.objects.create(
+            title="Hot Sale",
+            date=timezone.now() + timedelta(days=1),
+            location="Lagos",
+            category=category,
+            created_by=owner,
+            capacity=self.capacity
+        )
+        User.objects.bulk_create(
+            User(username=f"fan{i}") for i in range(self.registrants)
+        )
+        self.user_ids = list(User.objects.filter(username__startswith="fan").values_list("id", flat=True))
+
+    def _register(self, user_id):
+        try:
+            while True:
+                try:
+                    registration = Registration(user_id=user_id, event_id=self.event.id)
+                    registration.save()
+                    return registration.status
+                except OperationalError:
+                    time.sleep(random.uniform(0.001, 0.01))  # SQLite writer lock, try again
+        finally:
+            connection.close()
+
+    def test_no_oversell_under_contention(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(self._register, self.user_ids))
+
+        self.event.refresh_from_db()
+        registered = self.event.registrations.filter(status=Registration.Status.REGISTERED).count()
+        self.assertEqual(results.count(Registration.Status.REGISTERED), self.capacity)
+        self.assertEqual(results.count(Registration.Status.WAITLISTED), self.registrants - self.capacity)
+        self.assertEqual(registered, self.capacity)
+        self.assertEqual(self.event.seats_booked, self.capacity)
+
+    def test_concurrent_cancellations_promote_distinct_entries(self):
+        for user_id in self.user_ids[:self.capacity + 10]:
+            Registration(user_id=user_id, event_id=self.event.id).save()
+
+        def cancel(registration):
+            try:
+                while True:
+                    try:
+                        registration.status = Registration.Status.CANCELLED
+                        registration.save()
+                        return
+                    except OperationalError:
+                        time.sleep(random.uniform(0.001, 0.01))
+            finally:
+                connection.close()
+
+        seated = list(self.event.registrations.filter(status=Registration.Status.REGISTERED)[:10])
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            list(pool.map(cancel, seated))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_booked, self.capacity)
+        self.assertEqual(self.event.registrations.filter(status=Registration.Status.REGISTERED).count(), self.capacity)
+        self.assertFalse(self.event.registrations.filter(status=Registration.Status.WAITLISTED).exists())
+
+    def test_parallel_buyers_never_oversell_tickets(self):
+        ticket = TicketPricing.objects.create(event=self.event, ticket_type="GA", price="10.00", available_quantity=30)
+        for user_id in self.user_ids[:self.capacity]:
+            Registration(user_id=user_id, event_id=self.event.id).save()
+        registrations = list(self.event.registrations.all())
+
+        def buy(registration):
+            try:
+                while True:
+                    try:
+                        TicketPurchase.objects.place_order(registration, [(ticket, 2)])
+                        return True
+                    except ValidationError:
+                        return False
+                    except OperationalError:
+                        time.sleep(random.uniform(0.001, 0.01))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(buy, registrations))
 
-# Create your tests here.
+        ticket.refresh_from_db()
+        self.assertEqual(results.count(True), 15)
+        self.assertEqual(ticket.available_quantity, 0)
+        self.assertEqual(sum(TicketPurchase.objects.values_list("quantity", flat=True)), 30)
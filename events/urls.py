@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested.routers import NestedDefaultRouter
+from . import async_views
 from .views import (
     EventCategoryViewSet,
     EventViewSet,
@@ -8,6 +9,8 @@ from .views import (
     RegistrationViewSet,
 )
 
+app_name = "events"
+
 # Main router
 router = DefaultRouter()
 router.register(r'categories', EventCategoryViewSet, basename='category')
@@ -19,6 +22,12 @@ events_router.register(r'tickets', TicketPricingViewSet, basename='event-tickets
 events_router.register(r'registrations', RegistrationViewSet, basename='event-registrations')
 
 urlpatterns = [
+    # Native async read endpoints (same responses, no sync thread hop under ASGI)
+    path('async/events/', async_views.event_list, name='async-event-list'),
+    path('async/events/upcoming/', async_views.upcoming_events, name='async-event-upcoming'),
+    path('async/events/<int:pk>/', async_views.event_detail, name='async-event-detail'),
+    path('async/categories/', async_views.category_list, name='async-category-list'),
+
     path('', include(router.urls)),
     path('', include(events_router.urls)),
 ]
@@ -1,17 +1,56 @@
-from rest_framework import viewsets, permissions
-from rest_framework.exceptions import PermissionDenied
+import csv
+from datetime import timedelta
+from itertools import islice
+
+from rest_framework import viewsets, permissions, status
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError
+from django.db.models import Q, RestrictedError
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from event_manager.replicas import ReplicaReadMixin, use_primary
+from event_manager.sqlite import retry_on_lock
+from event_manager.throttling import (
+    EventRegistrationThrottle,
+    RegistrationIPThrottle,
+    RegistrationUserThrottle,
+    admission_slot,
+)
 
-from .models import EventCategory, Event, TicketPricing, Registration
+from .bulk import export_rows, import_registrations, parse_rows
+from .cache import (
+    categories_cache_key,
+    get_cached_categories,
+    get_cached_upcoming,
+    set_cached_categories,
+    set_cached_upcoming,
+    upcoming_cache_key,
+)
+from .filters import DateRangeFilter, FullTextSearchFilter, NearFilter, filter_upcoming, parse_moment
+from .mixins import ConditionalGetMixin, LeanListMixin, SerializerQuerySetMixin
+from .models import EventCategory, Event, SeatHold, TicketPricing, TicketPurchase, Registration
+from .occurrences import events_between, iter_occurrences
+from .pagination import decode_cursor, encode_cursor
 from .serializers import (
     EventCategorySerializer,
     EventSerializer,
+    OccurrenceSerializer,
+    SeatHoldSerializer,
     TicketPricingSerializer,
+    TicketPurchaseSerializer,
+    TicketOrderSerializer,
     RegistrationSerializer,
 )
 
@@ -32,112 +71,304 @@ class IsCreatorOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user.is_staff or obj.created_by == request.user
+        # Compare ids so token-backed users never trigger a lookup.
+        return request.user.is_staff or obj.created_by_id == request.user.id
 
 
 # ------------------------
 # ViewSets
 # ------------------------
 
-class EventCategoryViewSet(viewsets.ModelViewSet):
-    queryset = EventCategory.objects.all()
+class EventCategoryViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = EventCategorySerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = None  # a handful of rows; clients want them all at once
 
-
-class EventViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        return EventCategory.objects.with_event_counts().order_by("id")
+
+    def list(self, request, *args, **kwargs):
+        """All categories with event counts, cached and served with a strong ETag."""
+        cache_key = categories_cache_key()
+        entry = get_cached_categories(cache_key)
+        if entry is None:
+            # Filled from the primary: a lagging replica must not be cached for a whole generation.
+            with use_primary():
+                categories = list(self.get_queryset())
+            next_start = min((c.next_start for c in categories if c.next_start), default=None)
+            entry = set_cached_categories(cache_key, self.get_serializer(categories, many=True).data, next_start)
+
+        not_modified = get_conditional_response(request, etag=entry["etag"])
+        if not_modified is not None:
+            not_modified["ETag"] = entry["etag"]
+            return not_modified
+        return Response(entry["data"], headers={"ETag": entry["etag"]})
+
+
+class EventViewSet(ReplicaReadMixin, ConditionalGetMixin, LeanListMixin, SerializerQuerySetMixin, viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsCreatorOrAdmin]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterBackend, filters.SearchFilter, FullTextSearchFilter, filters.OrderingFilter, DateRangeFilter,
+        NearFilter,  # last: its distance order replaces ?ordering=
+    ]
     filterset_fields = ['category', 'location']
     search_fields = ['title', 'location']
     ordering_fields = ['date', 'created_at']
+    keyset_ordering = ("date", "id")  # for ?cursor= pagination
 
     def get_queryset(self):
         # Default queryset (all events, ordered)
-        return Event.objects.all().order_by("date")
+        return Event.objects.all().order_by(*self.keyset_ordering)
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by_id=self.request.user.id)
 
     @action(detail=False, methods=["get"], url_path="upcoming")
     def upcoming_events(self, request):
         """List all upcoming events with optional filters."""
-        queryset = Event.objects.filter(date__gte=timezone.now()).order_by("date")
-
-        # Optional query params
-        title = request.query_params.get("title")
-        location = request.query_params.get("location")
-        start_date = request.query_params.get("start_date")
-        end_date = request.query_params.get("end_date")
-
-        if title:
-            queryset = queryset.filter(title__icontains=title)
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        if start_date and end_date:
-            queryset = queryset.filter(date__range=[start_date, end_date])
-        elif start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        elif end_date:
-            queryset = queryset.filter(date__lte=end_date)
-
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
-
-class TicketPricingViewSet(viewsets.ModelViewSet):
+        # Served from cache until an Event write or a seat-count change bumps the generation.
+        cache_key = upcoming_cache_key(request)
+        cached = get_cached_upcoming(cache_key)
+        if cached is not None:
+            return self.conditional_response(
+                lambda: Response(cached["data"], headers={"X-Cache": "HIT"}), cached["etag"]
+            )
+
+        queryset = self.optimize_queryset(
+            Event.objects.filter(date__gte=timezone.now()).order_by(*self.keyset_ordering)
+        )
+        queryset = filter_upcoming(queryset, request.query_params)
+
+        def render():
+            response = self.lean_list_response(queryset)
+            set_cached_upcoming(cache_key, {"data": response.data, "etag": etag})
+            response["X-Cache"] = "MISS"
+            return response
+
+        # Filled from the primary: a lagging replica must not be cached for a whole generation.
+        with use_primary():
+            etag, _ = self.get_validators(self.paginator.validator_queryset(queryset, request, self))
+            return self.conditional_response(render, etag)
+
+    @action(detail=False, methods=["get"], url_path="calendar")
+    def calendar(self, request):
+        """
+        Occurrences overlapping ?start= .. ?end= (repeating events expanded),
+        ordered by start; the list filters apply. Pages follow ``next``.
+        """
+        params = request.query_params
+        if not params.get("start") or not params.get("end"):
+            raise ValidationError("Pass a window with ?start= and ?end=.")
+        start, end = parse_moment("start", params["start"]), parse_moment("end", params["end"])
+        if end <= start:
+            raise ValidationError({"end": "Must be after start."})
+        max_days = getattr(settings, "CALENDAR_MAX_WINDOW_DAYS", 366)
+        if end - start > timedelta(days=max_days):
+            raise ValidationError({"end": f"The window may span at most {max_days} days."})
+        limit = self.paginator.get_page_size(request)
+
+        # The cursor is the (start, event id) of the last occurrence sent.
+        since = after_id = None
+        if params.get("cursor"):
+            try:
+                since, after_id = decode_cursor(params["cursor"])
+                since, after_id = parse_datetime(since), int(after_id)
+            except (TypeError, ValueError):
+                raise NotFound("Invalid cursor.")
+            if since is None:
+                raise NotFound("Invalid cursor.")
+
+        candidates = events_between(
+            self.filter_queryset(self.get_queryset()), max(start, since) if since else start, end
+        ).select_related(None).only(
+            "id", "title", "location", "category_id", "date", "ends_at",
+            "recurrence", "recurrence_interval", "recurrence_until", "recurrence_exceptions",
+        )
+        # One-off events are already in start order: fetch just enough of them.
+        one_off = candidates.filter(recurrence="").order_by("date", "id")
+        if since:
+            one_off = one_off.filter(Q(date__gt=since) | Q(date=since, id__gt=after_id))
+        # Open-ended series match every window and can't be put in occurrence order
+        # in SQL: expand at most CALENDAR_MAX_SERIES of them, earliest-starting first.
+        max_series = getattr(settings, "CALENDAR_MAX_SERIES", 500)
+        repeating = candidates.exclude(recurrence="").order_by("date", "id")[:max_series]
+        events = list(one_off[:limit + 1]) + list(repeating)
+
+        stream = iter_occurrences(events, start, end, since)
+        if since:
+            stream = (o for o in stream if (o.start, o.event.pk) > (since, after_id))
+        page = list(islice(stream, limit + 1))
+
+        next_link = None
+        if len(page) > limit:
+            page = page[:limit]
+            cursor = encode_cursor([page[-1].start.isoformat(), page[-1].event.pk])
+            next_link = replace_query_param(request.build_absolute_uri(), "cursor", cursor)
+        return Response({"next": next_link, "results": OccurrenceSerializer(page, many=True).data})
+
+    @action(detail=True, methods=["post", "delete"], url_path="hold",
+            permission_classes=[permissions.IsAuthenticated])
+    @retry_on_lock
+    def hold(self, request, pk=None):
+        """Hold a seat for the current user while they check out (POST again to extend), or release it."""
+        event = get_object_or_404(Event.objects.only("id", "date"), pk=pk)
+        if request.method == "DELETE":
+            if not SeatHold.objects.release(event.id, request.user.id):
+                raise NotFound("You are not holding a seat for this event.")
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        if event.date < timezone.now():
+            raise ValidationError("Cannot register for an event that already happened.")
+        try:
+            hold = SeatHold.objects.place(event.id, request.user.id)
+        except DjangoValidationError as exc:
+            raise ValidationError(exc.messages)
+        except IntegrityError:  # a parallel request from the same user created it first
+            hold = SeatHold.objects.get(event_id=event.id, user_id=request.user.id)
+        return Response(SeatHoldSerializer(hold).data, status=status.HTTP_201_CREATED)
+
+
+class TicketPricingViewSet(ReplicaReadMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = TicketPricingSerializer
 
     def get_queryset(self):
-        return TicketPricing.objects.filter(event_id=self.kwargs["event_pk"])
+        return (
+            TicketPricing.objects.filter(event_id=self.kwargs["event_pk"])
+            .select_related("event").order_by("id")
+        )
 
     def perform_create(self, serializer):
-        event = Event.objects.get(pk=self.kwargs["event_pk"])
+        event = get_object_or_404(Event, pk=self.kwargs["event_pk"])
         user = self.request.user
-        if user != event.created_by and not user.is_staff:
+        if event.created_by_id != user.id and not user.is_staff:
             raise PermissionDenied("You are not allowed to add tickets for this event.")
         serializer.save(event=event)
 
     def perform_update(self, serializer):
-        ticket = self.get_object()
+        ticket = serializer.instance
         user = self.request.user
-        if user != ticket.event.created_by and not user.is_staff:
+        if ticket.event.created_by_id != user.id and not user.is_staff:
             raise PermissionDenied("You are not allowed to update tickets for this event.")
         serializer.save()
 
     def perform_destroy(self, instance):
         user = self.request.user
-        if user != instance.event.created_by and not user.is_staff:
+        if instance.event.created_by_id != user.id and not user.is_staff:
             raise PermissionDenied("You are not allowed to delete tickets for this event.")
-        instance.delete()
+        try:
+            instance.delete()
+        except RestrictedError:
+            raise ValidationError("Tickets of this type have already been sold.")
 
 
 
 
-class RegistrationViewSet(viewsets.ModelViewSet):
+class RegistrationViewSet(ReplicaReadMixin, ConditionalGetMixin, LeanListMixin, SerializerQuerySetMixin, viewsets.ModelViewSet):
     serializer_class = RegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ("registration_date", "id")  # for ?cursor= pagination
 
     def get_queryset(self):
         event_id = self.kwargs["event_pk"]
-        event = Event.objects.get(pk=event_id)
-
-        if self.request.user == event.created_by or self.request.user.is_staff:
-            return Registration.objects.filter(event_id=event_id)
-
-        return Registration.objects.filter(event_id=event_id, user=self.request.user)
-
+        if not hasattr(self, "_creator_id"):  # get_queryset runs twice for conditional GETs
+            self._creator_id = get_object_or_404(
+                Event.objects.values_list("created_by_id", flat=True), pk=event_id
+            )
+        creator_id = self._creator_id
+
+        queryset = Registration.objects.filter(event_id=event_id).order_by(*self.keyset_ordering)
+        if self.request.user.id == creator_id or self.request.user.is_staff:
+            return queryset
+
+        return queryset.filter(user_id=self.request.user.id)
+
+    def get_throttles(self):
+        if self.action == "create":
+            # The per-event bucket is shared by everyone registering for the event.
+            return [RegistrationUserThrottle(), RegistrationIPThrottle(), EventRegistrationThrottle()]
+        return super().get_throttles()
+
+    # Registration writes retry when SQLite is busy with another writer.
+    @retry_on_lock
     def perform_create(self, serializer):
-        event = Event.objects.get(pk=self.kwargs["event_pk"])
-
-        # 🔒 Prevent duplicate registration
-        if Registration.objects.filter(event=event, user=self.request.user).exists():
+        # Registration.save() reads the date (past events) and seats_held (hold conversion).
+        event = get_object_or_404(Event.objects.only("id", "date", "seats_held"), pk=self.kwargs["event_pk"])
+
+        # 🔒 Seat claim and insert happen atomically in Registration.save(),
+        # which waitlists instead when the event is full; the (user, event)
+        # unique constraint rejects duplicates. admission_slot() bounds how
+        # many of those writes one hot event can have in flight.
+        try:
+            with admission_slot(f"event:{event.pk}"):
+                serializer.save(user_id=self.request.user.id, event=event)
+        except IntegrityError:
             raise ValidationError("You are already registered for this event.")
+        except DjangoValidationError as exc:
+            raise ValidationError(exc.messages)
+
+    @retry_on_lock
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
 
-        serializer.save(user=self.request.user, event=event)
+    @retry_on_lock
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+
+    def _get_managed_event(self):
+        event = get_object_or_404(Event, pk=self.kwargs["event_pk"])
+        user = self.request.user
+        if event.created_by_id != user.id and not user.is_staff:
+            raise PermissionDenied("Only the event creator or an admin can do this.")
+        return event
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_import(self, request, event_pk=None):
+        """Register many users from a streamed CSV or NDJSON body."""
+        event = self._get_managed_event()
+        if event.date < timezone.now():
+            raise ValidationError("Cannot register for an event that already happened.")
+
+        if request.stream is None:
+            raise ValidationError("Upload a CSV or NDJSON body.")
+        try:
+            results = import_registrations(event, parse_rows(request.stream, request.content_type or ""))
+        except csv.Error as exc:
+            raise ValidationError(f"Could not parse upload: {exc}")
+
+        created = sum(1 for row in results if row["status"] == "created")
+        waitlisted = sum(1 for row in results if row["status"] == "waitlisted")
+        return Response({
+            "created": created,
+            "waitlisted": waitlisted,
+            "failed": len(results) - created - waitlisted,
+            "results": results,
+        })
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, event_pk=None):
+        """Stream every registration as CSV (default) or NDJSON via ?output=ndjson."""
+        event = self._get_managed_event()
+        output = request.query_params.get("output", "csv")
+        content_type = "application/x-ndjson" if output == "ndjson" else "text/csv"
+        response = StreamingHttpResponse(export_rows(event, output), content_type=content_type)
+        extension = "ndjson" if output == "ndjson" else "csv"
+        response["Content-Disposition"] = f'attachment; filename="event-{event.id}-registrations.{extension}"'
+        return response
+
+    @action(detail=True, methods=["get", "post"], url_path="tickets")
+    @retry_on_lock
+    def tickets(self, request, event_pk=None, pk=None):
+        """List this registration's ticket purchases, or buy several tiers in one order."""
+        registration = self.get_object()
+        if request.method == "GET":
+            purchases = TicketPurchase.objects.filter(registration=registration).select_related("ticket").order_by("id")
+            return Response(TicketPurchaseSerializer(purchases, many=True).data)
+
+        order = TicketOrderSerializer(data=request.data, context={"event_id": registration.event_id})
+        order.is_valid(raise_exception=True)
+        try:
+            purchases = TicketPurchase.objects.place_order(registration, order.validated_data["items"])
+        except DjangoValidationError as exc:
+            raise ValidationError(exc.messages)
+        return Response(TicketPurchaseSerializer(purchases, many=True).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# ------------------------
+# Full-user cache
+# ------------------------
+# Per process and short-lived: saves invalidate it locally, the TTL bounds
+# staleness in other workers.
+
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+USER_CACHE_MAX_ENTRIES = 10_000
+
+
+def get_cached_user(user_id):
+    now = time.monotonic()
+    entry = _user_cache.get(user_id)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    user = User.objects.get(pk=user_id)
+    ttl = getattr(settings, "USER_CACHE_TIMEOUT", 30)
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_MAX_ENTRIES:
+            _user_cache.clear()
+        _user_cache[user_id] = (now + ttl, user)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def clear_user_cache():
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+# ------------------------
+# Token-backed user
+# ------------------------
+
+class ClaimsUser(TokenUser):
+    """
+    request.user built from access-token claims (id, username, is_staff,
+    role) so authentication and ownership checks need no query. Anything
+    else is read from the full CustomUser, loaded through the cache.
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self.token.get("role", User.Role.USER)
+
+    @cached_property
+    def instance(self):
+        return get_cached_user(self.id)
+
+    def __eq__(self, other):
+        other_id = getattr(other, "pk", None)
+        if other_id is None:
+            return NotImplemented
+        return self.id == other_id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without the per-request user lookup.
+
+    Claims are set when the access token is minted, at login or refresh
+    (see users.serializers.access_token_for), so a demotion or deactivation
+    takes effect within one access-token lifetime. Tokens issued before the
+    claims were added (no ``is_staff`` claim) fall back to a cached database
+    load so staff keep their rights.
+    """
+
+    def get_user(self, validated_token):
+        if "is_staff" in validated_token:
+            if not validated_token.get("is_active", True):
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            return super().get_user(validated_token)
+
+        try:
+            user = get_cached_user(int(validated_token[api_settings.USER_ID_CLAIM]))
+        except (KeyError, ValueError, User.DoesNotExist):
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
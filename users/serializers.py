@@ -1,10 +1,15 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.models import update_last_login
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenObtainSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from event_manager.metrics import InstrumentedSerializerMixin
 
 User = get_user_model()
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
 
     class Meta:
@@ -22,10 +27,50 @@ class RegisterSerializer(serializers.ModelSerializer):
         user.save()
         return user
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     """For retrieving and updating user profiles"""
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'phone', 'role', 'date_joined']
         read_only_fields = ['id', 'role', 'date_joined']
 
+def access_token_for(refresh, user):
+    """
+    An access token minted from ``refresh`` with ``user``'s current rights.
+    Privilege claims live only on access tokens: anything on the refresh
+    token would be copied, unchanged, into every access token it mints.
+    """
+    access = refresh.access_token
+    access["is_active"] = user.is_active
+    access["is_staff"] = user.is_staff
+    access["is_superuser"] = user.is_superuser
+    access["role"] = user.role
+    return access
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embed the fields permission checks need so requests skip the user lookup."""
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        return token
+
+    def validate(self, attrs):
+        data = TokenObtainSerializer.validate(self, attrs)  # authenticates and sets self.user
+        refresh = self.get_token(self.user)
+        data["refresh"] = str(refresh)
+        data["access"] = str(access_token_for(refresh, self.user))
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        return data
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Reload the user on refresh, so demotions and deactivations apply to the next access token."""
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        return {"access": str(access_token_for(refresh, user))}
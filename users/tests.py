@@ -1,3 +1,95 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from events.models import Event, EventCategory
+from .authentication import clear_user_cache
+
+User = get_user_model()
+
+
+class ClaimsAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        clear_user_cache()
+        self.owner = User.objects.create_user(username="owner", password="OwnerPass123")
+        self.other = User.objects.create_user(username="other", password="OtherPass123")
+        category = EventCategory.objects.create(name="Conference")
+        self.event = Event.objects.create(
+            title="Owned",
+            date=timezone.now() + timedelta(days=3),
+            location="Lagos",
+            category=category,
+            created_by=self.owner
+        )
+
+    def login(self, username, password):
+        response = self.client.post(
+            reverse("user-login"), {"username": username, "password": password}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_permission_check_needs_no_user_query(self):
+        self.login("other", "OtherPass123")
+        url = reverse("events:event-detail", args=[self.event.id])
+        # only the event itself is loaded; the requester comes from the token
+        with self.assertNumQueries(1):
+            response = self.client.patch(url, {"title": "Hijacked"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_owner_can_update_with_token(self):
+        self.login("owner", "OwnerPass123")
+        url = reverse("events:event-detail", args=[self.event.id])
+        response = self.client.patch(url, {"title": "Renamed"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created_by"], "owner")
+
+    def test_profile_load_is_cached_and_invalidated_on_save(self):
+        self.login("owner", "OwnerPass123")
+        url = reverse("user-profile")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data["username"], "owner")
+
+        self.owner.email = "new@example.com"
+        self.owner.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["email"], "new@example.com")
+
+    def test_privileges_only_ride_on_access_tokens(self):
+        tokens = self.login("owner", "OwnerPass123")
+        self.assertNotIn("is_staff", RefreshToken(tokens["refresh"]))
+        self.assertIn("is_staff", AccessToken(tokens["access"]))
+
+    def test_demotion_applies_on_refresh(self):
+        self.owner.is_staff = True
+        self.owner.save()
+        tokens = self.login("owner", "OwnerPass123")
+        self.assertEqual(self.client.get(reverse("user-list")).status_code, status.HTTP_200_OK)
+
+        self.owner.is_staff = False
+        self.owner.save()
+        response = self.client.post(reverse("token-refresh"), {"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get(reverse("user-list")).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivated_user_cannot_refresh_or_use_old_claims(self):
+        tokens = self.login("owner", "OwnerPass123")
+        self.owner.is_active = False
+        self.owner.save()
+        response = self.client.post(reverse("token-refresh"), {"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        inactive = AccessToken(tokens["access"])
+        inactive["is_active"] = False
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {inactive}")
+        self.assertEqual(self.client.get(reverse("user-profile")).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .views import RegisterUserView, CurrentUserView, LogoutUserView, UserViewSet
+from rest_framework_simplejwt.views import TokenRefreshView
+from .views import RegisterUserView, CurrentUserView, LoginView, LogoutUserView, UserViewSet
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
@@ -9,7 +9,7 @@ router.register(r'users', UserViewSet, basename='user')
 urlpatterns = [
     # Auth
     path('register/', RegisterUserView.as_view(), name='user-register'),
-    path('login/', TokenObtainPairView.as_view(), name='user-login'),
+    path('login/', LoginView.as_view(), name='user-login'),
     path('logout/', LogoutUserView.as_view(), name='user-logout'),
     path('refresh/', TokenRefreshView.as_view(), name='token-refresh'),
 
@@ -1,6 +1,8 @@
 from rest_framework import generics, permissions, viewsets
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
+from event_manager.replicas import ReplicaReadMixin
+from event_manager.throttling import LoginIPThrottle, LoginUsernameThrottle
 from .serializers import RegisterSerializer, UserSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.views import APIView
@@ -13,17 +15,21 @@ class RegisterUserView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = RegisterSerializer
 
-class UserViewSet(viewsets.ModelViewSet):
+class LoginView(TokenObtainPairView):
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
+class UserViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('-date_joined')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]  # Admin only
 
-class CurrentUserView(generics.RetrieveAPIView):
+class CurrentUserView(ReplicaReadMixin, generics.RetrieveAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # Token-backed users carry claims only; serialize the full record.
+        return getattr(self.request.user, "instance", self.request.user)
 
 class LogoutUserView(APIView):
     permission_classes = [permissions.IsAuthenticated]